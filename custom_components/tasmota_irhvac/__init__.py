@@ -1,32 +1,180 @@
 """The Tasmota Irhvac climate component."""
 import logging
-from homeassistant import config_entries
-from homeassistant.const import (
-    CONF_NAME,
-    EVENT_HOMEASSISTANT_START, 
-    Platform
-)    
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import discovery
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST, Platform
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.helpers import config_validation as cv, discovery
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers import device_registry as dr
 
 from .const import (
     DOMAIN,
     CONF_VENDOR,
     CONF_MODEL,
+    DATA_KEY,
+    DATA_STATE_STORE,
+    SERVICE_BULK_IMPORT,
+    SERVICE_GET_LATENCIES,
+    SERVICE_GET_TRACES,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRAFFIC,
+    SERVICE_STOP_RECORDING,
+    ATTR_CSV,
+    ATTR_DEVICES,
+    ATTR_DRY_RUN,
+    ATTR_DURATION,
+    ATTR_FILENAME,
+    ATTR_MESSAGES,
+    ATTR_YAML,
+    PROFILE_DEFAULT_DURATION,
+    PROFILE_MAX_DURATION,
+    TRAFFIC_DEFAULT_DURATION,
+    TRAFFIC_DEFAULT_FILENAME,
+    TRAFFIC_MAX_DURATION,
     DEFAULT_CONF_MODEL,
 )
+from .state_store import IrhvacStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.CLIMATE]
+PLATFORMS = [Platform.CLIMATE, Platform.SENSOR]
+
+BULK_IMPORT_SCHEMA = vol.Schema(
+    {
+        vol.Exclusive(ATTR_DEVICES, "definitions"): vol.All(cv.ensure_list, [dict]),
+        vol.Exclusive(ATTR_YAML, "definitions"): cv.string,
+        vol.Exclusive(ATTR_CSV, "definitions"): cv.string,
+        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+    }
+)
+
+GET_TRACES_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.entity_ids})
+GET_LATENCIES_SCHEMA = GET_TRACES_SCHEMA
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=PROFILE_DEFAULT_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=PROFILE_MAX_DURATION)
+        ),
+        vol.Optional(ATTR_MESSAGES): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+RECORD_TRAFFIC_SCHEMA = vol.Schema(
+    {
+        # A plain .jsonl file name, created in TRAFFIC_DIRECTORY
+        vol.Optional(ATTR_FILENAME, default=TRAFFIC_DEFAULT_FILENAME): vol.All(
+            cv.string, vol.Match(r"^[\w-][\w.-]*\.jsonl$")
+        ),
+        vol.Optional(ATTR_DURATION, default=TRAFFIC_DEFAULT_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=TRAFFIC_MAX_DURATION)
+        ),
+    }
+)
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Tasmota IRHVAC integration."""
     _LOGGER.debug("Setting up Tasmota IRHVAC integration")
     
     hass.data[DOMAIN] = {}
+
+    # Load the stored AC states of the whole fleet once, before any entity
+    store = hass.data[DATA_STATE_STORE] = IrhvacStateStore(hass)
+    await store.async_load()
+
+    async def async_handle_bulk_import(call: ServiceCall):
+        """Create config entries for many AC definitions."""
+        from .bulk_import import async_bulk_import
+
+        return await async_bulk_import(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_IMPORT,
+        async_handle_bulk_import,
+        schema=BULK_IMPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_handle_get_traces(call: ServiceCall):
+        """Return the recent command traces of some or all ACs."""
+        from .tracing import async_get_traces
+
+        return async_get_traces(hass).as_dict(call.data.get(ATTR_ENTITY_ID))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRACES,
+        async_handle_get_traces,
+        schema=GET_TRACES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_handle_get_latencies(call: ServiceCall):
+        """Return the timing histograms of some or all ACs and their blasters."""
+        from .metrics import async_get_metrics
+
+        metrics = async_get_metrics(hass)
+        entity_ids = call.data.get(ATTR_ENTITY_ID)
+        entities = {}
+        blasters = {}
+        for entity in hass.data.get(DATA_KEY, {}).values():
+            if entity_ids and entity.entity_id not in entity_ids:
+                continue
+            entities[entity.entity_id] = metrics.for_source(entity.unique_id)[
+                "histograms"
+            ]
+            blasters[entity.topic] = metrics.for_source(entity.topic)["histograms"]
+        return {"entities": entities, "blasters": blasters}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_LATENCIES,
+        async_handle_get_latencies,
+        schema=GET_LATENCIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_handle_profile(call: ServiceCall):
+        """Profile the hot paths and return the stages ranked by cost."""
+        from .profiler import async_profile
+
+        return await async_profile(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_handle_record_traffic(call: ServiceCall):
+        """Start recording the MQTT traffic of all ACs to a file."""
+        from .traffic_recorder import async_record_traffic
+
+        return await async_record_traffic(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        async_handle_record_traffic,
+        schema=RECORD_TRAFFIC_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_handle_stop_recording(call: ServiceCall):
+        """Stop the running MQTT traffic recording."""
+        from .traffic_recorder import async_stop_recording
+
+        return await async_stop_recording(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        async_handle_stop_recording,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     
     # Set up the climate platform for YAML configuration
     if DOMAIN in config:
@@ -43,23 +191,46 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tasmota IRHVAC from a config entry."""
     _LOGGER.debug("Setting up config entry: %s", entry.data)
     _LOGGER.debug("Config entry options: %s", entry.options)
-    
-    # Merge options with data for backward compatibility
-    config = {
-        **entry.data,
-        **entry.options
-    }
-    
-    hass.data[DOMAIN][entry.entry_id] = config
 
+    async_migrate_unique_id(hass, entry)
+    
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     
     return True
 
+@callback
+def async_migrate_unique_id(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Give entries created with the host's dots the unique_id of manual ones."""
+    from .config_flow import entry_unique_id
+
+    if not (host := entry.data.get(CONF_HOST)) or entry.unique_id != f"{DOMAIN}_{host}":
+        return
+    unique_id = entry_unique_id(host)
+    if unique_id == entry.unique_id:
+        return
+    if any(
+        other.unique_id == unique_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        _LOGGER.warning(
+            "%s is configured twice, remove one of the entries named %s",
+            host,
+            entry.title,
+        )
+        return
+    hass.config_entries.async_update_entry(entry, unique_id=unique_id)
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
+    from .climate import async_apply_entry_options
+
+    # Most options are applied to the running entity, only topics and
+    # identity changes need the entity and its subscriptions rebuilt
+    if async_apply_entry_options(hass, entry):
+        return
+
     _LOGGER.debug("Reloading entry with options: %s", entry.options)
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -72,6 +243,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Remove entry data
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        hass.data.get(DATA_KEY, {}).pop(entry.entry_id, None)
         _LOGGER.debug("Config entry unloaded successfully")
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the stored state and traces of the AC of a deleted entry."""
+    from homeassistant.helpers import entity_registry as er
+    from .tracing import async_get_traces
+
+    store = hass.data.get(DATA_STATE_STORE)
+    for entity_entry in er.async_entries_for_config_entry(
+        er.async_get(hass), entry.entry_id
+    ):
+        if entity_entry.domain != Platform.CLIMATE:
+            continue
+        if store is not None:
+            store.async_remove(entity_entry.unique_id)
+        async_get_traces(hass).async_remove(entity_entry.entity_id)
@@ -0,0 +1,538 @@
+"""Per-blaster scheduling of outbound IR frames."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.json import json_loads
+
+from .const import (
+    ACK_DONE,
+    ACK_FAILED,
+    ACK_LATENCY_SAMPLES,
+    ACK_TIMED_OUT,
+    ACK_TIMEOUT,
+    BLASTER_FRAME_SPACING,
+    DATA_BLASTERS,
+    DATA_PROFILER,
+    LANE_COSMETIC,
+    LANE_CRITICAL,
+    LANE_NORMAL,
+    RETRY_INITIAL_DELAY,
+    RETRY_MAX_AGE,
+    RETRY_MAX_DELAY,
+)
+from .metrics import async_get_metrics
+from .mqtt_hub import async_get_hub
+from .tracing import CommandTrace
+
+_LOGGER = logging.getLogger(__name__)
+
+# Payload fields whose change makes a frame critical or, alone, cosmetic
+CRITICAL_FIELDS = ("Power", "Mode")
+COSMETIC_FIELDS = frozenset(("Light", "Beep", "Filter", "Clean"))
+# Payload fields that differ between any two frames
+VOLATILE_FIELDS = frozenset(("Clock", "Weekday", "StateMode"))
+
+
+def _mqtt_connected(hass: HomeAssistant) -> bool:
+    """Return whether the MQTT client is connected to the broker."""
+    try:
+        return mqtt.is_connected(hass)
+    except KeyError:
+        # MQTT is not set up (yet)
+        return False
+
+
+def ack_topic_for(command_topic: str) -> str | None:
+    """Return the topic Tasmota answers a command on, if it can be derived.
+
+    `cmnd/living/irhvac` is answered on `stat/living/RESULT`, and custom
+    FullTopics like `living/cmnd/irhvac` on `living/stat/RESULT`.
+    """
+    parts = command_topic.split("/")
+    if "cmnd" not in parts[:-1]:
+        return None
+    parts[parts.index("cmnd")] = "stat"
+    parts[-1] = "RESULT"
+    return "/".join(parts)
+
+
+def classify_frame(data: dict[str, Any], last: dict[str, Any] | None) -> int:
+    """Return the priority lane of a payload, compared to the last one sent."""
+    if last is None:
+        return LANE_CRITICAL
+    if any(data.get(key) != last.get(key) for key in CRITICAL_FIELDS):
+        return LANE_CRITICAL
+    changed = {
+        key
+        for key, value in data.items()
+        if key not in VOLATILE_FIELDS and last.get(key) != value
+    }
+    if changed and changed <= COSMETIC_FIELDS:
+        return LANE_COSMETIC
+    return LANE_NORMAL
+
+
+@callback
+def async_get_blaster(hass: HomeAssistant, topic: str) -> IrBlaster:
+    """Return the scheduler of the blaster behind a command topic."""
+    blasters = hass.data.setdefault(DATA_BLASTERS, {})
+    if (blaster := blasters.get(topic)) is None:
+        blaster = blasters[topic] = IrBlaster(hass, topic)
+    return blaster
+
+
+@dataclass(slots=True)
+class IrFrame:
+    """One IRHVAC command on its way to a blaster."""
+
+    # unique_id of the entity sending the frame
+    key: str
+    # IRHVAC payload, serialized when published
+    data: dict[str, Any]
+    # mqtt_delay of the entity, waited before the frame goes out
+    delay: float = 0.0
+    queued_at: float = field(default_factory=time.monotonic)
+    # failed publish attempts and when the next retry is due
+    attempts: int = 0
+    retry_at: float = 0.0
+    # priority lane, set when the frame is first queued
+    lane: int | None = None
+    # called with the ack status and the publish to ack latency in seconds
+    on_ack: Callable[[str, float | None], None] | None = None
+    published_at: float = 0.0
+    retransmitted: bool = False
+    cancel_ack_timeout: Callable[[], None] | None = None
+    trace: CommandTrace | None = None
+
+    def mark(self, stage: str) -> None:
+        """Record a stage in the frame's trace."""
+        if self.trace is not None:
+            self.trace.mark(stage)
+
+
+class IrBlaster:
+    """Send the IR frames of every entity sharing one command topic.
+
+    Frames go out one at a time and at least BLASTER_FRAME_SPACING apart, so
+    several ACs behind the same blaster do not talk over each other.
+
+    The queue has one lane per priority. A frame changing Power or Mode
+    compared to the entity's last sent frame is critical, one changing only
+    Light, Beep, Filter or Clean is cosmetic, anything else is normal. The
+    next frame always comes from the highest non-empty lane. A new frame of
+    an entity replaces its queued one and keeps the higher of both lanes.
+
+    While the blaster's LWT reports Offline nothing is published. The outbox
+    keeps only the latest frame of each entity instead, and is flushed
+    through the normal queue once the blaster comes back Online.
+
+    A frame that cannot be published because MQTT is disconnected is retried
+    with exponential backoff, and right away once the client reconnects.
+    Only the newest failed frame of each entity is kept, and frames older
+    than RETRY_MAX_AGE are dropped.
+
+    Tasmota answers every IRHVAC command on the stat RESULT topic in order,
+    so published frames wait in a FIFO for their ack. A frame answered with
+    an error, or not at all within ACK_TIMEOUT, is retransmitted once unless
+    the entity has sent a newer frame since.
+    """
+
+    def __init__(self, hass: HomeAssistant, topic: str) -> None:
+        """Initialize the blaster."""
+        self.hass = hass
+        self.topic = topic
+        self.metrics = async_get_metrics(hass)
+        # None until the first LWT message
+        self.available: bool | None = None
+        # lane -> entity key -> queued frame
+        self._lanes: tuple[dict[str, IrFrame], ...] = tuple(
+            {} for _ in range(LANE_COSMETIC + 1)
+        )
+        # entity key -> payload of its last published frame
+        self._last_data: dict[str, dict[str, Any]] = {}
+        # entity key -> latest frame held while Offline
+        self._outbox: dict[str, IrFrame] = {}
+        self._task: asyncio.Task | None = None
+        self._last_sent = 0.0
+        self._users = 0
+        self._untrack: Callable[[], None] | None = None
+        # entity key -> newest frame waiting for a retry
+        self._retry: dict[str, IrFrame] = {}
+        self._cancel_retry: Callable[[], None] | None = None
+        self._unsubscribe_connection: Callable[[], None] | None = None
+        self.ack_topic = ack_topic_for(topic)
+        # published frames waiting for their ack, oldest first
+        self._inflight: deque[IrFrame] = deque()
+        self.ack_latencies: deque[float] = deque(maxlen=ACK_LATENCY_SAMPLES)
+        self._unregister_ack: Callable[[], None] | None = None
+        self.metrics.async_set("queue_depth", topic, 0)
+        self.metrics.async_set("outbox_depth", topic, 0)
+
+    @property
+    def outbox_depth(self) -> int:
+        """Return the number of frames held until the blaster is Online."""
+        return len(self._outbox)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of frames waiting to be published."""
+        return sum(len(lane) for lane in self._lanes)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the state of the queues for diagnostics."""
+        now = time.monotonic()
+
+        def describe(frame: IrFrame) -> dict[str, Any]:
+            return {
+                "entity": frame.key,
+                "lane": frame.lane,
+                "age_ms": round((now - frame.queued_at) * 1000, 1),
+                "attempts": frame.attempts,
+                "retransmitted": frame.retransmitted,
+                "trace_id": frame.trace.trace_id if frame.trace else None,
+            }
+
+        return {
+            "topic": self.topic,
+            "ack_topic": self.ack_topic,
+            "available": self.available,
+            "queue": [describe(frame) for lane in self._lanes for frame in lane.values()],
+            "outbox": [describe(frame) for frame in self._outbox.values()],
+            "retry": [describe(frame) for frame in self._retry.values()],
+            "awaiting_ack": [describe(frame) for frame in self._inflight],
+            "ack_latencies_ms": [round(latency * 1000, 1) for latency in self.ack_latencies],
+        }
+
+    @callback
+    def async_attach(
+        self, availability_topic: str, fleet: bool = False
+    ) -> Callable[[], None]:
+        """Start serving an entity and return a callable detaching it.
+
+        The availability of the first entity's LWT topic is tracked; entities
+        sharing a command topic share the device and so its LWT.
+        """
+        self._users += 1
+        if self._untrack is None:
+            hub = async_get_hub(self.hass)
+            self._untrack = hub.async_track_availability(
+                availability_topic, self._async_availability_changed, fleet
+            )
+            if self.ack_topic is not None:
+                self._unregister_ack = hub.async_register(
+                    self.ack_topic, self._async_ack_received, fleet
+                )
+            self._unsubscribe_connection = mqtt.async_subscribe_connection_status(
+                self.hass, self._async_connection_changed
+            )
+        attached = True
+
+        @callback
+        def async_detach() -> None:
+            nonlocal attached
+            if not attached:
+                return
+            attached = False
+            self._users -= 1
+            if self._users == 0:
+                self._async_shutdown()
+
+        return async_detach
+
+    @callback
+    def async_send(self, frame: IrFrame) -> None:
+        """Queue a frame, or hold it while the blaster is Offline."""
+        # A new command supersedes the entity's failed one
+        if (pending := self._retry.get(frame.key)) is not None and (
+            pending is not frame and pending.queued_at <= frame.queued_at
+        ):
+            del self._retry[frame.key]
+        if self.available is False:
+            frame.mark("held")
+            self._async_hold(frame)
+            return
+        frame.mark("queued")
+        if frame.lane is None:
+            frame.lane = classify_frame(frame.data, self._last_data.get(frame.key))
+        # Collapse the entity's queued frame into this one
+        for lane in self._lanes:
+            if (queued := lane.pop(frame.key, None)) is not None:
+                frame.lane = min(frame.lane, queued.lane)
+                queued.mark("collapsed")
+                self.metrics.async_increment("frames_collapsed", self.topic)
+                self.metrics.async_increment("commands_collapsed", queued.key)
+        self._lanes[frame.lane][frame.key] = frame
+        self.metrics.async_set("queue_depth", self.topic, self.queue_depth)
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"tasmota_irhvac blaster {self.topic}"
+            )
+
+    @callback
+    def _async_hold(self, frame: IrFrame) -> None:
+        """Keep a frame in the outbox unless a newer one of its entity is there."""
+        held = self._outbox.get(frame.key)
+        if held is not None and held.queued_at > frame.queued_at:
+            return
+        if held is None:
+            _LOGGER.debug("%s is offline, holding command", self.topic)
+        self._outbox.pop(frame.key, None)
+        self._outbox[frame.key] = frame
+        self.metrics.async_set("outbox_depth", self.topic, len(self._outbox))
+
+    @callback
+    def _async_availability_changed(self, available: bool) -> None:
+        """Flush the outbox once the blaster is back Online."""
+        self.available = available
+        if not available or not self._outbox:
+            return
+        frames = list(self._outbox.values())
+        self._outbox.clear()
+        self.metrics.async_set("outbox_depth", self.topic, 0)
+        _LOGGER.debug(
+            "%s is back online, sending %s held commands", self.topic, len(frames)
+        )
+        for frame in frames:
+            self.async_send(frame)
+
+    async def _async_run(self) -> None:
+        """Publish queued frames one by one."""
+        try:
+            while frame := self._async_next_frame():
+                wait = max(
+                    frame.delay, self._last_sent + BLASTER_FRAME_SPACING - time.monotonic()
+                )
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if self.available is False:
+                    # Went Offline while the frame was waiting
+                    self._async_hold(frame)
+                    continue
+                await self._async_publish(frame)
+        finally:
+            self._task = None
+
+    @callback
+    def _async_next_frame(self) -> IrFrame | None:
+        """Take the oldest frame of the highest non-empty lane."""
+        for lane in self._lanes:
+            if lane:
+                frame = lane.pop(next(iter(lane)))
+                frame.mark("dequeued")
+                self.metrics.async_set("queue_depth", self.topic, self.queue_depth)
+                return frame
+        return None
+
+    async def _async_publish(self, frame: IrFrame) -> None:
+        """Publish one frame."""
+        if (profiler := self.hass.data.get(DATA_PROFILER)) is not None:
+            started = profiler.start()
+        try:
+            await mqtt.async_publish(self.hass, self.topic, json.dumps(frame.data))
+        except HomeAssistantError as e:
+            # A disconnected client fails the publish with a plain error
+            if _mqtt_connected(self.hass):
+                _LOGGER.error("Error publishing MQTT message: %s", str(e))
+            else:
+                self._async_retry_later(frame)
+            return
+        except Exception as e:
+            _LOGGER.error("Error publishing MQTT message: %s", str(e))
+            return
+        finally:
+            if profiler is not None:
+                profiler.stop("publish", started)
+        self._last_sent = time.monotonic()
+        frame.mark("published")
+        # From the service call (or send_ir), including mqtt_delay and the queue
+        started = frame.trace.started if frame.trace is not None else frame.queued_at
+        latency_ms = (self._last_sent - started) * 1000
+        self.metrics.async_observe("service_to_publish", self.topic, latency_ms)
+        self.metrics.async_observe("service_to_publish", frame.key, latency_ms)
+        self._last_data[frame.key] = frame.data
+        self.metrics.async_increment("publish_succeeded", self.topic)
+        self.metrics.async_increment("commands_sent", frame.key)
+        if self.ack_topic is not None:
+            frame.published_at = self._last_sent
+            frame.cancel_ack_timeout = async_call_later(
+                self.hass, ACK_TIMEOUT, partial(self._async_ack_timeout, frame)
+            )
+            self._inflight.append(frame)
+        # An older failed frame of the entity must not follow this one
+        if (pending := self._retry.get(frame.key)) is not None and (
+            pending.queued_at <= frame.queued_at
+        ):
+            del self._retry[frame.key]
+
+    @callback
+    def _async_ack_received(self, msg: mqtt.ReceiveMessage) -> None:
+        """Match a RESULT ack with the oldest frame waiting for one."""
+        try:
+            payload = json_loads(msg.payload)
+        except ValueError:
+            return
+        if not isinstance(payload, dict):
+            return
+        result = payload.get("IRHVAC")
+        if isinstance(result, dict):
+            # Some firmware acks a sent command by echoing the state it set
+            result = "Done"
+        elif not isinstance(result, str):
+            return
+        if not self._inflight:
+            return
+        frame = self._inflight.popleft()
+        if frame.cancel_ack_timeout is not None:
+            frame.cancel_ack_timeout()
+            frame.cancel_ack_timeout = None
+        latency = time.monotonic() - frame.published_at
+        if result.lower() != "done":
+            _LOGGER.warning("%s rejected command for %s: %s", self.topic, frame.key, result)
+            self.metrics.async_increment("acks_failed", self.topic)
+            frame.mark("ack_failed")
+            self._async_ack_failed(frame, ACK_FAILED, latency)
+            return
+        frame.mark("ack")
+        self.ack_latencies.append(latency)
+        self.metrics.async_increment("acks_done", self.topic)
+        self.metrics.async_set("ack_latency", self.topic, round(latency * 1000, 1))
+        if frame.on_ack is not None:
+            frame.on_ack(ACK_DONE, latency)
+
+    @callback
+    def _async_ack_timeout(self, frame: IrFrame, _now=None) -> None:
+        """Give up waiting for the ack of a frame."""
+        frame.cancel_ack_timeout = None
+        if frame not in self._inflight:
+            return
+        self._inflight.remove(frame)
+        _LOGGER.warning("%s did not acknowledge command for %s", self.topic, frame.key)
+        self.metrics.async_increment("acks_timed_out", self.topic)
+        frame.mark("ack_timeout")
+        self._async_ack_failed(frame, ACK_TIMED_OUT, None)
+
+    @callback
+    def _async_ack_failed(
+        self, frame: IrFrame, status: str, latency: float | None
+    ) -> None:
+        """Report a failed frame and retransmit it once if it is still current."""
+        if frame.on_ack is not None:
+            frame.on_ack(status, latency)
+        if frame.retransmitted or self._last_data.get(frame.key) is not frame.data:
+            return
+        if any(frame.key in lane for lane in self._lanes):
+            return
+        frame.retransmitted = True
+        frame.mark("retransmit")
+        self.metrics.async_increment("retransmits", self.topic)
+        self.async_send(frame)
+
+    @callback
+    def _async_retry_later(self, frame: IrFrame) -> None:
+        """Keep a frame for a retry with backoff, unless it is too old."""
+        now = time.monotonic()
+        if now - frame.queued_at > RETRY_MAX_AGE:
+            _LOGGER.error(
+                "MQTT is not connected, dropping command for %s after %s attempts",
+                frame.key,
+                frame.attempts + 1,
+            )
+            self.metrics.async_increment("publish_expired", self.topic)
+            frame.mark("expired")
+            return
+        pending = self._retry.get(frame.key)
+        if pending is not None and pending.queued_at > frame.queued_at:
+            return
+        frame.attempts += 1
+        frame.retry_at = now + min(
+            RETRY_INITIAL_DELAY * 2 ** (frame.attempts - 1), RETRY_MAX_DELAY
+        )
+        if frame.attempts == 1:
+            _LOGGER.warning(
+                "MQTT is not connected, retrying command for %s", frame.key
+            )
+        self._retry[frame.key] = frame
+        self._async_schedule_retry()
+
+    @callback
+    def _async_schedule_retry(self) -> None:
+        """Arm the timer for the earliest retry."""
+        if self._cancel_retry is not None:
+            self._cancel_retry()
+            self._cancel_retry = None
+        if not self._retry:
+            return
+        retry_at = min(frame.retry_at for frame in self._retry.values())
+        self._cancel_retry = async_call_later(
+            self.hass, max(retry_at - time.monotonic(), 0), self._async_retry_due
+        )
+
+    @callback
+    def _async_retry_due(self, _now=None) -> None:
+        """Resend the frames whose backoff has passed."""
+        self._cancel_retry = None
+        now = time.monotonic()
+        self._async_resend(
+            [frame for frame in self._retry.values() if frame.retry_at <= now]
+        )
+
+    @callback
+    def _async_connection_changed(self, connected: bool) -> None:
+        """Resend every waiting frame as soon as MQTT is back."""
+        if connected and self._retry:
+            self._async_resend(list(self._retry.values()))
+
+    @callback
+    def _async_resend(self, frames: list[IrFrame]) -> None:
+        """Move frames from the retry queue back into the send queue."""
+        for frame in frames:
+            del self._retry[frame.key]
+            self.metrics.async_increment("publish_retried", self.topic)
+            self.metrics.async_increment("commands_retried", frame.key)
+            frame.mark("retry")
+            self.async_send(frame)
+        self._async_schedule_retry()
+
+    @callback
+    def _async_shutdown(self) -> None:
+        """Stop serving once the last entity is gone."""
+        if self._untrack is not None:
+            self._untrack()
+            self._untrack = None
+        if self._unsubscribe_connection is not None:
+            self._unsubscribe_connection()
+            self._unsubscribe_connection = None
+        if self._cancel_retry is not None:
+            self._cancel_retry()
+            self._cancel_retry = None
+        self._retry.clear()
+        if self._unregister_ack is not None:
+            self._unregister_ack()
+            self._unregister_ack = None
+        for frame in self._inflight:
+            if frame.cancel_ack_timeout is not None:
+                frame.cancel_ack_timeout()
+                frame.cancel_ack_timeout = None
+        self._inflight.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for lane in self._lanes:
+            lane.clear()
+        self._last_data.clear()
+        self._outbox.clear()
+        self.metrics.async_remove_source(self.topic)
+        self.hass.data.get(DATA_BLASTERS, {}).pop(self.topic, None)
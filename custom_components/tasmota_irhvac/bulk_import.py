@@ -0,0 +1,194 @@
+"""Bulk import of AC definitions into config entries.
+
+Imported lazily by the `tasmota_irhvac.bulk_import` service.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PLATFORM
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.yaml import parse_yaml
+
+from .climate import PLATFORM_SCHEMA
+from .config_flow import bulk_unique_id
+from .const import (
+    ATTR_CSV,
+    ATTR_DEVICES,
+    ATTR_DRY_RUN,
+    ATTR_YAML,
+    CONF_COMMAND_TOPIC,
+    CONF_FAN_LIST,
+    CONF_MODES_LIST,
+    CONF_PROTOCOL,
+    CONF_STATE_TOPIC,
+    CONF_SWING_LIST,
+    CONF_TOGGLE_LIST,
+    CONF_VENDOR,
+    DOMAIN,
+    SOURCE_BULK,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys every definition must set explicitly (PLATFORM_SCHEMA has defaults)
+REQUIRED_KEYS = (CONF_NAME, CONF_COMMAND_TOPIC, CONF_STATE_TOPIC)
+
+# Invalid definitions listed in the error of a failed import
+MAX_REPORTED_ERRORS = 10
+
+# CSV cells holding lists, separated by "|"
+CSV_LIST_KEYS = (
+    CONF_STATE_TOPIC,
+    CONF_MODES_LIST,
+    CONF_FAN_LIST,
+    CONF_SWING_LIST,
+    CONF_TOGGLE_LIST,
+)
+
+
+def parse_csv(text: str) -> list[dict[str, Any]]:
+    """Parse AC definitions from CSV with a header row of config keys."""
+    definitions = []
+    for row in csv.DictReader(io.StringIO(text.strip())):
+        definition = {}
+        for key, value in row.items():
+            if key is None or value is None or not value.strip():
+                continue
+            key = key.strip()
+            value = value.strip()
+            if key in CSV_LIST_KEYS:
+                value = [item.strip() for item in value.split("|") if item.strip()]
+            definition[key] = value
+        definitions.append(definition)
+    return definitions
+
+
+def load_definitions(data: dict[str, Any]) -> list[Any]:
+    """Return the raw AC definitions of a service call."""
+    if ATTR_CSV in data:
+        return parse_csv(data[ATTR_CSV])
+    if ATTR_YAML in data:
+        try:
+            definitions = parse_yaml(data[ATTR_YAML])
+        except HomeAssistantError as e:
+            raise HomeAssistantError(f"Invalid YAML: {e}") from e
+        if isinstance(definitions, dict):
+            # A pasted `climate:` section
+            definitions = definitions.get("climate", [definitions])
+        return definitions if isinstance(definitions, list) else [definitions]
+    return data.get(ATTR_DEVICES, [])
+
+
+def validate_definition(definition: Any) -> dict[str, Any]:
+    """Validate one AC definition and return its config entry data.
+
+    Only the keys given in the definition are stored; everything else keeps
+    following the defaults applied when the entry is set up.
+    """
+    if not isinstance(definition, dict):
+        raise vol.Invalid("expected a mapping")
+    definition = dict(definition)
+    definition.pop(CONF_PLATFORM, None)
+    host = definition.pop(CONF_HOST, None)
+    if missing := [key for key in REQUIRED_KEYS if not definition.get(key)]:
+        raise vol.Invalid(f"missing {', '.join(missing)}")
+    if not definition.get(CONF_VENDOR) and not definition.get(CONF_PROTOCOL):
+        raise vol.Invalid("missing vendor")
+
+    validated = PLATFORM_SCHEMA({CONF_PLATFORM: DOMAIN, **definition})
+    data = {key: validated[key] for key in definition if key in validated}
+    # Config entries only know the vendor
+    if CONF_PROTOCOL in data:
+        data[CONF_VENDOR] = data.pop(CONF_PROTOCOL)
+    if host:
+        data[CONF_HOST] = str(host)
+    return data
+
+
+async def async_bulk_import(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Create config entries for many AC definitions in one pass.
+
+    All definitions are validated before anything is created, so a single
+    bad row leaves the existing configuration untouched.
+    """
+    definitions = load_definitions(call.data)
+
+    entries = []
+    errors = []
+    other_platforms = 0
+    for index, definition in enumerate(definitions, start=1):
+        # A pasted `climate:` section also holds entities of other platforms
+        if (
+            isinstance(definition, dict)
+            and definition.get(CONF_PLATFORM, DOMAIN) != DOMAIN
+        ):
+            other_platforms += 1
+            continue
+        try:
+            entries.append(validate_definition(definition))
+        except vol.Invalid as e:
+            name = definition.get(CONF_NAME) if isinstance(definition, dict) else None
+            errors.append(f"#{index} ({name or 'unnamed'}): {e}")
+    if errors:
+        more = len(errors) - MAX_REPORTED_ERRORS
+        raise HomeAssistantError(
+            f"{len(errors)} invalid AC definitions: "
+            + "; ".join(errors[:MAX_REPORTED_ERRORS])
+            + (f"; and {more} more" if more > 0 else "")
+        )
+
+    # One lookup of the configured devices, also deduplicating the batch
+    known = {
+        entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    to_create = []
+    skipped = []
+    for data in entries:
+        unique_id = bulk_unique_id(data)
+        if unique_id in known:
+            skipped.append(data[CONF_NAME])
+            continue
+        known.add(unique_id)
+        to_create.append(data)
+
+    created = []
+    if not call.data.get(ATTR_DRY_RUN):
+        results = await asyncio.gather(
+            *(
+                hass.config_entries.flow.async_init(
+                    DOMAIN, context={"source": SOURCE_BULK}, data=data
+                )
+                for data in to_create
+            ),
+            return_exceptions=True,
+        )
+        for data, result in zip(to_create, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Error importing %s: %s", data[CONF_NAME], str(result))
+            elif result.get("type") == "create_entry":
+                created.append(data[CONF_NAME])
+            else:
+                skipped.append(data[CONF_NAME])
+    else:
+        created = [data[CONF_NAME] for data in to_create]
+
+    _LOGGER.info(
+        "Bulk import: %s created, %s skipped, %s of other platforms ignored%s",
+        len(created),
+        len(skipped),
+        other_platforms,
+        " (dry run)" if call.data.get(ATTR_DRY_RUN) else "",
+    )
+    return {
+        "created": created,
+        "skipped": skipped,
+        "other_platforms": other_platforms,
+    }
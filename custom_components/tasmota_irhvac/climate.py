@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 import uuid
 
 # Third-party imports
@@ -14,7 +15,6 @@ import voluptuous as vol
 from homeassistant.core import (
     HomeAssistant,
     ServiceCall,
-    cached_property,
     callback,
 )
 from homeassistant.config_entries import ConfigEntry
@@ -66,6 +66,7 @@ from homeassistant.components.climate.const import (
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     ATTR_TEMPERATURE,
+    CONF_HOST,
     CONF_NAME,
     CONF_UNIQUE_ID,
     PRECISION_HALVES,
@@ -92,6 +93,8 @@ from .const import (
     ATTR_SWINGH,
     ATTR_LAST_ON_MODE,
     ATTR_STATE_MODE,
+    ATTR_LAST_ACK,
+    ATTR_ACK_LATENCY,
     ATTRIBUTES_IRHVAC,
     CONF_AVAILABILITY_TOPIC,
     STATE_AUTO,
@@ -138,7 +141,12 @@ from .const import (
     CONF_SWINGH,
     CONF_TOGGLE_LIST,
     CONF_IGNORE_OFF_TEMP,
+    CONF_FLEET_MODE,
     DATA_KEY,
+    DATA_PROFILER,
+    DATA_STATE_STORE,
+    STATE_DEDUP_WINDOW,
+    TRACE_ECHO_WINDOW,
     DOMAIN,
     DEFAULT_NAME,
     DEFAULT_STATE_TOPIC,
@@ -163,6 +171,7 @@ from .const import (
     DEFAULT_CONF_KEEP_MODE,
     DEFAULT_STATE_MODE,
     DEFAULT_IGNORE_OFF_TEMP,
+    DEFAULT_FLEET_MODE,
     ON_OFF_LIST,
     STATE_MODE_LIST,
     SERVICE_ECONO_MODE,
@@ -177,6 +186,10 @@ from .const import (
     SERVICE_SET_SWINGH,
     TOGGLE_ALL_LIST,
 )
+from .blaster import IrFrame, async_get_blaster
+from .metrics import async_get_metrics
+from .mqtt_hub import async_get_hub
+from .tracing import async_get_traces
 
 # Add OFF mode to the default modes list
 # This ensures the OFF button/mode is available in the UI
@@ -186,6 +199,33 @@ DEFAULT_MODES_LIST_WITH_OFF = [HVACMode.OFF] + list(DEFAULT_MODES_LIST)
 DEFAULT_SWING_LIST = [SWING_OFF, SWING_VERTICAL]
 DEFAULT_INITIAL_OPERATION_MODE = HVACMode.OFF
 
+# Entity attributes kept in the state store snapshot, by snapshot key
+STATE_SNAPSHOT_FIELDS = {
+    "mode": "_attr_hvac_mode",
+    "last_on_mode": "_last_on_mode",
+    "power": "power_mode",
+    "temp": "_attr_target_temperature",
+    "fan": "_attr_fan_mode",
+    "swing": "_attr_swing_mode",
+    "away": "_is_away",
+    "saved_temp": "_saved_target_temp",
+    "celsius": "_celsius",
+    "econo": "_econo",
+    "turbo": "_turbo",
+    "quiet": "_quiet",
+    "light": "_light",
+    "filter": "_filter",
+    "clean": "_clean",
+    "beep": "_beep",
+    "sleep": "_sleep",
+    "swingv": "_swingv",
+    "swingh": "_swingh",
+    "fix_swingv": "_fix_swingv",
+    "fix_swingh": "_fix_swingh",
+    "presets": "_active_feature_presets",
+    "toggles": "_active_feature_toggles",
+}
+
 _LOGGER = logging.getLogger(__name__)
 
 SUPPORT_FLAGS = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.FAN_MODE
@@ -208,7 +248,7 @@ PLATFORM_SCHEMA = CLIMATE_PLATFORM_SCHEMA.extend(
         vol.Optional(CONF_POWER_SENSOR): cv.entity_id,
         vol.Optional(
             CONF_STATE_TOPIC, default=DEFAULT_STATE_TOPIC
-        ): mqtt.valid_subscribe_topic,
+        ): vol.All(cv.ensure_list, [mqtt.valid_subscribe_topic]),
         vol.Optional(CONF_STATE_TOPIC + "_2"): mqtt.util.valid_topic,
         vol.Optional(CONF_MQTT_DELAY, default=DEFAULT_MQTT_DELAY): vol.Coerce(float),
         vol.Optional(CONF_MAX_TEMP, default=DEFAULT_MAX_TEMP): vol.Coerce(float),
@@ -273,6 +313,7 @@ PLATFORM_SCHEMA = CLIMATE_PLATFORM_SCHEMA.extend(
             [vol.In(TOGGLE_ALL_LIST)],
         ),
         vol.Optional(CONF_IGNORE_OFF_TEMP, default=DEFAULT_IGNORE_OFF_TEMP): cv.boolean,
+        vol.Optional(CONF_FLEET_MODE, default=DEFAULT_FLEET_MODE): cv.boolean,
     }
 )
 
@@ -458,6 +499,8 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         for device in devices:
             if not hasattr(device, method["method"]):
                 continue
+            # Lets the command's trace pick up the id of this call
+            device.async_set_context(service.context)
             await getattr(device, method["method"])(**params)
             update_tasks.append(asyncio.create_task(device.async_update_ha_state(True)))
 
@@ -471,38 +514,42 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         )
 
 
-async def async_update_options(self, config_entry):
-        """Update options."""
-        await self.async_reload(config_entry)
-
-async def async_reload(self, config_entry):
-        """Reload the config entry."""
-        # Merge options and data
-        config = {
-            **config_entry.data,
-            **config_entry.options
-        }
+# Options async_apply_options can change on the running entity. Changing any
+# other key (topics, sensors, identity, feature defaults) reloads the entry.
+LIVE_OPTIONS = (
+    CONF_MIN_TEMP,
+    CONF_MAX_TEMP,
+    CONF_TARGET_TEMP,
+    CONF_AWAY_TEMP,
+    CONF_PRECISION,
+    CONF_TEMP_STEP,
+    CONF_MQTT_DELAY,
+    CONF_KEEP_MODE,
+    CONF_IGNORE_OFF_TEMP,
+    CONF_TOGGLE_LIST,
+    CONF_MODES_LIST,
+    CONF_FAN_LIST,
+    CONF_SWING_LIST,
+    "enabled_presets",
+    "default_presets",
+)
 
-        # Update settings
-        self._min_temp = config.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)
-        self._max_temp = config.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP)
-        self._attr_target_temperature_step = config.get(CONF_TEMP_STEP, DEFAULT_PRECISION)
-        # Update other settings as needed
-        
-        # Force state refresh
-        await self.async_update_ha_state(force_refresh=True)
+def entity_unique_id(config: dict) -> str:
+    """Return the unique_id of the entity built from a config."""
+    # Use host for unique_id if available, otherwise use command topic
+    if config.get(CONF_HOST):
+        return f"tasmota_irhvac_{config[CONF_HOST].replace('.', '_')}"
+    return f"tasmota_irhvac_{config[CONF_COMMAND_TOPIC].replace('/', '_')}"
 
-async def async_setup_entry(hass: HomeAssistant,
-                          config_entry: ConfigEntry,
-                          async_add_entities: AddEntitiesCallback) -> bool:
-    """Set up the Tasmota IRHVAC climate device from config entry."""
-    
+def entry_config(config_entry: ConfigEntry) -> dict:
+    """Build the entity config from a config entry's data and options."""
     config = {
         # Basic configuration
         CONF_NAME: config_entry.data.get(CONF_NAME),
         CONF_VENDOR: config_entry.data.get(CONF_VENDOR),
         CONF_COMMAND_TOPIC: config_entry.data.get(CONF_COMMAND_TOPIC),
         CONF_STATE_TOPIC: config_entry.data.get(CONF_STATE_TOPIC),
+        CONF_STATE_TOPIC + "_2": config_entry.data.get(CONF_STATE_TOPIC + "_2"),
         CONF_AVAILABILITY_TOPIC: config_entry.data.get(CONF_AVAILABILITY_TOPIC),
         
         # Temperature settings
@@ -514,6 +561,7 @@ async def async_setup_entry(hass: HomeAssistant,
         
         # MQTT settings
         CONF_MQTT_DELAY: config_entry.data.get(CONF_MQTT_DELAY, DEFAULT_MQTT_DELAY),
+        CONF_FLEET_MODE: config_entry.data.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE),
         
         # Mode settings
         CONF_MODEL: config_entry.data.get(CONF_MODEL, DEFAULT_CONF_MODEL),
@@ -571,6 +619,38 @@ async def async_setup_entry(hass: HomeAssistant,
                 _LOGGER.debug("Updated %s to %s", key, value)
 
     _LOGGER.debug("Final processed config: %s", config)
+    return config
+
+@callback
+def async_apply_entry_options(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Apply a changed config entry to its running entity.
+
+    Returns False when the change needs a reload of the entry.
+    """
+    entity = hass.data.get(DATA_KEY, {}).get(config_entry.entry_id)
+    old_config = hass.data[DOMAIN].get(config_entry.entry_id)
+    if entity is None or old_config is None:
+        return False
+
+    config = entry_config(config_entry)
+    changed = {
+        key for key in config.keys() | old_config.keys()
+        if config.get(key) != old_config.get(key)
+    }
+    if not changed.issubset(LIVE_OPTIONS):
+        _LOGGER.debug("Options %s need a reload", changed.difference(LIVE_OPTIONS))
+        return False
+
+    hass.data[DOMAIN][config_entry.entry_id] = config
+    if changed:
+        entity.async_apply_options(config)
+    return True
+
+async def async_setup_entry(hass: HomeAssistant,
+                          config_entry: ConfigEntry,
+                          async_add_entities: AddEntitiesCallback) -> bool:
+    """Set up the Tasmota IRHVAC climate device from config entry."""
+    config = entry_config(config_entry)
 
     try:
         # Create the climate entity
@@ -580,6 +660,8 @@ async def async_setup_entry(hass: HomeAssistant,
             config,
         )
         async_add_entities([tasmota_irhvac])
+        hass.data[DOMAIN][config_entry.entry_id] = config
+        hass.data.setdefault(DATA_KEY, {})[config_entry.entry_id] = tasmota_irhvac
 
         _LOGGER.debug("Created TasmotaIrhvac instance with presets: %s",
                      tasmota_irhvac._attr_preset_modes)
@@ -596,7 +678,7 @@ async def async_setup_entry(hass: HomeAssistant,
             # Get target devices
             entity_ids = service.data.get(ATTR_ENTITY_ID)
             devices = [
-                device for device in hass.data[DOMAIN].values()
+                device for device in hass.data[DATA_KEY].values()
                 if not entity_ids or device.entity_id in entity_ids
             ]
 
@@ -604,6 +686,7 @@ async def async_setup_entry(hass: HomeAssistant,
             for device in devices:
                 if not hasattr(device, method.get("method", "")):
                     continue
+                device.async_set_context(service.context)
                 await getattr(device, method["method"])(**params)
                 update_tasks.append(device.async_update_ha_state(True))
 
@@ -641,12 +724,7 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         """Initialize the thermostat."""
         # Set basic attributes first
         self._attr_name = config.get(CONF_NAME)
-        # Use host for unique_id if available, otherwise use command topic
-        if config.get('host'):
-            self._attr_unique_id = f"tasmota_irhvac_{config['host'].replace('.', '_')}"
-        else:
-            self._attr_unique_id = f"tasmota_irhvac_{config[CONF_COMMAND_TOPIC].replace('/', '_')}"
-            _LOGGER.debug("No host provided, using command topic as unique_id")
+        self._attr_unique_id = entity_unique_id(config)
         self._attr_should_poll = False
         
         # Add device info
@@ -662,13 +740,21 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         self.topic = config.get(CONF_COMMAND_TOPIC)
         self.hass = hass
         self._vendor = vendor
-        self.state_topic = config[CONF_STATE_TOPIC]
-        self.state_topic2 = config.get(CONF_STATE_TOPIC + "_2")
+        # Any number of state topics (e.g. tele and stat, or receivers in
+        # several rooms), plus the legacy state_topic_2
+        self.state_topics = list(dict.fromkeys(
+            cv.ensure_list(config[CONF_STATE_TOPIC])
+            + cv.ensure_list(config.get(CONF_STATE_TOPIC + "_2"))
+        ))
+        self.state_topic = self.state_topics[0]
+        self._last_frame = None
+        self._last_frame_at = 0.0
         self.availability_topic = config.get(CONF_AVAILABILITY_TOPIC)
         if (self.availability_topic) is None:
             path = self.topic.split("/")
             self.availability_topic = "tele/" + path[1] + "/LWT"
         self._mqtt_delay = config[CONF_MQTT_DELAY]
+        self._fleet_mode = config.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE)
 
         # Sensor configurations
         self._temp_sensor = str(config.get(CONF_TEMP_SENSOR)) if config.get(CONF_TEMP_SENSOR) else None
@@ -694,58 +780,9 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         self._attr_hvac_mode = config.get(CONF_INITIAL_OPERATION_MODE)
         self._attr_hvac_modes = config[CONF_MODES_LIST]
 
-        # Fan settings
-        self._attr_fan_modes = config.get(CONF_FAN_LIST)
-        self._attr_fan_mode = (
-            self._attr_fan_modes[0]
-            if isinstance(self._attr_fan_modes, list) and len(self._attr_fan_modes)
-            else None
-        )
-
-        # Fan quirks handling
-        self._quirk_fan_max_high = all([
-            isinstance(self._attr_fan_modes, list),
-            HVAC_FAN_MAX_HIGH in self._attr_fan_modes,
-            HVAC_FAN_AUTO_MAX in self._attr_fan_modes,
-        ])
-
-        if self._quirk_fan_max_high:
-            new_fan_list = []
-            for val in self._attr_fan_modes:
-                if val == HVAC_FAN_MAX_HIGH:
-                    new_fan_list.append(FAN_HIGH)
-                elif val == HVAC_FAN_AUTO_MAX:
-                    new_fan_list.append(HVAC_FAN_MAX)
-                else:
-                    new_fan_list.append(val)
-            self._attr_fan_modes = new_fan_list if len(new_fan_list) else None
-
-        # Set quirk_fan_prettify if we have min/max fan modes that need prettification
-        self._quirk_fan_prettify = any(mode in (self._attr_fan_modes or []) for mode in [HVAC_FAN_MIN, HVAC_FAN_MAX])
-        
-        # Log the fan modes and prettification status
-        _LOGGER.debug("Fan modes before prettification: %s", self._attr_fan_modes)
-        _LOGGER.debug("Fan prettification enabled: %s", self._quirk_fan_prettify)
-        
-        # Apply prettification if needed
-        if self._quirk_fan_prettify and self._attr_fan_modes:
-            self._attr_fan_modes = [self.fan_prettify(mode) for mode in self._attr_fan_modes]
-            _LOGGER.debug("Fan modes after prettification: %s", self._attr_fan_modes)
-        
-        # Set initial fan mode
-        self._attr_fan_mode = (
-            self._attr_fan_modes[0]
-            if isinstance(self._attr_fan_modes, list) and len(self._attr_fan_modes)
-            else None
-        )
-
-        # Swing settings
-        self._attr_swing_modes = config.get(CONF_SWING_LIST)
-        self._attr_swing_mode = (
-            self._attr_swing_modes[0]
-            if isinstance(self._attr_swing_modes, list) and len(self._attr_swing_modes)
-            else None
-        )
+        # Fan and swing settings
+        self._set_fan_modes(config.get(CONF_FAN_LIST))
+        self._set_swing_modes(config.get(CONF_SWING_LIST))
 
         # Feature settings
         self._quiet = config[CONF_QUIET].lower()
@@ -794,42 +831,11 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         # Initialize preset modes
         self._is_away = False
         self._saved_target_temp = None
-        
-        # Get configured presets
-        enabled_presets = config.get("enabled_presets", [])
-        default_presets = config.get("default_presets", [])
-        
-        _LOGGER.debug("Initializing with enabled presets: %s, default presets: %s",
-                    enabled_presets, default_presets)
-
-        # Initialize feature presets and toggles
         self._active_feature_presets = {}
         self._active_feature_toggles = {}
-        
-        for preset in enabled_presets:
-            initial_state = "on" if preset in default_presets else "off"
-            setattr(self, f"_{preset}", initial_state)
-            
-            # Determine if this is a preset or toggle feature
-            if preset in self._feature_presets:
-                self._active_feature_presets[preset] = initial_state
-            elif preset in self._feature_toggles:
-                self._active_feature_toggles[preset] = initial_state
-
-        # Set up available preset modes
-        self._attr_preset_modes = [PRESET_NONE]
-        if self._away_temp is not None:
-            self._attr_preset_modes.append(PRESET_AWAY)
-        
-        # Add feature presets (mutually exclusive modes)
-        preset_features = [p for p in enabled_presets if p in self._feature_presets and p != "sleep" and p != "econo"]
-        if preset_features:
-            # Ensure proper capitalization for UI display
-            self._attr_preset_modes.extend([p.capitalize() for p in preset_features])
-            
-        # Always add ECO preset
-        if PRESET_ECO not in self._attr_preset_modes:
-            self._attr_preset_modes.append(PRESET_ECO)
+        self._set_preset_modes(
+            config.get("enabled_presets", []), config.get("default_presets", [])
+        )
 
         # Additional settings
         self._sub_state = None
@@ -853,7 +859,13 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
 
         # Tracking settings
         self._use_track_state_change_event = False
+        self._state_restored = False
         self._unsubscribes = []
+        self._blaster = None
+        self._last_ack = None
+        self._ack_latency = None
+        self._trace = None
+        self._metrics = async_get_metrics(hass)
 
         # Temperature attributes
         self._attr_target_temperature_step = config[CONF_TEMP_STEP]
@@ -868,7 +880,113 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
             else UnitOfTemperature.FAHRENHEIT
         )
         
-        # Support flags
+        self._update_support_flags()
+
+    def _set_fan_modes(self, fan_list):
+        """Set the fan modes, applying the vendor quirks."""
+        current_fan_mode = getattr(self, "_attr_fan_mode", None)
+        self._attr_fan_modes = fan_list
+
+        # Fan quirks handling
+        self._quirk_fan_max_high = all([
+            isinstance(self._attr_fan_modes, list),
+            HVAC_FAN_MAX_HIGH in (self._attr_fan_modes or []),
+            HVAC_FAN_AUTO_MAX in (self._attr_fan_modes or []),
+        ])
+
+        if self._quirk_fan_max_high:
+            new_fan_list = []
+            for val in self._attr_fan_modes:
+                if val == HVAC_FAN_MAX_HIGH:
+                    new_fan_list.append(FAN_HIGH)
+                elif val == HVAC_FAN_AUTO_MAX:
+                    new_fan_list.append(HVAC_FAN_MAX)
+                else:
+                    new_fan_list.append(val)
+            self._attr_fan_modes = new_fan_list if len(new_fan_list) else None
+
+        # Set quirk_fan_prettify if we have min/max fan modes that need prettification
+        self._quirk_fan_prettify = any(mode in (self._attr_fan_modes or []) for mode in [HVAC_FAN_MIN, HVAC_FAN_MAX])
+        
+        # Log the fan modes and prettification status
+        _LOGGER.debug("Fan modes before prettification: %s", self._attr_fan_modes)
+        _LOGGER.debug("Fan prettification enabled: %s", self._quirk_fan_prettify)
+        
+        # Apply prettification if needed
+        if self._quirk_fan_prettify and self._attr_fan_modes:
+            self._attr_fan_modes = [self.fan_prettify(mode) for mode in self._attr_fan_modes]
+            _LOGGER.debug("Fan modes after prettification: %s", self._attr_fan_modes)
+        
+        # Keep the current fan mode if it is still supported, else use the first one
+        if isinstance(self._attr_fan_modes, list) and current_fan_mode in self._attr_fan_modes:
+            self._attr_fan_mode = current_fan_mode
+        else:
+            self._attr_fan_mode = (
+                self._attr_fan_modes[0]
+                if isinstance(self._attr_fan_modes, list) and len(self._attr_fan_modes)
+                else None
+            )
+
+    def _set_swing_modes(self, swing_list):
+        """Set the swing modes."""
+        current_swing_mode = getattr(self, "_attr_swing_mode", None)
+        self._attr_swing_modes = swing_list
+        if isinstance(self._attr_swing_modes, list) and current_swing_mode in self._attr_swing_modes:
+            self._attr_swing_mode = current_swing_mode
+        else:
+            self._attr_swing_mode = (
+                self._attr_swing_modes[0]
+                if isinstance(self._attr_swing_modes, list) and len(self._attr_swing_modes)
+                else None
+            )
+
+    def _set_preset_modes(self, enabled_presets, default_presets):
+        """Set the enabled feature presets/toggles and the preset modes they offer.
+
+        Features that were already enabled keep their current state, newly
+        enabled ones start from their default.
+        """
+        _LOGGER.debug("Initializing with enabled presets: %s, default presets: %s",
+                    enabled_presets, default_presets)
+
+        # Initialize feature presets and toggles
+        active_feature_presets = {}
+        active_feature_toggles = {}
+        
+        for preset in enabled_presets:
+            initial_state = self._active_feature_presets.get(
+                preset, self._active_feature_toggles.get(preset)
+            )
+            if initial_state is None:
+                initial_state = "on" if preset in default_presets else "off"
+            setattr(self, f"_{preset}", initial_state)
+            
+            # Determine if this is a preset or toggle feature
+            if preset in self._feature_presets:
+                active_feature_presets[preset] = initial_state
+            elif preset in self._feature_toggles:
+                active_feature_toggles[preset] = initial_state
+
+        self._active_feature_presets = active_feature_presets
+        self._active_feature_toggles = active_feature_toggles
+
+        # Set up available preset modes
+        self._attr_preset_modes = [PRESET_NONE]
+        if self._away_temp is not None:
+            self._attr_preset_modes.append(PRESET_AWAY)
+        
+        # Add feature presets (mutually exclusive modes)
+        preset_features = [p for p in enabled_presets if p in self._feature_presets and p != "sleep" and p != "econo"]
+        if preset_features:
+            # Ensure proper capitalization for UI display
+            self._attr_preset_modes.extend([p.capitalize() for p in preset_features])
+            
+        # Always add ECO preset
+        if PRESET_ECO not in self._attr_preset_modes:
+            self._attr_preset_modes.append(PRESET_ECO)
+
+    def _update_support_flags(self):
+        """Set the supported features from the configured presets and swing modes."""
         self._support_flags = SUPPORT_FLAGS
         if self._away_temp is not None or self._active_feature_presets:
             self._support_flags = self._support_flags | ClimateEntityFeature.PRESET_MODE
@@ -879,6 +997,41 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         if self._attr_swing_mode is not None:
             self._support_flags = self._support_flags | ClimateEntityFeature.SWING_MODE
 
+    @callback
+    def async_apply_options(self, config):
+        """Apply options that need no new subscriptions to the running entity.
+
+        Topics, sensors and identity are only read on setup, so changing them
+        still reloads the config entry (see LIVE_OPTIONS).
+        """
+        self._min_temp = config[CONF_MIN_TEMP]
+        self._max_temp = config[CONF_MAX_TEMP]
+        self._def_target_temp = config[CONF_TARGET_TEMP]
+        self._away_temp = config.get(CONF_AWAY_TEMP)
+        self._temp_precision = config[CONF_PRECISION]
+        self._attr_target_temperature_step = config[CONF_TEMP_STEP]
+        self._mqtt_delay = config[CONF_MQTT_DELAY]
+        self._keep_mode = config[CONF_KEEP_MODE]
+        self._ignore_off_temp = config[CONF_IGNORE_OFF_TEMP]
+        self._toggle_list = config[CONF_TOGGLE_LIST]
+
+        self._modes_list = config[CONF_MODES_LIST]
+        self._attr_hvac_modes = config[CONF_MODES_LIST]
+        self._set_fan_modes(config.get(CONF_FAN_LIST))
+        self._set_swing_modes(config.get(CONF_SWING_LIST))
+        self._set_preset_modes(
+            config.get("enabled_presets", []), config.get("default_presets", [])
+        )
+        self._update_support_flags()
+
+        if self._attr_target_temperature is not None:
+            self._attr_target_temperature = min(
+                max(self._attr_target_temperature, self.min_temp), self.max_temp
+            )
+
+        _LOGGER.debug("Applied options to %s without reload", self.entity_id)
+        self.async_write_ha_state()
+
     def fan_prettify(self, mode):
         """Convert internal fan mode values to display values with proper styling."""
         if not self._quirk_fan_prettify:
@@ -930,13 +1083,16 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
 
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
+        added_started = time.monotonic()
+        self._blaster = async_get_blaster(self.hass, self.topic)
+
         # Replacing `async_track_state_change` with `async_track_state_change_event`
         # See, https://developers.home-assistant.io/blog/2024/04/13/deprecate_async_track_state_change/
         if hasattr(ha_event, "async_track_state_change_event"):
             self._use_track_state_change_event = True
 
-        # Make sure MQTT integration is enabled and the client is available
-        await mqtt.async_wait_for_mqtt_client(self.hass)
+        # MQTT subscriptions are batched by the hub once the client is available,
+        # so the entity can restore its state without waiting for the broker
         await super().async_added_to_hass()
 
         _LOGGER.debug(
@@ -964,12 +1120,13 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
             if power_state := self.hass.states.get(self._power_sensor):
                 await self._async_power_sensor_changed(None, power_state)
 
-         # Add MQTT subscriptions
-        self._unsubscribes = await self._subscribe_topics()
-
-        # Restore previous state
-        old_state = await self.async_get_last_state()
-        if old_state is not None:
+        # Restore previous state, preferring the lossless state store snapshot
+        # over the attributes of the last recorded state
+        store = self.hass.data.get(DATA_STATE_STORE)
+        snapshot = store.async_get(self._attr_unique_id) if store else None
+        if snapshot is not None:
+            self._async_restore_snapshot(snapshot)
+        elif (old_state := await self.async_get_last_state()) is not None:
             # If we have no initial temperature, restore
             if old_state.attributes.get(ATTR_TEMPERATURE) is not None:
                 self._attr_target_temperature = float(
@@ -1020,6 +1177,8 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         for key in self._toggle_list:
             setattr(self, "_" + key.lower(), "off")
 
+        self._state_restored = True
+
         if self._temp_sensor:
             self.regist_track_state_change_event(self._temp_sensor)
 
@@ -1045,320 +1204,418 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         if self._power_sensor:
             self.regist_track_state_change_event(self._power_sensor)
 
-    async def _subscribe_topics(self):
-        """(Re)Subscribe to topics."""
-        unsubscribe = []
-
-        @callback
-        async def available_message_received(message: mqtt.ReceiveMessage) -> None:
-            try:
-                msg = message.payload
-                _LOGGER.debug(msg)
-                if msg == "Online" or msg == "Offline":
-                    self._attr_available = True if msg == "Online" else False
-                    self.async_schedule_update_ha_state()
-            except Exception as e:
-                _LOGGER.error("Error processing availability message: %s", str(e))
-
-        @callback
-        async def state_message_received(message: mqtt.ReceiveMessage) -> None:
-            """Handle new MQTT state messages."""
-            try:
-                json_payload = json.loads(message.payload)
-                _LOGGER.debug(json_payload)
-
-                # If listening to `tele`, result looks like: {"IrReceived":{"Protocol":"XXX", ... ,"IRHVAC":{ ... }}}
-                # we want to extract the data.
-                if "IrReceived" in json_payload:
-                    json_payload = json_payload["IrReceived"]
-
-                # By now the payload must include an `IRHVAC` field.
-                if "IRHVAC" not in json_payload:
-                    return
+        # Add MQTT subscriptions
+        self._unsubscribes = self._async_subscribe_topics()
+        _LOGGER.debug(
+            "%s restored and registered in %.3fs",
+            self.entity_id,
+            time.monotonic() - added_started,
+        )
 
-                payload = json_payload["IRHVAC"]
+    @callback
+    def _async_restore_snapshot(self, snapshot):
+        """Restore the AC state from a state store snapshot."""
+        for key, attr in STATE_SNAPSHOT_FIELDS.items():
+            if key not in snapshot:
+                continue
+            value = snapshot[key]
+            if isinstance(value, dict):
+                # Only restore features that are still enabled
+                features = getattr(self, attr)
+                for feature in features:
+                    if feature in value:
+                        features[feature] = value[feature]
+                continue
+            if key in ("mode", "last_on_mode"):
+                # Modes are stored as plain strings
+                try:
+                    value = HVACMode(value)
+                except ValueError:
+                    pass
+            setattr(self, attr, value)
 
-                # Log vendor information for debugging
-                _LOGGER.debug("Processing message for vendor: %s", payload["Vendor"])
-                
-                # All values in the payload are Optional
-                prev_power = self.power_mode
-                if "Power" in payload:
-                    self.power_mode = payload["Power"].lower()
-                if "Mode" in payload:
-                    self._attr_hvac_mode = payload["Mode"].lower()
-                    # Some vendors send/receive mode as fan instead of fan_only
-                    if self._attr_hvac_mode == HVACAction.FAN:
-                        self._attr_hvac_mode = HVACMode.FAN_ONLY
-                if "Temp" in payload:
-                    if payload["Temp"] > 0:
-                        if self.power_mode == STATE_OFF and self._ignore_off_temp:
-                            self._attr_target_temperature = (
-                                self._attr_target_temperature
-                            )
-                        else:
-                            self._attr_target_temperature = payload["Temp"]
-                if "Celsius" in payload:
-                    self._celsius = payload["Celsius"].lower()
-                # Update individual feature states and track in _active_feature_presets
-                # Track which preset was turned on (if any)
-                newly_activated_preset = None
-                
-                # Special handling for Samsung AC Turbo mode detection from Data field
-                if payload["Vendor"].upper() == "SAMSUNG" and "Data" in payload:
-                    data_value = payload["Data"]
-                    _LOGGER.debug("Samsung AC Data value: %s", data_value)
-                    
-                    # Check for Turbo mode pattern in Data field
-                    # Turbo ON pattern: position 6 is "B" and position 7 is "7"
-                    # Example: "0x0292B7000000F001B2FE779011F0"
-                    #                  ^  ^
-                    # Turbo OFF pattern: position 6 is "D" and position 7 is "1"
-                    # Example: "0x0292D1000000F001D2FE719011F0"
-                    #                  ^  ^
-                    if len(data_value) >= 25:  # Ensure data is long enough
-                        # Extract the key characters for debugging
-                        char_pos_6 = data_value[6]
-                        char_pos_7 = data_value[7]
-                        _LOGGER.debug("Samsung AC Data pattern - Position 6: %s, Position 7: %s",
-                                     char_pos_6, char_pos_7)
-                        
-                        turbo_on = char_pos_6 == "B" and char_pos_7 == "7"
-                        new_state = "on" if turbo_on else "off"
-                        
-                        _LOGGER.debug("Samsung AC Turbo detection - Current state: %s, Detected state: %s",
-                                     self._turbo, new_state)
-                        
-                        # Only update if the state has changed
-                        if self._turbo != new_state:
-                            _LOGGER.info("Samsung AC Turbo mode changed from %s to %s based on Data pattern",
-                                       self._turbo, new_state)
-                            self._turbo = new_state
-                            
-                            if hasattr(self, "_active_feature_presets") and "turbo" in self._active_feature_presets:
-                                # Check if this preset was just turned on
-                                if new_state == "on" and self._active_feature_presets["turbo"] != "on":
-                                    newly_activated_preset = "turbo"
-                                self._active_feature_presets["turbo"] = new_state
-                                _LOGGER.debug("Updated turbo preset state from Samsung Data pattern: %s", new_state)
+    @callback
+    def _async_state_snapshot(self):
+        """Return a compact snapshot of the full AC state."""
+        snapshot = {}
+        for key, attr in STATE_SNAPSHOT_FIELDS.items():
+            value = getattr(self, attr)
+            snapshot[key] = dict(value) if isinstance(value, dict) else value
+        return snapshot
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine and persist a snapshot."""
+        super().async_write_ha_state()
+        self._metrics.async_increment("state_writes", self._attr_unique_id)
+        if self._state_restored and (
+            store := self.hass.data.get(DATA_STATE_STORE)
+        ) is not None:
+            store.async_set(self._attr_unique_id, self._async_state_snapshot())
+
+    @callback
+    def _async_subscribe_topics(self):
+        """(Re)Subscribe to topics through the shared MQTT hub."""
+        hub = async_get_hub(self.hass)
+        unsubscribe = [
+            hub.async_register(topic, self._state_message_received, self._fleet_mode)
+            for topic in self.state_topics
+        ]
+        unsubscribe.append(
+            self._blaster.async_attach(self.availability_topic, self._fleet_mode)
+        )
+        unsubscribe.append(
+            hub.async_track_availability(
+                self.availability_topic,
+                self._async_availability_changed,
+                self._fleet_mode,
+            )
+        )
+        return unsubscribe
+
+    @callback
+    def _async_availability_changed(self, available: bool) -> None:
+        """Handle an Online/Offline transition of the blaster."""
+        self._attr_available = available
+        self.async_schedule_update_ha_state()
+
+    async def _state_message_received(self, message: mqtt.ReceiveMessage) -> None:
+        """Handle new MQTT state messages."""
+        started = time.perf_counter()
+        handler_started = time.monotonic()
+        if (profiler := self.hass.data.get(DATA_PROFILER)) is not None:
+            profile_started = profiler.start()
+        try:
+            json_payload = json.loads(message.payload)
+            _LOGGER.debug(json_payload)
+
+            # If listening to `tele`, result looks like: {"IrReceived":{"Protocol":"XXX", ... ,"IRHVAC":{ ... }}}
+            # we want to extract the data.
+            if "IrReceived" in json_payload:
+                json_payload = json_payload["IrReceived"]
+
+            # By now the payload must include an `IRHVAC` field.
+            if "IRHVAC" not in json_payload:
+                return
+
+            payload = json_payload["IRHVAC"]
+            # {"IRHVAC":"Done"} and errors on stat/.../RESULT are command acks
+            if not isinstance(payload, dict):
+                return
+            self._metrics.async_increment("frames_received", self._attr_unique_id)
+
+            # The same IR event arrives once per state topic; apply it once
+            now = time.monotonic()
+            if (
+                payload == self._last_frame
+                and now - self._last_frame_at < STATE_DEDUP_WINDOW
+            ):
+                _LOGGER.debug("Ignoring duplicate IRHVAC frame on %s", message.topic)
+                self._metrics.async_increment("writes_suppressed", self._attr_unique_id)
+                return
+            self._last_frame = payload
+            self._last_frame_at = now
+
+            # The first frame after a published command is its echo
+            if (
+                (trace := self._trace) is not None
+                and now - trace.started < TRACE_ECHO_WINDOW
+                and trace.reached("published")
+                and not trace.reached("state")
+            ):
+                trace.mark("state")
+                _LOGGER.debug("[%s] State echo on %s", trace.trace_id, message.topic)
+
+            # Log vendor information for debugging
+            _LOGGER.debug("Processing message for vendor: %s", payload["Vendor"])
+            if payload["Vendor"] != self._vendor:
+                # Vendor-specific features are not applied
+                self._metrics.async_increment("frames_wrong_vendor", self._attr_unique_id)
+            
+            # All values in the payload are Optional
+            prev_power = self.power_mode
+            if "Power" in payload:
+                self.power_mode = payload["Power"].lower()
+            if "Mode" in payload:
+                self._attr_hvac_mode = payload["Mode"].lower()
+                # Some vendors send/receive mode as fan instead of fan_only
+                if self._attr_hvac_mode == HVACAction.FAN:
+                    self._attr_hvac_mode = HVACMode.FAN_ONLY
+            if "Temp" in payload:
+                if payload["Temp"] > 0:
+                    if self.power_mode == STATE_OFF and self._ignore_off_temp:
+                        self._attr_target_temperature = (
+                            self._attr_target_temperature
+                        )
                     else:
-                        _LOGGER.warning("Samsung AC Data value too short for Turbo detection: %s", data_value)
-                
-                # Process vendor-specific features
-                if payload["Vendor"] == self._vendor:
-                    if "Quiet" in payload:
-                        new_state = payload["Quiet"].lower()
-                        self._quiet = new_state
-                        if hasattr(self, "_active_feature_presets") and "quiet" in self._active_feature_presets:
-                            # Check if this preset was just turned on
-                            if new_state == "on" and self._active_feature_presets["quiet"] != "on":
-                                newly_activated_preset = "quiet"
-                            self._active_feature_presets["quiet"] = new_state
-                            _LOGGER.debug("Updated quiet preset state from MQTT: %s", new_state)
+                        self._attr_target_temperature = payload["Temp"]
+            if "Celsius" in payload:
+                self._celsius = payload["Celsius"].lower()
+            # Update individual feature states and track in _active_feature_presets
+            # Track which preset was turned on (if any)
+            newly_activated_preset = None
+            
+            # Special handling for Samsung AC Turbo mode detection from Data field
+            if payload["Vendor"].upper() == "SAMSUNG" and "Data" in payload:
+                data_value = payload["Data"]
+                _LOGGER.debug("Samsung AC Data value: %s", data_value)
                 
-                # For all ACs, check the Turbo field directly
-                if "Turbo" in payload:
-                    new_state = payload["Turbo"].lower()
+                # Check for Turbo mode pattern in Data field
+                # Turbo ON pattern: position 6 is "B" and position 7 is "7"
+                # Example: "0x0292B7000000F001B2FE779011F0"
+                #                  ^  ^
+                # Turbo OFF pattern: position 6 is "D" and position 7 is "1"
+                # Example: "0x0292D1000000F001D2FE719011F0"
+                #                  ^  ^
+                if len(data_value) >= 25:  # Ensure data is long enough
+                    # Extract the key characters for debugging
+                    char_pos_6 = data_value[6]
+                    char_pos_7 = data_value[7]
+                    _LOGGER.debug("Samsung AC Data pattern - Position 6: %s, Position 7: %s",
+                                 char_pos_6, char_pos_7)
                     
-                    # Always set the turbo state regardless of vendor
-                    self._turbo = new_state
-                    _LOGGER.debug("Updated turbo state from MQTT: %s", new_state)
+                    turbo_on = char_pos_6 == "B" and char_pos_7 == "7"
+                    new_state = "on" if turbo_on else "off"
                     
-                    # Handle feature presets if available
-                    if hasattr(self, "_active_feature_presets") and "turbo" in self._active_feature_presets:
-                        # Check if this preset was just turned on
-                        if new_state == "on" and self._active_feature_presets["turbo"] != "on":
-                            newly_activated_preset = "turbo"
-                        self._active_feature_presets["turbo"] = new_state
-                        _LOGGER.debug("Updated turbo preset state from MQTT: %s", new_state)
+                    _LOGGER.debug("Samsung AC Turbo detection - Current state: %s, Detected state: %s",
+                                 self._turbo, new_state)
                     
-                    if "Econo" in payload:
-                        new_state = payload["Econo"].lower()
-                        self._econo = new_state
-                        if hasattr(self, "_active_feature_presets") and "econo" in self._active_feature_presets:
+                    # Only update if the state has changed
+                    if self._turbo != new_state:
+                        _LOGGER.info("Samsung AC Turbo mode changed from %s to %s based on Data pattern",
+                                   self._turbo, new_state)
+                        self._turbo = new_state
+                        
+                        if hasattr(self, "_active_feature_presets") and "turbo" in self._active_feature_presets:
                             # Check if this preset was just turned on
-                            if new_state == "on" and self._active_feature_presets["econo"] != "on":
-                                newly_activated_preset = "econo"
-                            self._active_feature_presets["econo"] = new_state
-                            _LOGGER.debug("Updated econo preset state from MQTT: %s", new_state)
-                    
-                    if "Light" in payload:
-                        new_state = payload["Light"].lower()
-                        self._light = new_state
-                        if hasattr(self, "_active_feature_toggles") and "light" in self._active_feature_toggles:
-                            self._active_feature_toggles["light"] = new_state
-                            _LOGGER.debug("Updated light toggle state from MQTT: %s", new_state)
-                    
-                    if "Filter" in payload:
-                        new_state = payload["Filter"].lower()
-                        self._filter = new_state
-                        if hasattr(self, "_active_feature_toggles") and "filter" in self._active_feature_toggles:
-                            self._active_feature_toggles["filter"] = new_state
-                            _LOGGER.debug("Updated filter toggle state from MQTT: %s", new_state)
-                    
-                    if "Clean" in payload:
-                        new_state = payload["Clean"].lower()
-                        self._clean = new_state
-                        if hasattr(self, "_active_feature_toggles") and "clean" in self._active_feature_toggles:
-                            self._active_feature_toggles["clean"] = new_state
-                            _LOGGER.debug("Updated clean toggle state from MQTT: %s", new_state)
-                    
-                    if "Beep" in payload:
-                        new_state = payload["Beep"].lower()
-                        self._beep = new_state
-                        if hasattr(self, "_active_feature_toggles") and "beep" in self._active_feature_toggles:
-                            self._active_feature_toggles["beep"] = new_state
-                            _LOGGER.debug("Updated beep toggle state from MQTT: %s", new_state)
-                    
-                    if "Sleep" in payload:
-                        self._sleep = payload["Sleep"]
-                        if hasattr(self, "_active_feature_presets") and "sleep" in self._active_feature_presets:
-                            # Sleep can be a number or "off", so handle it specially
-                            sleep_state = "off" if payload["Sleep"] == "off" or payload["Sleep"] == "-1" else "on"
-                            # Check if sleep was just turned on
-                            if sleep_state == "on" and self._active_feature_presets["sleep"] != "on":
-                                newly_activated_preset = "sleep"
-                            self._active_feature_presets["sleep"] = sleep_state
-                            _LOGGER.debug("Updated sleep preset state from MQTT: %s (raw: %s)",
-                                         sleep_state, payload["Sleep"])
+                            if new_state == "on" and self._active_feature_presets["turbo"] != "on":
+                                newly_activated_preset = "turbo"
+                            self._active_feature_presets["turbo"] = new_state
+                            _LOGGER.debug("Updated turbo preset state from Samsung Data pattern: %s", new_state)
+                else:
+                    _LOGGER.warning("Samsung AC Data value too short for Turbo detection: %s", data_value)
+            
+            # Process vendor-specific features
+            if payload["Vendor"] == self._vendor:
+                if "Quiet" in payload:
+                    new_state = payload["Quiet"].lower()
+                    self._quiet = new_state
+                    if hasattr(self, "_active_feature_presets") and "quiet" in self._active_feature_presets:
+                        # Check if this preset was just turned on
+                        if new_state == "on" and self._active_feature_presets["quiet"] != "on":
+                            newly_activated_preset = "quiet"
+                        self._active_feature_presets["quiet"] = new_state
+                        _LOGGER.debug("Updated quiet preset state from MQTT: %s", new_state)
+            
+            # For all ACs, check the Turbo field directly
+            if "Turbo" in payload:
+                new_state = payload["Turbo"].lower()
+                
+                # Always set the turbo state regardless of vendor
+                self._turbo = new_state
+                _LOGGER.debug("Updated turbo state from MQTT: %s", new_state)
+                
+                # Handle feature presets if available
+                if hasattr(self, "_active_feature_presets") and "turbo" in self._active_feature_presets:
+                    # Check if this preset was just turned on
+                    if new_state == "on" and self._active_feature_presets["turbo"] != "on":
+                        newly_activated_preset = "turbo"
+                    self._active_feature_presets["turbo"] = new_state
+                    _LOGGER.debug("Updated turbo preset state from MQTT: %s", new_state)
+                
+                if "Econo" in payload:
+                    new_state = payload["Econo"].lower()
+                    self._econo = new_state
+                    if hasattr(self, "_active_feature_presets") and "econo" in self._active_feature_presets:
+                        # Check if this preset was just turned on
+                        if new_state == "on" and self._active_feature_presets["econo"] != "on":
+                            newly_activated_preset = "econo"
+                        self._active_feature_presets["econo"] = new_state
+                        _LOGGER.debug("Updated econo preset state from MQTT: %s", new_state)
+                
+                if "Light" in payload:
+                    new_state = payload["Light"].lower()
+                    self._light = new_state
+                    if hasattr(self, "_active_feature_toggles") and "light" in self._active_feature_toggles:
+                        self._active_feature_toggles["light"] = new_state
+                        _LOGGER.debug("Updated light toggle state from MQTT: %s", new_state)
+                
+                if "Filter" in payload:
+                    new_state = payload["Filter"].lower()
+                    self._filter = new_state
+                    if hasattr(self, "_active_feature_toggles") and "filter" in self._active_feature_toggles:
+                        self._active_feature_toggles["filter"] = new_state
+                        _LOGGER.debug("Updated filter toggle state from MQTT: %s", new_state)
+                
+                if "Clean" in payload:
+                    new_state = payload["Clean"].lower()
+                    self._clean = new_state
+                    if hasattr(self, "_active_feature_toggles") and "clean" in self._active_feature_toggles:
+                        self._active_feature_toggles["clean"] = new_state
+                        _LOGGER.debug("Updated clean toggle state from MQTT: %s", new_state)
+                
+                if "Beep" in payload:
+                    new_state = payload["Beep"].lower()
+                    self._beep = new_state
+                    if hasattr(self, "_active_feature_toggles") and "beep" in self._active_feature_toggles:
+                        self._active_feature_toggles["beep"] = new_state
+                        _LOGGER.debug("Updated beep toggle state from MQTT: %s", new_state)
+                
+                if "Sleep" in payload:
+                    self._sleep = payload["Sleep"]
+                    if hasattr(self, "_active_feature_presets") and "sleep" in self._active_feature_presets:
+                        # Sleep can be a number or "off", so handle it specially
+                        sleep_state = "off" if payload["Sleep"] == "off" or payload["Sleep"] == "-1" else "on"
+                        # Check if sleep was just turned on
+                        if sleep_state == "on" and self._active_feature_presets["sleep"] != "on":
+                            newly_activated_preset = "sleep"
+                        self._active_feature_presets["sleep"] = sleep_state
+                        _LOGGER.debug("Updated sleep preset state from MQTT: %s (raw: %s)",
+                                     sleep_state, payload["Sleep"])
+                
+                # Ensure mutual exclusivity of presets when one is turned on via remote
+                if hasattr(self, "_active_feature_presets"):
+                    # If a preset was just activated, turn off all other presets
+                    if newly_activated_preset:
+                        _LOGGER.debug("Preset '%s' was activated via MQTT - ensuring mutual exclusivity",
+                                     newly_activated_preset)
+                        for preset in self._active_feature_presets:
+                            if preset != newly_activated_preset:
+                                self._active_feature_presets[preset] = "off"
+                                # Also update the corresponding instance variable
+                                setattr(self, f"_{preset}", "off")
                     
-                    # Ensure mutual exclusivity of presets when one is turned on via remote
-                    if hasattr(self, "_active_feature_presets"):
-                        # If a preset was just activated, turn off all other presets
-                        if newly_activated_preset:
-                            _LOGGER.debug("Preset '%s' was activated via MQTT - ensuring mutual exclusivity",
-                                         newly_activated_preset)
-                            for preset in self._active_feature_presets:
-                                if preset != newly_activated_preset:
-                                    self._active_feature_presets[preset] = "off"
-                                    # Also update the corresponding instance variable
-                                    setattr(self, f"_{preset}", "off")
-                        
-                        # Log the current active preset for debugging
-                        active_presets = [p for p, state in self._active_feature_presets.items()
-                                         if state.lower() == "on"]
-                        _LOGGER.debug("Active presets after MQTT update: %s", active_presets)
-                    if "SwingV" in payload:
-                        self._swingv = payload["SwingV"].lower()
-                        if self._swingv != "auto":
-                            self._fix_swingv = self._swingv
-                    if "SwingH" in payload:
-                        self._swingh = payload["SwingH"].lower()
-                        if self._swingh != "auto":
-                            self._fix_swingh = self._swingh
-                    if (
-                        "SwingV" in payload
-                        and payload["SwingV"].lower() == STATE_AUTO
-                        and "SwingH" in payload
-                        and payload["SwingH"].lower() == STATE_AUTO
-                    ):
-                        if SWING_BOTH in (self._attr_swing_modes or []):
-                            self._attr_swing_mode = SWING_BOTH
-                        elif SWING_VERTICAL in (self._attr_swing_modes or []):
-                            self._attr_swing_mode = SWING_VERTICAL
-                        elif SWING_HORIZONTAL in (self._attr_swing_modes or []):
-                            self._attr_swing_mode = SWING_HORIZONTAL
-                        else:
-                            self._attr_swing_mode = SWING_OFF
-                    elif (
-                        "SwingV" in payload
-                        and payload["SwingV"].lower() == STATE_AUTO
-                        and SWING_VERTICAL in (self._attr_swing_modes or [])
-                    ):
+                    # Log the current active preset for debugging
+                    active_presets = [p for p, state in self._active_feature_presets.items()
+                                     if state.lower() == "on"]
+                    _LOGGER.debug("Active presets after MQTT update: %s", active_presets)
+                if "SwingV" in payload:
+                    self._swingv = payload["SwingV"].lower()
+                    if self._swingv != "auto":
+                        self._fix_swingv = self._swingv
+                if "SwingH" in payload:
+                    self._swingh = payload["SwingH"].lower()
+                    if self._swingh != "auto":
+                        self._fix_swingh = self._swingh
+                if (
+                    "SwingV" in payload
+                    and payload["SwingV"].lower() == STATE_AUTO
+                    and "SwingH" in payload
+                    and payload["SwingH"].lower() == STATE_AUTO
+                ):
+                    if SWING_BOTH in (self._attr_swing_modes or []):
+                        self._attr_swing_mode = SWING_BOTH
+                    elif SWING_VERTICAL in (self._attr_swing_modes or []):
                         self._attr_swing_mode = SWING_VERTICAL
-                    elif (
-                        "SwingH" in payload
-                        and payload["SwingH"].lower() == STATE_AUTO
-                        and SWING_HORIZONTAL in (self._attr_swing_modes or [])
-                    ):
+                    elif SWING_HORIZONTAL in (self._attr_swing_modes or []):
                         self._attr_swing_mode = SWING_HORIZONTAL
                     else:
                         self._attr_swing_mode = SWING_OFF
+                elif (
+                    "SwingV" in payload
+                    and payload["SwingV"].lower() == STATE_AUTO
+                    and SWING_VERTICAL in (self._attr_swing_modes or [])
+                ):
+                    self._attr_swing_mode = SWING_VERTICAL
+                elif (
+                    "SwingH" in payload
+                    and payload["SwingH"].lower() == STATE_AUTO
+                    and SWING_HORIZONTAL in (self._attr_swing_modes or [])
+                ):
+                    self._attr_swing_mode = SWING_HORIZONTAL
+                else:
+                    self._attr_swing_mode = SWING_OFF
 
-                    if "FanSpeed" in payload:
-                        fan_mode = payload["FanSpeed"].lower()
-                        _LOGGER.debug("Received fan mode from MQTT: %s", fan_mode)
-                        
-                        # ELECTRA_AC fan modes fix
-                        if self._quirk_fan_max_high:
-                            if fan_mode == HVAC_FAN_MAX:
-                                self._attr_fan_mode = FAN_AUTO  # Changed from FAN_HIGH to FAN_AUTO
-                            elif fan_mode == HVAC_FAN_AUTO:
-                                self._attr_fan_mode = HVAC_FAN_MAX
-                            else:
-                                self._attr_fan_mode = self.fan_prettify(fan_mode)
+                if "FanSpeed" in payload:
+                    fan_mode = payload["FanSpeed"].lower()
+                    _LOGGER.debug("Received fan mode from MQTT: %s", fan_mode)
+                    
+                    # ELECTRA_AC fan modes fix
+                    if self._quirk_fan_max_high:
+                        if fan_mode == HVAC_FAN_MAX:
+                            self._attr_fan_mode = FAN_AUTO  # Changed from FAN_HIGH to FAN_AUTO
+                        elif fan_mode == HVAC_FAN_AUTO:
+                            self._attr_fan_mode = HVAC_FAN_MAX
                         else:
                             self._attr_fan_mode = self.fan_prettify(fan_mode)
-                        
-                        _LOGGER.debug("Fan mode after prettification: %s", self._attr_fan_mode)
-
-                    if self._attr_hvac_mode is not HVACMode.OFF:
-                        self._last_on_mode = self._attr_hvac_mode
-
-                    # Set default state to off
-                    if self.power_mode == STATE_OFF:
-                        self._attr_hvac_mode = HVACMode.OFF
-                        self._enabled = False
                     else:
-                        self._enabled = True
+                        self._attr_fan_mode = self.fan_prettify(fan_mode)
+                    
+                    _LOGGER.debug("Fan mode after prettification: %s", self._attr_fan_mode)
 
-                    # Set toggles to 'off'
-                    for key in self._toggle_list:
-                        setattr(self, "_" + key.lower(), "off")
+                if self._attr_hvac_mode is not HVACMode.OFF:
+                    self._last_on_mode = self._attr_hvac_mode
 
-                    # Log the current preset mode for debugging
-                    current_preset = self.preset_mode
-                    _LOGGER.debug("Current preset mode after MQTT update: %s", current_preset)
-                    _LOGGER.debug("Active feature presets: %s", self._active_feature_presets)
-                    
-                    # Update HA UI and State
-                    self.async_schedule_update_ha_state()
-
-                    # Check power sensor state
-                    if (
-                        self._power_sensor
-                        and prev_power is not None
-                        and prev_power != self.power_mode
-                    ):
-                        await asyncio.sleep(3)
-                        state = self.hass.states.get(self._power_sensor)
-                        await self._async_power_sensor_changed(None, state)
-            except json.JSONDecodeError as e:
-                _LOGGER.error("Error decoding MQTT message: %s", str(e))
-            except KeyError as e:
-                _LOGGER.error("Missing key in MQTT message: %s", str(e))
-            except Exception as e:
-                _LOGGER.error("Error processing MQTT message: %s", str(e))
+                # Set default state to off
+                if self.power_mode == STATE_OFF:
+                    self._attr_hvac_mode = HVACMode.OFF
+                    self._enabled = False
+                else:
+                    self._enabled = True
 
-        try:
-            unsubscribe.append(
-                await mqtt.async_subscribe(
-                    self.hass, self.state_topic, state_message_received
+                # Set toggles to 'off'
+                for key in self._toggle_list:
+                    setattr(self, "_" + key.lower(), "off")
+
+                # Log the current preset mode for debugging
+                current_preset = self.preset_mode
+                _LOGGER.debug("Current preset mode after MQTT update: %s", current_preset)
+                _LOGGER.debug("Active feature presets: %s", self._active_feature_presets)
+                
+                # Update HA UI and State
+                self.async_schedule_update_ha_state()
+                self._metrics.async_observe(
+                    "ingest",
+                    self._attr_unique_id,
+                    (time.perf_counter() - started) * 1000,
                 )
-            )
-            unsubscribe.append(
-                await mqtt.async_subscribe(
-                    self.hass, self.availability_topic, available_message_received
+                # From MQTT receipt when the client stamps messages with
+                # time.monotonic() (newer cores), otherwise from the handler start
+                now = time.monotonic()
+                received = message.timestamp
+                if not isinstance(received, float) or not 0 <= now - received < 60:
+                    received = handler_started
+                frame_to_state_ms = (now - received) * 1000
+                self._metrics.async_observe(
+                    "frame_to_state", self._attr_unique_id, frame_to_state_ms
                 )
-            )
-            if self.state_topic2:
-                unsubscribe.append(
-                    await mqtt.async_subscribe(
-                        self.hass, self.state_topic2, state_message_received
-                    )
+                self._metrics.async_observe(
+                    "frame_to_state", self.topic, frame_to_state_ms
                 )
-        except mqtt.MqttNotConnectedError:
-            _LOGGER.error("MQTT is not connected, cannot subscribe to topics")
-        except Exception as e:
-            _LOGGER.error("Error subscribing to MQTT topics: %s", str(e))
 
-        return unsubscribe
+                # Check power sensor state
+                if (
+                    self._power_sensor
+                    and prev_power is not None
+                    and prev_power != self.power_mode
+                ):
+                    await asyncio.sleep(3)
+                    state = self.hass.states.get(self._power_sensor)
+                    await self._async_power_sensor_changed(None, state)
+        except json.JSONDecodeError as e:
+            _LOGGER.error("Error decoding MQTT message: %s", str(e))
+            self._metrics.async_increment("decode_errors", self._attr_unique_id)
+        except KeyError as e:
+            _LOGGER.error("Missing key in MQTT message: %s", str(e))
+            self._metrics.async_increment("decode_errors", self._attr_unique_id)
+        except Exception as e:
+            _LOGGER.error("Error processing MQTT message: %s", str(e))
+            self._metrics.async_increment("decode_errors", self._attr_unique_id)
+        finally:
+            if profiler is not None:
+                profiler.stop("ingest", profile_started)
 
     async def async_will_remove_from_hass(self):
         """Unsubscribe when removed."""
         for unsubscribe in self._unsubscribes:
             unsubscribe()
 
+    async def async_removed_from_registry(self) -> None:
+        """Forget the stored state and traces of a deleted AC."""
+        if (store := self.hass.data.get(DATA_STATE_STORE)) is not None:
+            store.async_remove(self._attr_unique_id)
+        async_get_traces(self.hass).async_remove(self.entity_id)
+
     @property
     def precision(self):
         """Return the precision of the system."""
@@ -1389,9 +1646,25 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
     def extra_state_attributes(self):
         """Return the state attributes of the device."""
         return {
-            attr: getattr(self, "_" + prop) for attr, prop in ATTRIBUTES_IRHVAC.items()
+            **{
+                attr: getattr(self, "_" + prop)
+                for attr, prop in ATTRIBUTES_IRHVAC.items()
+            },
+            ATTR_LAST_ACK: self._last_ack,
+            ATTR_ACK_LATENCY: self._ack_latency,
         }
 
+    @callback
+    def _async_command_acked(self, status: str, latency: float | None) -> None:
+        """Record how the blaster answered the last command."""
+        self._last_ack = status
+        self._ack_latency = round(latency * 1000) if latency is not None else None
+        if latency is not None:
+            self._metrics.async_set(
+                "last_ack_latency", self._attr_unique_id, self._ack_latency
+            )
+        self.async_write_ha_state()
+
     @property
     def last_on_mode(self):
         """Return the last non-idle mode ie. heat, cool."""
@@ -1778,7 +2051,8 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
     async def async_send_cmd(self):
         await self.send_ir()
 
-    @cached_property
+    # Options are applied live, so use @property instead of @cached_property.
+    @property
     def min_temp(self):
         """Return the minimum temperature."""
         if self._min_temp:
@@ -1787,7 +2061,8 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
         # get default temp from super class
         return super().min_temp
 
-    @cached_property
+    # Options are applied live, so use @property instead of @cached_property.
+    @property
     def max_temp(self):
         """Return the maximum temperature."""
         if self._max_temp:
@@ -1928,91 +2203,109 @@ class TasmotaIrhvac(RestoreEntity, ClimateEntity):
             self._enabled = False
             self.power_mode = STATE_OFF
 
-    async def send_ir(self):
-        """Send the payload to tasmota mqtt topic."""
-        try:
-            # Log the current fan mode before unprettifying
-            _LOGGER.debug("Current fan mode before unprettifying: %s", self._attr_fan_mode)
-            
-            # Unprettify the fan mode for sending to the device
-            fan_speed = self.fan_unprettify(self._attr_fan_mode)
-            _LOGGER.debug("Fan mode after unprettifying: %s", fan_speed)
-            
-            # tweak for some ELECTRA_AC devices
-            if self._quirk_fan_max_high:
-                if fan_speed == FAN_AUTO:  # Changed from FAN_HIGH to FAN_AUTO
-                    fan_speed = HVAC_FAN_MAX
-                    _LOGGER.debug("Applied ELECTRA_AC quirk: FAN_AUTO -> HVAC_FAN_MAX")
-                elif fan_speed == HVAC_FAN_MAX:
-                    fan_speed = HVAC_FAN_AUTO
-                    _LOGGER.debug("Applied ELECTRA_AC quirk: HVAC_FAN_MAX -> HVAC_FAN_AUTO")
-
-            # Set the swing mode - default off
-            self._swingv = STATE_OFF if self._fix_swingv is None else self._fix_swingv
-            self._swingh = STATE_OFF if self._fix_swingh is None else self._fix_swingh
-
-            if SWING_BOTH in (self._attr_swing_modes or []) or SWING_VERTICAL in (
-                self._attr_swing_modes or []
+    def _command_fan_speed(self):
+        """Return the fan speed to send, in the device's terms."""
+        # Log the current fan mode before unprettifying
+        _LOGGER.debug("Current fan mode before unprettifying: %s", self._attr_fan_mode)
+
+        # Unprettify the fan mode for sending to the device
+        fan_speed = self.fan_unprettify(self._attr_fan_mode)
+        _LOGGER.debug("Fan mode after unprettifying: %s", fan_speed)
+
+        # tweak for some ELECTRA_AC devices
+        if self._quirk_fan_max_high:
+            if fan_speed == FAN_AUTO:  # Changed from FAN_HIGH to FAN_AUTO
+                fan_speed = HVAC_FAN_MAX
+                _LOGGER.debug("Applied ELECTRA_AC quirk: FAN_AUTO -> HVAC_FAN_MAX")
+            elif fan_speed == HVAC_FAN_MAX:
+                fan_speed = HVAC_FAN_AUTO
+                _LOGGER.debug("Applied ELECTRA_AC quirk: HVAC_FAN_MAX -> HVAC_FAN_AUTO")
+        return fan_speed
+
+    def _resolve_swing(self):
+        """Set the swing positions to send from the swing mode."""
+        # Set the swing mode - default off
+        self._swingv = STATE_OFF if self._fix_swingv is None else self._fix_swingv
+        self._swingh = STATE_OFF if self._fix_swingh is None else self._fix_swingh
+
+        if SWING_BOTH in (self._attr_swing_modes or []) or SWING_VERTICAL in (
+            self._attr_swing_modes or []
+        ):
+            if (
+                self._attr_swing_mode == SWING_BOTH
+                or self._attr_swing_mode == SWING_VERTICAL
             ):
-                if (
-                    self._attr_swing_mode == SWING_BOTH
-                    or self._attr_swing_mode == SWING_VERTICAL
-                ):
-                    self._swingv = STATE_AUTO
+                self._swingv = STATE_AUTO
 
-            if SWING_BOTH in (self._attr_swing_modes or []) or SWING_HORIZONTAL in (
-                self._attr_swing_modes or []
+        if SWING_BOTH in (self._attr_swing_modes or []) or SWING_HORIZONTAL in (
+            self._attr_swing_modes or []
+        ):
+            if (
+                self._attr_swing_mode == SWING_BOTH
+                or self._attr_swing_mode == SWING_HORIZONTAL
             ):
-                if (
-                    self._attr_swing_mode == SWING_BOTH
-                    or self._attr_swing_mode == SWING_HORIZONTAL
-                ):
-                    self._swingh = STATE_AUTO
+                self._swingh = STATE_AUTO
 
-            _dt = dt_util.now()
-            _min = _dt.hour * 60 + _dt.minute
+    def _command_payload(self, fan_speed):
+        """Return the IRHVAC command for the current state."""
+        _dt = dt_util.now()
+        _min = _dt.hour * 60 + _dt.minute
+
+        return {
+            "StateMode": self._state_mode,
+            "Vendor": self._vendor,
+            "Model": self._model,
+            "Power": self.power_mode,
+            "Mode": self._last_on_mode if self._keep_mode else self._attr_hvac_mode,
+            "Celsius": self._celsius,
+            "Temp": self._attr_target_temperature,
+            "FanSpeed": fan_speed,
+            "SwingV": self._swingv,
+            "SwingH": self._swingh,
+            "Quiet": self._quiet,
+            "Turbo": self._turbo,
+            "Econo": self._econo,
+            "Light": self._light,
+            "Filter": self._filter,
+            "Clean": self._clean,
+            "Beep": self._beep,
+            "Sleep": self._sleep,
+            "Clock": int(_min),
+            "Weekday": int(_dt.weekday()),
+        }
+
+    async def send_ir(self):
+        """Send the payload to tasmota mqtt topic."""
+        self._trace = async_get_traces(self.hass).async_start(
+            self.entity_id, self._context, self._context_set
+        )
+        self._trace.mark("send_ir")
+        if (profiler := self.hass.data.get(DATA_PROFILER)) is not None:
+            profile_started = profiler.start()
+        try:
+            fan_speed = self._command_fan_speed()
+            self._resolve_swing()
 
             # Populate the payload
-            payload_data = {
-                "StateMode": self._state_mode,
-                "Vendor": self._vendor,
-                "Model": self._model,
-                "Power": self.power_mode,
-                "Mode": self._last_on_mode if self._keep_mode else self._attr_hvac_mode,
-                "Celsius": self._celsius,
-                "Temp": self._attr_target_temperature,
-                "FanSpeed": fan_speed,
-                "SwingV": self._swingv,
-                "SwingH": self._swingh,
-                "Quiet": self._quiet,
-                "Turbo": self._turbo,
-                "Econo": self._econo,
-                "Light": self._light,
-                "Filter": self._filter,
-                "Clean": self._clean,
-                "Beep": self._beep,
-                "Sleep": self._sleep,
-                "Clock": int(_min),
-                "Weekday": int(_dt.weekday()),
-            }
+            payload_data = self._command_payload(fan_speed)
             self._state_mode = DEFAULT_STATE_MODE
             for key in self._toggle_list:
                 setattr(self, "_" + key.lower(), "off")
-
-            payload = json.dumps(payload_data)
-
-            # Publish mqtt message
-            if float(self._mqtt_delay) != float(DEFAULT_MQTT_DELAY):
-                await asyncio.sleep(float(self._mqtt_delay))
-
-            try:
-                await mqtt.async_publish(self.hass, self.topic, payload)
-            except mqtt.MqttNotConnectedError:
-                _LOGGER.error("MQTT is not connected, cannot publish command")
-                return
-            except Exception as e:
-                _LOGGER.error("Error publishing MQTT message: %s", str(e))
-                return
+            if profiler is not None:
+                profiler.stop("payload_build", profile_started)
+
+            # Hand the frame to the blaster, which queues it by priority,
+            # spaces it after mqtt_delay and holds it while the device is offline
+            self._blaster.async_send(
+                IrFrame(
+                    self._attr_unique_id,
+                    payload_data,
+                    float(self._mqtt_delay),
+                    on_ack=self._async_command_acked,
+                    trace=self._trace,
+                )
+            )
+            _LOGGER.debug("[%s] Queued command for %s", self._trace.trace_id, self.entity_id)
 
             # Update HA UI and State
             self.async_schedule_update_ha_state()
@@ -1,21 +1,17 @@
 """Config flow for Tasmota IRHVAC integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
-import asyncio
-import async_timeout
 
 import voluptuous as vol
-import aiohttp
-from aiohttp import BasicAuth
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow 
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import selector
-from homeassistant.components import mqtt
+from homeassistant.helpers.service_info.mqtt import MqttServiceInfo
 from homeassistant.const import (
     CONF_HOST,
     CONF_NAME,
@@ -23,85 +19,61 @@ from homeassistant.const import (
     CONF_PASSWORD,
 )
 
+# The HTTP probing code (aiohttp) and the form schemas (selectors) are imported
+# lazily from tasmota_http.py and flow_schemas.py once a flow actually starts.
 from .const import (
     DOMAIN,
-    # Import all constants from const.py
-    CONF_VENDOR,
     CONF_COMMAND_TOPIC,
     CONF_STATE_TOPIC,
     CONF_AVAILABILITY_TOPIC,
-    CONF_TEMP_SENSOR,
-    CONF_HUMIDITY_SENSOR,
-    CONF_POWER_SENSOR,
-    CONF_MODEL,
-    CONF_MQTT_DELAY,
     CONF_MIN_TEMP,
     CONF_MAX_TEMP,
     CONF_TARGET_TEMP,
-    CONF_AWAY_TEMP,
-    CONF_PRECISION,
-    CONF_TEMP_STEP,
-    CONF_MODES_LIST,
-    CONF_FAN_LIST,
-    CONF_SWING_LIST,
-    CONF_QUIET,
-    CONF_TURBO,
-    CONF_ECONO,
-    CONF_LIGHT,
-    CONF_FILTER,
-    CONF_CLEAN,
-    CONF_BEEP,
-    CONF_SLEEP,
-    CONF_CELSIUS,
     CONF_KEEP_MODE,
-    CONF_SWINGV,
-    CONF_SWINGH,
     CONF_TOGGLE_LIST,
     CONF_IGNORE_OFF_TEMP,
+    CONF_REFRESH_DEVICE_INFO,
+    CONF_HOSTS,
+    CONF_SCAN_CONCURRENCY,
+    CONF_SCAN_TIMEOUT,
+    CONF_VENDOR,
+    CONF_MODEL,
+    CONF_MQTT_DELAY,
     # Default values
     DEFAULT_NAME,
-    DEFAULT_MQTT_DELAY,
     DEFAULT_MIN_TEMP,
     DEFAULT_MAX_TEMP,
     DEFAULT_TARGET_TEMP,
-    DEFAULT_PRECISION,
-    DEFAULT_CONF_MODEL,
-    DEFAULT_CONF_QUIET,
-    DEFAULT_CONF_TURBO,
-    DEFAULT_CONF_ECONO,
-    DEFAULT_CONF_LIGHT,
-    DEFAULT_CONF_FILTER,
-    DEFAULT_CONF_CLEAN,
-    DEFAULT_CONF_BEEP,
-    DEFAULT_CONF_SLEEP,
-    DEFAULT_CONF_CELSIUS,
     DEFAULT_CONF_KEEP_MODE,
     DEFAULT_IGNORE_OFF_TEMP,
-    DEFAULT_MODES_LIST,
-    DEFAULT_FAN_LIST,
-    DEFAULT_SWING_LIST,
-    TOGGLE_ALL_LIST,
-    FEATURE_PRESETS,
-    FEATURE_TOGGLES,
+    DEFAULT_IR_PROTOCOLS,
+    DEFAULT_CONF_MODEL,
+    DEFAULT_MQTT_DELAY,
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_TIMEOUT,
+    SOURCE_BULK,
     PRESET_OPTIONS_LIST,
     TOGGLE_OPTIONS_LIST,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-# Add OFF mode to the default modes list
-# This ensures the OFF button/mode is available in the UI
-# When OFF mode is selected, 'Power' is set to 'Off' in the MQTT payload
-from homeassistant.components.climate.const import HVACMode
-DEFAULT_MODES_LIST_WITH_OFF = [HVACMode.OFF] + list(DEFAULT_MODES_LIST)
-
-STEP_USER_DATA_SCHEMA = vol.Schema(
-    {
-        vol.Required(CONF_HOST): str,
-        vol.Optional(CONF_USERNAME): str,
-        vol.Optional(CONF_PASSWORD): str,
-    }
-)
+
+def entry_unique_id(host: str) -> str:
+    """Return the config entry unique_id of a blaster, as its entity's."""
+    return f"tasmota_irhvac_{host.replace('.', '_')}"
+
+
+def bulk_unique_id(data: dict[str, Any]) -> str:
+    """Return the unique_id of an entry created from complete data.
+
+    Definitions without a host (e.g. migrated from YAML) are identified by
+    their command topic, like their entities.
+    """
+    if data.get(CONF_HOST):
+        return entry_unique_id(data[CONF_HOST])
+    return f"tasmota_irhvac_{data[CONF_COMMAND_TOPIC].replace('/', '_')}"
+
 
 class TasmotaIRHVACOptionsFlow(OptionsFlow):
     """Handle Tasmota IRHVAC options."""
@@ -135,74 +107,12 @@ class TasmotaIRHVACOptionsFlow(OptionsFlow):
                 _LOGGER.error("Error updating options: %s", str(ex))
                 errors["base"] = "unknown"
 
+        from .flow_schemas import options_schema
+
         # Prepare schema with current values
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({
-                vol.Optional(
-                    CONF_MIN_TEMP,
-                    default=self.options.get(
-                        CONF_MIN_TEMP, 
-                        self.data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)
-                    ),
-                ): vol.Coerce(float),
-                vol.Optional(
-                    CONF_MAX_TEMP,
-                    default=self.options.get(
-                        CONF_MAX_TEMP, 
-                        self.data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP)
-                    ),
-                ): vol.Coerce(float),
-                vol.Optional(
-                    CONF_TARGET_TEMP,
-                    default=self.options.get(
-                        CONF_TARGET_TEMP, 
-                        self.data.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP)
-                    ),
-                ): vol.Coerce(float),
-                vol.Optional(
-                CONF_TEMP_STEP,
-                default=self.options.get(
-                    CONF_TEMP_STEP, self.data.get(CONF_TEMP_STEP, DEFAULT_PRECISION)
-                )
-                ): vol.In([0.5, 1.0]),
-                vol.Optional(
-                    CONF_MODES_LIST,
-                    default=self.options.get(
-                        CONF_MODES_LIST,
-                        self.data.get(CONF_MODES_LIST, DEFAULT_MODES_LIST_WITH_OFF)
-                    ),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=["off"] + DEFAULT_MODES_LIST,
-                        multiple=True,
-                    ),
-                ),
-                vol.Optional(
-                    CONF_FAN_LIST,
-                    default=self.options.get(
-                        CONF_FAN_LIST, 
-                        self.data.get(CONF_FAN_LIST, DEFAULT_FAN_LIST)
-                    ),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=DEFAULT_FAN_LIST,
-                        multiple=True,
-                    ),
-                ),
-                vol.Optional(
-                    CONF_SWING_LIST,
-                    default=self.options.get(
-                        CONF_SWING_LIST, 
-                        self.data.get(CONF_SWING_LIST, DEFAULT_SWING_LIST)
-                    ),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=["off", "vertical", "horizontal", "both"],
-                        multiple=True,
-                    ),
-                ),
-            }),
+            data_schema=options_schema(self.data, self.options),
             errors=errors,
         )
 
@@ -216,6 +126,11 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
         self._data = {}
         self._device_info = None
         self._mqtt_topics = None
+        self._scan_results: dict[str, dict[str, Any]] = {}
+        # Selected hosts lacking the chosen vendor, and the settings they share
+        self._scan_pending: list[str] = []
+        self._scan_settings: dict[str, Any] = {}
+        self._scan_created = 0
         _LOGGER.debug("Config flow initialized for domain: %s", DOMAIN)
 
     # Add this to enable options
@@ -229,66 +144,18 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
         """Get the options flow for this handler."""
         return TasmotaIRHVACOptionsFlow(config_entry)
 
-    async def _get_tasmota_info(self, host: str, auth: tuple | None = None) -> dict[str, Any] | None:
+    async def _get_tasmota_info(
+        self,
+        host: str,
+        auth: tuple | None = None,
+        refresh: bool = False,
+        quiet: bool = False,
+    ) -> dict[str, Any] | None:
         """Get Tasmota device information."""
         _LOGGER.debug("Starting Tasmota device step")
-        errors = {} 
-        try:
-            async with async_timeout.timeout(10):
-                async with aiohttp.ClientSession() as session:
-                    # Convert auth tuple to BasicAuth if provided
-                    auth_obj = BasicAuth(auth[0], auth[1]) if auth else None
-                    
-                    # Get device status
-                    url = f"http://{host}/cm"
-                    params = {"cmnd": "Status 0"}
-                    async with session.get(url, params=params, auth=auth_obj) as response:
-                        if response.status != 200:
-                            _LOGGER.error("Failed to get device status: %s", response.status)
-                            return None
-                        status = await response.json()
-
-                    # Get IR protocols by first triggering the error message
-                    params = {"cmnd": 'IRhvac {"Vendor":""}'}
-                    async with session.get(url, params=params, auth=auth_obj) as response:
-                        if response.status == 200:
-                            ir_response = await response.json()
-                            ir_info = {"Protocols": []}
-                            
-                            # Check if we got the error message with vendor list
-                            if isinstance(ir_response.get("IRHVAC"), str):
-                                error_msg = ir_response["IRHVAC"]
-                                if "Wrong Vendor (" in error_msg:
-                                    # Extract vendors from the error message
-                                    vendors = error_msg.split("(")[1].rstrip(")").split("|")
-                                    ir_info["Protocols"] = vendors
-                                    _LOGGER.debug("Found IR protocols: %s", vendors)
-
-                            # If no protocols found, use defaults
-                            if not ir_info["Protocols"]:
-                                ir_info["Protocols"] = [
-                                    "SAMSUNG_AC",
-                                    "LG_AC",
-                                    "MITSUBISHI_AC",
-                                    "DAIKIN_AC",
-                                    "HITACHI_AC",
-                                    "FUJITSU_AC",
-                                    "PANASONIC_AC"
-                                ]
-                                _LOGGER.debug("Using default IR protocols")
-
-                    return {
-                        "status": status,
-                        "ir": ir_info,
-                        "hostname": host,
-                    }
-
-        except (asyncio.TimeoutError, aiohttp.ClientError) as ex:
-            _LOGGER.error("Error connecting to Tasmota device: %s", str(ex))
-            return None
-        except Exception as ex:
-            _LOGGER.error("Unexpected error: %s", str(ex))
-            return None
+        from .tasmota_http import async_get_tasmota_info
+
+        return await async_get_tasmota_info(self.hass, host, auth, refresh, quiet)
 
     def _get_mqtt_topics(self, device_name: str) -> dict[str, str]:
         """Generate MQTT topics based on device name."""
@@ -304,13 +171,19 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Handle the initial step."""
+        if user_input is None:
+            return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+        return await self.async_step_manual(user_input)
+
+    async def async_step_manual(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Set up a single device by host."""
         _LOGGER.debug("Starting user step")
         errors = {}
 
         _LOGGER.debug("Starting user step with translations context")
         if user_input is not None:
             # Check if already configured
-            await self.async_set_unique_id(f"tasmota_irhvac_{user_input[CONF_HOST].replace('.', '_')}")
+            await self.async_set_unique_id(entry_unique_id(user_input[CONF_HOST]))
             self._abort_if_unique_id_configured()
 
             auth = None
@@ -318,14 +191,18 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
                 auth = (user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
 
             try:
-                device_info = await self._get_tasmota_info(user_input[CONF_HOST], auth)
+                device_info = await self._get_tasmota_info(
+                    user_input[CONF_HOST],
+                    auth,
+                    user_input.get(CONF_REFRESH_DEVICE_INFO, False),
+                )
                 
                 if device_info is None:
                     errors["base"] = "cannot_connect"
                 else:
                     self._device_info = device_info
                     # Get device name from Tasmota
-                    device_name = device_info["status"].get("Status", {}).get("FriendlyName", [DEFAULT_NAME])[0]
+                    device_name = self._device_name(device_info)
                     self._mqtt_topics = self._get_mqtt_topics(device_name)
                     
                     # Store basic info
@@ -340,19 +217,230 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.error("Unexpected error: %s", str(ex))
                 errors["base"] = "unknown"
 
+        from .flow_schemas import STEP_USER_DATA_SCHEMA
+
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
 
+    async def _async_scan_hosts(
+        self,
+        hosts: list[str],
+        auth: tuple | None,
+        concurrency: int,
+        timeout: float,
+    ) -> dict[str, dict[str, Any]]:
+        """Probe many hosts and return the ones running Tasmota with IRHVAC."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def probe(host: str) -> dict[str, Any] | None:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._get_tasmota_info(host, auth, quiet=True), timeout
+                    )
+                except asyncio.TimeoutError:
+                    _LOGGER.debug("Timeout probing %s", host)
+                    return None
+
+        results = await asyncio.gather(*(probe(host) for host in hosts))
+        return {
+            host: info
+            for host, info in zip(hosts, results)
+            if info is not None and info["ir"].get("Reported")
+        }
+
+    async def async_step_scan(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Probe a CIDR range or a list of hosts for IR blasters."""
+        errors = {}
+
+        if user_input is not None:
+            from .tasmota_http import expand_hosts
+
+            try:
+                hosts = expand_hosts(user_input[CONF_HOSTS])
+            except ValueError as ex:
+                _LOGGER.error("Invalid hosts to scan: %s", str(ex))
+                errors[CONF_HOSTS] = "invalid_hosts"
+            else:
+                configured = self._async_current_ids()
+                hosts = [h for h in hosts if entry_unique_id(h) not in configured]
+
+                auth = None
+                if user_input.get(CONF_USERNAME) and user_input.get(CONF_PASSWORD):
+                    auth = (user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
+
+                self._scan_results = await self._async_scan_hosts(
+                    hosts,
+                    auth,
+                    user_input.get(CONF_SCAN_CONCURRENCY, DEFAULT_SCAN_CONCURRENCY),
+                    user_input.get(CONF_SCAN_TIMEOUT, DEFAULT_SCAN_TIMEOUT),
+                )
+                _LOGGER.debug(
+                    "Found %s IR blasters on %s hosts", len(self._scan_results), len(hosts)
+                )
+                if not self._scan_results:
+                    return self.async_abort(reason="no_devices_found")
+                return await self.async_step_scan_select()
+
+        from .flow_schemas import SCAN_DATA_SCHEMA
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=SCAN_DATA_SCHEMA,
+            errors=errors,
+        )
+
+    def _async_create_scanned(self, host: str, vendor: str) -> None:
+        """Start a bulk flow creating the entry of a scanned blaster."""
+        device_name = self._device_name(self._scan_results[host])
+        data = {
+            CONF_HOST: host,
+            CONF_NAME: device_name,
+            **self._get_mqtt_topics(device_name),
+            CONF_VENDOR: vendor,
+            **self._scan_settings,
+        }
+        self.hass.async_create_task(
+            self.hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_BULK}, data=data
+            )
+        )
+        self._scan_created += 1
+
+    def _async_scan_done(self) -> FlowResult:
+        """Finish the scan once every selected blaster has an entry."""
+        return self.async_abort(
+            reason="bulk_created",
+            description_placeholders={"count": str(self._scan_created)},
+        )
+
+    async def async_step_scan_select(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Create entries for the selected blasters in one pass.
+
+        Blasters whose firmware lacks the chosen vendor are asked for their
+        own vendor afterwards, one at a time.
+        """
+        if user_input is not None:
+            vendor = user_input[CONF_VENDOR]
+            self._scan_settings = {
+                CONF_MODEL: user_input.get(CONF_MODEL, DEFAULT_CONF_MODEL),
+                CONF_MQTT_DELAY: user_input.get(CONF_MQTT_DELAY, DEFAULT_MQTT_DELAY),
+            }
+            for host in user_input["selected_hosts"]:
+                if host not in self._scan_results:
+                    continue
+                if vendor in self._scan_results[host]["ir"]["Protocols"]:
+                    self._async_create_scanned(host, vendor)
+                else:
+                    self._scan_pending.append(host)
+            if self._scan_pending:
+                return await self.async_step_scan_vendor()
+            return self._async_scan_done()
+
+        devices = {
+            host: f"{self._device_name(info)} ({host})"
+            for host, info in sorted(self._scan_results.items())
+        }
+        ir_protocols = sorted(
+            {p for info in self._scan_results.values() for p in info["ir"]["Protocols"]}
+        )
+
+        from .flow_schemas import scan_select_schema
+
+        return self.async_show_form(
+            step_id="scan_select",
+            data_schema=scan_select_schema(devices, ir_protocols),
+            description_placeholders={"count": str(len(devices))},
+        )
+
+    async def async_step_scan_vendor(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Ask for the vendor of a selected blaster lacking the chosen one."""
+        if user_input is not None:
+            self._async_create_scanned(self._scan_pending.pop(0), user_input[CONF_VENDOR])
+            if not self._scan_pending:
+                return self._async_scan_done()
+
+        host = self._scan_pending[0]
+        info = self._scan_results[host]
+
+        from .flow_schemas import scan_vendor_schema
+
+        return self.async_show_form(
+            step_id="scan_vendor",
+            data_schema=scan_vendor_schema(info["ir"]["Protocols"]),
+            description_placeholders={
+                "name": self._device_name(info),
+                "host": host,
+                "remaining": str(len(self._scan_pending)),
+            },
+        )
+
+    async def async_step_mqtt(self, discovery_info: MqttServiceInfo) -> FlowResult:
+        """Handle a blaster found through Tasmota's MQTT discovery."""
+        from .device_cache import async_get_device_cache
+        from .tasmota_mqtt import async_probe_vendor_list, parse_discovery
+
+        device = parse_discovery(discovery_info.payload)
+        if device is None:
+            return self.async_abort(reason="invalid_discovery_info")
+
+        await self.async_set_unique_id(entry_unique_id(device["host"]))
+        self._abort_if_unique_id_configured()
+
+        # Known firmware: reuse the vendor list, including "no IRHVAC support".
+        # It is fixed by the firmware build, so only an upgrade probes again.
+        cache = await async_get_device_cache(self.hass)
+        version = device["status"]["StatusFWR"]["Version"]
+        cached = cache.async_get(device["host"], version, max_age=None)
+        if cached is not None:
+            protocols = cached["protocols"]
+        else:
+            protocols = await async_probe_vendor_list(
+                self.hass, device["topics"][CONF_COMMAND_TOPIC], device["result_topic"]
+            )
+            if protocols is None:
+                return self.async_abort(reason="cannot_connect")
+            cache.async_set(device["host"], device["status"], protocols)
+
+        if not protocols:
+            _LOGGER.debug("%s has no IRHVAC support", device["host"])
+            return self.async_abort(reason="not_irhvac_device")
+
+        self._device_info = {
+            "status": device["status"],
+            "ir": {"Protocols": protocols, "Reported": True},
+            "hostname": device["host"],
+        }
+        self._mqtt_topics = device["topics"]
+        self._data.update({
+            CONF_HOST: device["host"],
+            CONF_NAME: device["name"],
+            **self._mqtt_topics
+        })
+        self.context["title_placeholders"] = {"name": device["name"]}
+        return await self.async_step_ir()
+
+    async def async_step_bulk(self, data: dict[str, Any]) -> FlowResult:
+        """Create an entry from complete data, without probing the device."""
+        await self.async_set_unique_id(bulk_unique_id(data))
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=data[CONF_NAME], data=data)
+
+    @staticmethod
+    def _device_name(device_info: dict[str, Any]) -> str:
+        """Return the Tasmota friendly name of a probed device."""
+        return device_info["status"].get("Status", {}).get("FriendlyName", [DEFAULT_NAME])[0]
+
     async def async_step_ir(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Configure IR settings."""
         errors = {}  
 
         if user_input is not None:
             # Generate a unique ID for the config entry
-            unique_id = f"tasmota_irhvac_{self._data['host']}"
+            unique_id = entry_unique_id(self._data[CONF_HOST])
             await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
             
@@ -364,28 +452,13 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
         
         if not ir_protocols:
             _LOGGER.warning("No IR protocols found, using default list")
-            ir_protocols = [
-                "SAMSUNG_AC",
-                "LG_AC",
-                "MITSUBISHI_AC",
-                "DAIKIN_AC",
-                "HITACHI_AC",
-                "FUJITSU_AC",
-                "PANASONIC_AC"
-            ]
+            ir_protocols = list(DEFAULT_IR_PROTOCOLS)
+
+        from .flow_schemas import ir_schema
 
         return self.async_show_form(
             step_id="ir",
-            data_schema=vol.Schema({
-                vol.Required(CONF_VENDOR): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=ir_protocols,
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    ),
-                ),
-                vol.Optional("hvac_model", default=DEFAULT_CONF_MODEL): str,
-                vol.Optional(CONF_MQTT_DELAY, default=DEFAULT_MQTT_DELAY): vol.Coerce(float),
-            }),
+            data_schema=ir_schema(ir_protocols),
             description_placeholders={
                 "device_ip": self._data[CONF_HOST]
             },
@@ -410,17 +483,11 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
                 self._data.update(user_input)
                 return await self.async_step_modes()
 
+        from .flow_schemas import temperature_schema
+
         return self.async_show_form(
             step_id="temperature",
-            data_schema=vol.Schema({
-                vol.Required("min_temp", default=DEFAULT_MIN_TEMP): vol.Coerce(float),
-                vol.Required("max_temp", default=DEFAULT_MAX_TEMP): vol.Coerce(float),
-                vol.Required(CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP): vol.Coerce(float),
-                vol.Optional(CONF_AWAY_TEMP): vol.Coerce(float),
-                vol.Optional(CONF_PRECISION, default=DEFAULT_PRECISION): vol.In([0.1, 0.5, 1.0]),
-                vol.Required(CONF_TEMP_STEP,default=DEFAULT_PRECISION): vol.In([0.5, 1.0]),            
-                vol.Optional(CONF_CELSIUS, default=DEFAULT_CONF_CELSIUS): vol.In(["On", "Off"]),
-            }),
+            data_schema=temperature_schema(),
             errors=errors,
         )
     
@@ -450,28 +517,11 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.error("Error processing sensor input: %s", str(ex))
                 errors["base"] = "unknown"
 
+        from .flow_schemas import sensors_schema
+
         return self.async_show_form(
             step_id="sensors",
-            data_schema=vol.Schema({
-                vol.Optional(CONF_TEMP_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(CONF_HUMIDITY_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                        multiple=False,
-                    )
-                ),
-                vol.Optional(CONF_POWER_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        multiple=False,
-                    )
-                ),
-            }),
+            data_schema=sensors_schema(),
             errors=errors,
         )
 
@@ -481,30 +531,11 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
             self._data.update(user_input)
             return await self.async_step_presets()
 
+        from .flow_schemas import modes_schema
+
         return self.async_show_form(
             step_id="modes",
-            data_schema=vol.Schema({
-                vol.Required(CONF_MODES_LIST, default=DEFAULT_MODES_LIST_WITH_OFF): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=["off"] + DEFAULT_MODES_LIST,
-                        multiple=True,
-                    ),
-                ),
-                vol.Required(CONF_FAN_LIST, default=DEFAULT_FAN_LIST): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=DEFAULT_FAN_LIST,
-                        multiple=True,
-                    ),
-                ),
-                vol.Required(CONF_SWING_LIST, default=DEFAULT_SWING_LIST): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=["off", "vertical", "horizontal", "both"],
-                        multiple=True,
-                    ),
-                ),
-                vol.Optional(CONF_SWINGV): str,
-                vol.Optional(CONF_SWINGH): str,
-            }),
+            data_schema=modes_schema(),
         )
 
     async def async_step_presets(self, user_input: dict[str, Any] | None = None) -> FlowResult:
@@ -532,34 +563,12 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
             self._data.update(user_input)
             return await self.async_step_toggles()
 
-        # Get all available presets - ONLY true presets, not toggles
-        available_presets = [
-            (preset.lower(), f"{preset.capitalize()} Mode")
-            for preset in PRESET_OPTIONS_LIST
-        ]
+        from .flow_schemas import presets_schema
 
         try:
             return self.async_show_form(
                 step_id="presets",
-                data_schema=vol.Schema({
-                    vol.Optional("enabled_presets", default=[]): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=[{"value": id, "label": name} for id, name in available_presets],
-                            multiple=True,
-                            mode=selector.SelectSelectorMode.LIST,
-                        ),
-                    ),
-                    vol.Optional("default_presets", default=[]): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=[{"value": id, "label": name} for id, name in available_presets],
-                            multiple=True,
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        ),
-                    ),
-                    # Add essential settings from the features step
-                    vol.Optional(CONF_KEEP_MODE, default=DEFAULT_CONF_KEEP_MODE): bool,
-                    vol.Optional(CONF_IGNORE_OFF_TEMP, default=DEFAULT_IGNORE_OFF_TEMP): bool,
-                }),
+                data_schema=presets_schema(),
                 errors=errors,
                 description_placeholders={
                     "note": "Configure preset modes and essential settings for your AC unit."
@@ -617,31 +626,12 @@ class TasmotaIRHVACConfigFlow(ConfigFlow, domain=DOMAIN):
                 data=self._data,
             )
 
-        # Get all available toggles - ONLY toggles, not presets
-        available_toggles = [
-            (toggle.lower(), toggle.capitalize())
-            for toggle in TOGGLE_OPTIONS_LIST
-        ]
+        from .flow_schemas import toggles_schema
 
         try:
             return self.async_show_form(
                 step_id="toggles",
-                data_schema=vol.Schema({
-                    vol.Optional("enabled_toggles", default=[]): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=[{"value": id, "label": name} for id, name in available_toggles],
-                            multiple=True,
-                            mode=selector.SelectSelectorMode.LIST,
-                        ),
-                    ),
-                    vol.Optional("default_toggles", default=[]): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=[{"value": id, "label": name} for id, name in available_toggles],
-                            multiple=True,
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        ),
-                    ),
-                }),
+                data_schema=toggles_schema(),
                 errors=errors,
             )
         except Exception as ex:
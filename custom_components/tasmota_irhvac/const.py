@@ -114,12 +114,27 @@ CONF_SWINGV = "default_swingv"
 CONF_SWINGH = "default_swingh"
 CONF_TOGGLE_LIST = "toggle_list"
 CONF_IGNORE_OFF_TEMP = "ignore_off_temp"
+CONF_FLEET_MODE = "mqtt_fleet_mode"
+CONF_REFRESH_DEVICE_INFO = "refresh_device_info"
+CONF_HOSTS = "hosts"
+CONF_SCAN_CONCURRENCY = "scan_concurrency"
+CONF_SCAN_TIMEOUT = "scan_timeout"
 
 # Default values
 DEFAULT_NAME = "IR AirConditioner"
 DEFAULT_STATE_TOPIC = "state"
 DEFAULT_COMMAND_TOPIC = "topic"
 DEFAULT_MQTT_DELAY = 0.0
+# IR protocols offered when the blaster does not report its vendor list
+DEFAULT_IR_PROTOCOLS = [
+    "SAMSUNG_AC",
+    "LG_AC",
+    "MITSUBISHI_AC",
+    "DAIKIN_AC",
+    "HITACHI_AC",
+    "FUJITSU_AC",
+    "PANASONIC_AC",
+]
 DEFAULT_TARGET_TEMP = 24
 DEFAULT_MIN_TEMP = 16
 DEFAULT_MAX_TEMP = 30
@@ -138,11 +153,88 @@ DEFAULT_CONF_SLEEP = "-1"
 DEFAULT_CONF_KEEP_MODE = False
 DEFAULT_STATE_MODE = "SendStore"
 DEFAULT_IGNORE_OFF_TEMP = False
+DEFAULT_FLEET_MODE = False
+DEFAULT_SCAN_CONCURRENCY = 16
+DEFAULT_SCAN_TIMEOUT = 5.0
+MAX_SCAN_HOSTS = 1024
+
+# Config flow source creating an entry from complete data, without probing
+SOURCE_BULK = "bulk"
 
 ATTR_NAME = "name"
 ATTR_VALUE = "value"
 
 DATA_KEY = "tasmota_irhvac.climate"
+DATA_MQTT_HUB = "tasmota_irhvac.mqtt_hub"
+DATA_STATE_STORE = "tasmota_irhvac.state_store"
+DATA_DEVICE_CACHE = "tasmota_irhvac.device_cache"
+DATA_BLASTERS = "tasmota_irhvac.blasters"
+DATA_METRICS = "tasmota_irhvac.metrics"
+DATA_TRACES = "tasmota_irhvac.traces"
+DATA_PROFILER = "tasmota_irhvac.profiler"
+DATA_TRAFFIC_RECORDER = "tasmota_irhvac.traffic_recorder"
+
+STATE_STORE_KEY = "tasmota_irhvac.state"
+STATE_STORE_VERSION = 1
+STATE_STORE_SAVE_DELAY = 10
+
+DEVICE_CACHE_KEY = "tasmota_irhvac.devices"
+DEVICE_CACHE_VERSION = 1
+DEVICE_CACHE_SAVE_DELAY = 10
+# Seconds a probed vendor list and status summary are reused by config flows
+DEVICE_CACHE_TTL = 7 * 24 * 3600
+
+# Seconds within which an identical IRHVAC frame on any state topic is the same IR event
+STATE_DEDUP_WINDOW = 1.0
+
+# Minimum seconds between two IR frames sent through the same blaster
+BLASTER_FRAME_SPACING = 0.2
+
+# Priority lanes of the outbound queue of a blaster, highest first
+LANE_CRITICAL = 0
+LANE_NORMAL = 1
+LANE_COSMETIC = 2
+
+# Retries of commands that could not be published while MQTT was disconnected:
+# first delay, cap of the exponential backoff, and age after which a command is dropped
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_MAX_AGE = 120.0
+
+# Seconds to wait for the blaster's {"IRHVAC":"Done"} before retransmitting once
+ACK_TIMEOUT = 5.0
+ACK_DONE = "done"
+ACK_FAILED = "failed"
+ACK_TIMED_OUT = "timeout"
+# Ack latencies kept per blaster
+ACK_LATENCY_SAMPLES = 20
+
+# Command traces kept per entity, and seconds after which a state frame is no
+# longer the echo of the last command
+TRACE_SAMPLES = 20
+TRACE_ECHO_WINDOW = 10.0
+
+# Upper bounds in milliseconds of the buckets of timing histograms
+HISTOGRAM_BUCKETS_MS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+# Default and maximum seconds a profile runs
+PROFILE_DEFAULT_DURATION = 30
+PROFILE_MAX_DURATION = 600
+
+# MQTT traffic recordings: file in the config directory, default and maximum
+# seconds they run, seconds between writes and format version
+# Recordings are only written to this subdirectory of the config directory
+TRAFFIC_DIRECTORY = "tasmota_irhvac_traffic"
+TRAFFIC_DEFAULT_FILENAME = "tasmota_irhvac_traffic.jsonl"
+TRAFFIC_DEFAULT_DURATION = 3600
+TRAFFIC_MAX_DURATION = 7 * 24 * 3600
+TRAFFIC_FLUSH_INTERVAL = 1.0
+TRAFFIC_RECORDING_VERSION = 1
+
+# Wildcards shared by all blasters in fleet mode (Tasmota's default FullTopic)
+FLEET_WILDCARD_TOPICS = ("tele/+/RESULT", "stat/+/RESULT", "tele/+/LWT")
 
 ATTR_ECONO = "econo"
 ATTR_TURBO = "turbo"
@@ -158,6 +250,8 @@ ATTR_SWINGH = "swingh"
 ATTR_FIX_SWINGV = "fix_swingv"
 ATTR_FIX_SWINGH = "fix_swingh"
 ATTR_STATE_MODE = "state_mode"
+ATTR_LAST_ACK = "last_ack"
+ATTR_ACK_LATENCY = "ack_latency"
 
 SERVICE_ECONO_MODE = "set_econo"
 SERVICE_TURBO_MODE = "set_turbo"
@@ -169,6 +263,20 @@ SERVICE_BEEP_MODE = "set_beep"
 SERVICE_SLEEP_MODE = "set_sleep"
 SERVICE_SET_SWINGV = "set_swingv"
 SERVICE_SET_SWINGH = "set_swingh"
+SERVICE_BULK_IMPORT = "bulk_import"
+SERVICE_GET_TRACES = "get_traces"
+SERVICE_GET_LATENCIES = "get_latencies"
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+SERVICE_STOP_RECORDING = "stop_recording"
+
+ATTR_DEVICES = "devices"
+ATTR_CSV = "csv"
+ATTR_YAML = "yaml"
+ATTR_DRY_RUN = "dry_run"
+ATTR_DURATION = "duration"
+ATTR_MESSAGES = "messages"
+ATTR_FILENAME = "filename"
 
 # Map attributes to properties of the state object
 ATTRIBUTES_IRHVAC = {
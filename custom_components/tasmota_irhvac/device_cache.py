@@ -0,0 +1,130 @@
+"""Persistent cache of probed Tasmota IR blasters."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_DEVICE_CACHE,
+    DEVICE_CACHE_KEY,
+    DEVICE_CACHE_SAVE_DELAY,
+    DEVICE_CACHE_TTL,
+    DEVICE_CACHE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parts of the Status 0 response kept in the cache
+STATUS_SUMMARY_FIELDS = {
+    "Status": ("DeviceName", "FriendlyName", "Topic"),
+    "StatusFWR": ("Version",),
+    "StatusNET": ("Hostname", "IPAddress", "Mac"),
+}
+
+
+def summarize_status(status: dict[str, Any]) -> dict[str, Any]:
+    """Return the parts of a Status 0 response the config flow uses.
+
+    The summary keeps the shape of the original response.
+    """
+    summary = {}
+    for section, fields in STATUS_SUMMARY_FIELDS.items():
+        values = status.get(section)
+        if isinstance(values, dict):
+            summary[section] = {
+                field: values[field] for field in fields if field in values
+            }
+    return summary
+
+
+def firmware_version(status: dict[str, Any]) -> str:
+    """Return the firmware version from a Status 0 or Status 2 response."""
+    return str(status.get("StatusFWR", {}).get("Version", "unknown"))
+
+
+async def async_get_device_cache(hass: HomeAssistant) -> TasmotaDeviceCache:
+    """Return the domain-wide device cache, loading it on first use."""
+    if (cache := hass.data.get(DATA_DEVICE_CACHE)) is None:
+        cache = hass.data[DATA_DEVICE_CACHE] = TasmotaDeviceCache(hass)
+        await cache.async_load()
+    return cache
+
+
+class TasmotaDeviceCache:
+    """Remember the vendor list and status summary of each blaster.
+
+    Entries are keyed by host and firmware version, since the vendor list is
+    fixed by the firmware build. An empty vendor list records firmware
+    without IRHVAC support. Only the entry for the latest firmware seen on
+    a host is kept. Lookups name the firmware the host runs now, so an
+    upgrade is never answered from the entry of the old version.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, DEVICE_CACHE_VERSION, DEVICE_CACHE_KEY
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the cached devices."""
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.error("Error loading cached Tasmota devices: %s", str(e))
+            data = None
+        self._entries = data or {}
+
+    @staticmethod
+    def _key(host: str, version: str) -> str:
+        """Return the cache key of a host and firmware version."""
+        return f"{host}|{version}"
+
+    @callback
+    def async_get(
+        self, host: str, version: str, max_age: float | None = DEVICE_CACHE_TTL
+    ) -> dict[str, Any] | None:
+        """Return the entry of a host running `version`, if younger than `max_age`."""
+        entry = self._entries.get(self._key(host, version))
+        if entry is None or (
+            max_age is not None and time.time() - entry["fetched_at"] >= max_age
+        ):
+            return None
+        return entry
+
+    @callback
+    def async_set(
+        self, host: str, status: dict[str, Any], protocols: list[str]
+    ) -> None:
+        """Cache the probe result of a host."""
+        version = firmware_version(status)
+        # A firmware upgrade replaces the entry of the old version
+        for key in [k for k, e in self._entries.items() if e["host"] == host]:
+            del self._entries[key]
+        self._entries[self._key(host, version)] = {
+            "host": host,
+            "version": version,
+            "fetched_at": time.time(),
+            "status": summarize_status(status),
+            "protocols": list(protocols),
+        }
+        self._store.async_delay_save(self._data_to_save, DEVICE_CACHE_SAVE_DELAY)
+
+    @callback
+    def async_invalidate(self, host: str) -> None:
+        """Forget the cached entries of a host."""
+        keys = [k for k, e in self._entries.items() if e["host"] == host]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            self._store.async_delay_save(self._data_to_save, DEVICE_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to write to disk."""
+        return self._entries
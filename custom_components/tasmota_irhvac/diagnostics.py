@@ -0,0 +1,80 @@
+"""Diagnostics support for Tasmota IRHVAC."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import (
+    ATTR_ACK_LATENCY,
+    ATTR_LAST_ACK,
+    DATA_BLASTERS,
+    DATA_KEY,
+    DATA_MQTT_HUB,
+)
+from .metrics import async_get_metrics
+from .tracing import async_get_traces
+
+TO_REDACT = {CONF_HOST, CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entity = hass.data.get(DATA_KEY, {}).get(entry.entry_id)
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        **_entity_diagnostics(hass, entity),
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a device; each entry has a single AC."""
+    return await async_get_config_entry_diagnostics(hass, entry)
+
+
+def _entity_diagnostics(hass: HomeAssistant, entity: Any) -> dict[str, Any]:
+    """Return the runtime state of an AC, its blaster and their timings."""
+    if entity is None:
+        return {"entity": None}
+
+    hub = hass.data.get(DATA_MQTT_HUB)
+    blaster = hass.data.get(DATA_BLASTERS, {}).get(entity.topic)
+    metrics = async_get_metrics(hass)
+    return {
+        "entity": {
+            "entity_id": entity.entity_id,
+            "unique_id": entity.unique_id,
+            "available": entity.available,
+            "command_topic": entity.topic,
+            "state_topics": entity.state_topics,
+            "availability_topic": entity.availability_topic,
+            "last_ack": entity.extra_state_attributes.get(ATTR_LAST_ACK),
+            "ack_latency_ms": entity.extra_state_attributes.get(ATTR_ACK_LATENCY),
+            "state": entity._async_state_snapshot(),
+            "metrics": metrics.for_source(entity.unique_id),
+        },
+        "mqtt": {
+            "subscriptions": hub.subscriptions if hub is not None else [],
+        },
+        "blaster": {
+            **blaster.diagnostics(),
+            "metrics": metrics.for_source(entity.topic),
+        }
+        if blaster is not None
+        else None,
+        "traces": async_get_traces(hass).as_dict([entity.entity_id]).get(
+            entity.entity_id, []
+        ),
+    }
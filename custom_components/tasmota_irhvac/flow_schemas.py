@@ -0,0 +1,332 @@
+"""Form schemas for the Tasmota IRHVAC config and options flows.
+
+Imported lazily by config_flow.py once a flow actually shows a form.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate.const import HVACMode
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+)
+from homeassistant.helpers import selector
+
+from .const import (
+    CONF_AWAY_TEMP,
+    CONF_CELSIUS,
+    CONF_FAN_LIST,
+    CONF_FLEET_MODE,
+    CONF_HOSTS,
+    CONF_HUMIDITY_SENSOR,
+    CONF_IGNORE_OFF_TEMP,
+    CONF_KEEP_MODE,
+    CONF_MAX_TEMP,
+    CONF_MIN_TEMP,
+    CONF_MODES_LIST,
+    CONF_MQTT_DELAY,
+    CONF_POWER_SENSOR,
+    CONF_PRECISION,
+    CONF_REFRESH_DEVICE_INFO,
+    CONF_SCAN_CONCURRENCY,
+    CONF_SCAN_TIMEOUT,
+    CONF_SWING_LIST,
+    CONF_SWINGH,
+    CONF_SWINGV,
+    CONF_TARGET_TEMP,
+    CONF_TEMP_SENSOR,
+    CONF_TEMP_STEP,
+    CONF_VENDOR,
+    DEFAULT_CONF_CELSIUS,
+    DEFAULT_CONF_KEEP_MODE,
+    DEFAULT_CONF_MODEL,
+    DEFAULT_FAN_LIST,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_IGNORE_OFF_TEMP,
+    DEFAULT_MAX_TEMP,
+    DEFAULT_MIN_TEMP,
+    DEFAULT_MODES_LIST,
+    DEFAULT_MQTT_DELAY,
+    DEFAULT_PRECISION,
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_TIMEOUT,
+    DEFAULT_SWING_LIST,
+    DEFAULT_TARGET_TEMP,
+    PRESET_OPTIONS_LIST,
+    TOGGLE_OPTIONS_LIST,
+)
+
+# Add OFF mode to the default modes list
+# This ensures the OFF button/mode is available in the UI
+# When OFF mode is selected, 'Power' is set to 'Off' in the MQTT payload
+DEFAULT_MODES_LIST_WITH_OFF = [HVACMode.OFF] + list(DEFAULT_MODES_LIST)
+
+SWING_OPTIONS = ["off", "vertical", "horizontal", "both"]
+
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): str,
+        vol.Optional(CONF_USERNAME): str,
+        vol.Optional(CONF_PASSWORD): str,
+        vol.Optional(CONF_REFRESH_DEVICE_INFO, default=False): bool,
+    }
+)
+
+SCAN_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOSTS): selector.TextSelector(
+            selector.TextSelectorConfig(multiline=True)
+        ),
+        vol.Optional(CONF_USERNAME): str,
+        vol.Optional(CONF_PASSWORD): str,
+        vol.Optional(
+            CONF_SCAN_CONCURRENCY, default=DEFAULT_SCAN_CONCURRENCY
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=128)),
+        vol.Optional(
+            CONF_SCAN_TIMEOUT, default=DEFAULT_SCAN_TIMEOUT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+    }
+)
+
+
+def scan_select_schema(devices: dict[str, str], ir_protocols: list[str]) -> vol.Schema:
+    """Return the form selecting discovered blasters and their IR protocol."""
+    return vol.Schema({
+        vol.Required("selected_hosts", default=list(devices)): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[
+                    {"value": host, "label": label} for host, label in devices.items()
+                ],
+                multiple=True,
+                mode=selector.SelectSelectorMode.LIST,
+            ),
+        ),
+        vol.Required(CONF_VENDOR): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=ir_protocols,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+        vol.Optional("hvac_model", default=DEFAULT_CONF_MODEL): str,
+        vol.Optional(CONF_MQTT_DELAY, default=DEFAULT_MQTT_DELAY): vol.Coerce(float),
+    })
+
+
+def scan_vendor_schema(ir_protocols: list[str]) -> vol.Schema:
+    """Return the form asking for the IR protocol of one discovered blaster."""
+    return vol.Schema({
+        vol.Required(CONF_VENDOR): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=sorted(ir_protocols),
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+    })
+
+
+def options_schema(data: dict[str, Any], options: dict[str, Any]) -> vol.Schema:
+    """Return the options form, prefilled with the current values."""
+    return vol.Schema({
+        vol.Optional(
+            CONF_MIN_TEMP,
+            default=options.get(
+                CONF_MIN_TEMP,
+                data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)
+            ),
+        ): vol.Coerce(float),
+        vol.Optional(
+            CONF_MAX_TEMP,
+            default=options.get(
+                CONF_MAX_TEMP,
+                data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP)
+            ),
+        ): vol.Coerce(float),
+        vol.Optional(
+            CONF_TARGET_TEMP,
+            default=options.get(
+                CONF_TARGET_TEMP,
+                data.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP)
+            ),
+        ): vol.Coerce(float),
+        vol.Optional(
+            CONF_TEMP_STEP,
+            default=options.get(
+                CONF_TEMP_STEP, data.get(CONF_TEMP_STEP, DEFAULT_PRECISION)
+            )
+        ): vol.In([0.5, 1.0]),
+        vol.Optional(
+            CONF_MODES_LIST,
+            default=options.get(
+                CONF_MODES_LIST,
+                data.get(CONF_MODES_LIST, DEFAULT_MODES_LIST_WITH_OFF)
+            ),
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=["off"] + DEFAULT_MODES_LIST,
+                multiple=True,
+            ),
+        ),
+        vol.Optional(
+            CONF_FAN_LIST,
+            default=options.get(
+                CONF_FAN_LIST,
+                data.get(CONF_FAN_LIST, DEFAULT_FAN_LIST)
+            ),
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=DEFAULT_FAN_LIST,
+                multiple=True,
+            ),
+        ),
+        vol.Optional(
+            CONF_SWING_LIST,
+            default=options.get(
+                CONF_SWING_LIST,
+                data.get(CONF_SWING_LIST, DEFAULT_SWING_LIST)
+            ),
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=SWING_OPTIONS,
+                multiple=True,
+            ),
+        ),
+        vol.Optional(
+            CONF_FLEET_MODE,
+            default=options.get(
+                CONF_FLEET_MODE,
+                data.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE)
+            ),
+        ): bool,
+    })
+
+
+def ir_schema(ir_protocols: list[str]) -> vol.Schema:
+    """Return the IR protocol form."""
+    return vol.Schema({
+        vol.Required(CONF_VENDOR): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=ir_protocols,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+        vol.Optional("hvac_model", default=DEFAULT_CONF_MODEL): str,
+        vol.Optional(CONF_MQTT_DELAY, default=DEFAULT_MQTT_DELAY): vol.Coerce(float),
+    })
+
+
+def temperature_schema() -> vol.Schema:
+    """Return the temperature settings form."""
+    return vol.Schema({
+        vol.Required("min_temp", default=DEFAULT_MIN_TEMP): vol.Coerce(float),
+        vol.Required("max_temp", default=DEFAULT_MAX_TEMP): vol.Coerce(float),
+        vol.Required(CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP): vol.Coerce(float),
+        vol.Optional(CONF_AWAY_TEMP): vol.Coerce(float),
+        vol.Optional(CONF_PRECISION, default=DEFAULT_PRECISION): vol.In([0.1, 0.5, 1.0]),
+        vol.Required(CONF_TEMP_STEP, default=DEFAULT_PRECISION): vol.In([0.5, 1.0]),
+        vol.Optional(CONF_CELSIUS, default=DEFAULT_CONF_CELSIUS): vol.In(["On", "Off"]),
+    })
+
+
+def sensors_schema() -> vol.Schema:
+    """Return the sensor entities form."""
+    return vol.Schema({
+        vol.Optional(CONF_TEMP_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor",
+                multiple=False,
+            )
+        ),
+        vol.Optional(CONF_HUMIDITY_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor",
+                multiple=False,
+            )
+        ),
+        vol.Optional(CONF_POWER_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="binary_sensor",
+                multiple=False,
+            )
+        ),
+    })
+
+
+def modes_schema() -> vol.Schema:
+    """Return the operation modes form."""
+    return vol.Schema({
+        vol.Required(CONF_MODES_LIST, default=DEFAULT_MODES_LIST_WITH_OFF): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=["off"] + DEFAULT_MODES_LIST,
+                multiple=True,
+            ),
+        ),
+        vol.Required(CONF_FAN_LIST, default=DEFAULT_FAN_LIST): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=DEFAULT_FAN_LIST,
+                multiple=True,
+            ),
+        ),
+        vol.Required(CONF_SWING_LIST, default=DEFAULT_SWING_LIST): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=SWING_OPTIONS,
+                multiple=True,
+            ),
+        ),
+        vol.Optional(CONF_SWINGV): str,
+        vol.Optional(CONF_SWINGH): str,
+    })
+
+
+def presets_schema() -> vol.Schema:
+    """Return the preset modes form - ONLY true presets, not toggles."""
+    options = [
+        {"value": preset.lower(), "label": f"{preset.capitalize()} Mode"}
+        for preset in PRESET_OPTIONS_LIST
+    ]
+    return vol.Schema({
+        vol.Optional("enabled_presets", default=[]): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=options,
+                multiple=True,
+                mode=selector.SelectSelectorMode.LIST,
+            ),
+        ),
+        vol.Optional("default_presets", default=[]): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=options,
+                multiple=True,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+        # Add essential settings from the features step
+        vol.Optional(CONF_KEEP_MODE, default=DEFAULT_CONF_KEEP_MODE): bool,
+        vol.Optional(CONF_IGNORE_OFF_TEMP, default=DEFAULT_IGNORE_OFF_TEMP): bool,
+    })
+
+
+def toggles_schema() -> vol.Schema:
+    """Return the toggle features form - ONLY toggles, not presets."""
+    options = [
+        {"value": toggle.lower(), "label": toggle.capitalize()}
+        for toggle in TOGGLE_OPTIONS_LIST
+    ]
+    return vol.Schema({
+        vol.Optional("enabled_toggles", default=[]): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=options,
+                multiple=True,
+                mode=selector.SelectSelectorMode.LIST,
+            ),
+        ),
+        vol.Optional("default_toggles", default=[]): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=options,
+                multiple=True,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+    })
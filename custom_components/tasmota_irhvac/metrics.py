@@ -0,0 +1,178 @@
+"""In-memory metrics of the Tasmota IRHVAC integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_METRICS, HISTOGRAM_BUCKETS_MS
+
+
+@callback
+def async_get_metrics(hass: HomeAssistant) -> IrhvacMetrics:
+    """Return the domain-wide metrics, creating them on first use."""
+    if (metrics := hass.data.get(DATA_METRICS)) is None:
+        metrics = hass.data[DATA_METRICS] = IrhvacMetrics()
+    return metrics
+
+
+def _bucket_label(index: int) -> str:
+    """Return the label of a histogram bucket."""
+    if index < len(HISTOGRAM_BUCKETS_MS):
+        return f"<={HISTOGRAM_BUCKETS_MS[index]}"
+    return f">{HISTOGRAM_BUCKETS_MS[-1]}"
+
+
+class Histogram:
+    """Distribution of durations over the fixed HISTOGRAM_BUCKETS_MS.
+
+    Recording a value only increments preallocated counts, so it can run on
+    every message without allocating.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        # One count per bucket, plus one for values above the last bound
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record a duration in milliseconds."""
+        self.counts[bisect_left(HISTOGRAM_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile.
+
+        Values above the last bucket report the largest value seen.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                if index < len(HISTOGRAM_BUCKETS_MS):
+                    return min(HISTOGRAM_BUCKETS_MS[index], round(self.max, 3))
+                break
+        return round(self.max, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the percentiles and the non-empty buckets."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 3),
+            "buckets": {
+                _bucket_label(index): n for index, n in enumerate(self.counts) if n
+            },
+        }
+
+
+class IrhvacMetrics:
+    """Counters and gauges, each kept per source.
+
+    The source is whatever the value belongs to: the unique_id of an entity
+    or the command topic of a blaster. Totals are summed over all sources
+    when read, so updating a value stays a single dict write on the hot path.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        # metric name -> source -> value
+        self._counters: dict[str, dict[str, int]] = {}
+        self._gauges: dict[str, dict[str, float]] = {}
+        self._histograms: dict[str, dict[str, Histogram]] = {}
+
+    @callback
+    def async_increment(self, name: str, source: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        counter = self._counters.setdefault(name, {})
+        counter[source] = counter.get(source, 0) + amount
+
+    @callback
+    def async_set(self, name: str, source: str, value: float) -> None:
+        """Set a gauge."""
+        self._gauges.setdefault(name, {})[source] = value
+
+    @callback
+    def async_observe(self, name: str, source: str, value_ms: float) -> None:
+        """Record a duration in a histogram."""
+        histograms = self._histograms.setdefault(name, {})
+        if (histogram := histograms.get(source)) is None:
+            histogram = histograms[source] = Histogram()
+        histogram.observe(value_ms)
+
+    @callback
+    def async_remove_source(self, source: str) -> None:
+        """Drop the gauges of a source that went away; counters are kept."""
+        for values in self._gauges.values():
+            values.pop(source, None)
+
+    def counter(self, name: str, source: str | None = None) -> int:
+        """Return a counter of one source, or its total."""
+        values = self._counters.get(name, {})
+        return values.get(source, 0) if source is not None else sum(values.values())
+
+    def gauge(self, name: str, source: str | None = None) -> float | None:
+        """Return a gauge of one source (None until set), or its total."""
+        values = self._gauges.get(name, {})
+        return values.get(source) if source is not None else sum(values.values())
+
+    def histogram(self, name: str, source: str) -> Histogram | None:
+        """Return a histogram of one source."""
+        return self._histograms.get(name, {}).get(source)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all values, per source and in total."""
+        return {
+            **{
+                kind: {
+                    name: {"total": sum(values.values()), **values}
+                    for name, values in sorted(metrics.items())
+                }
+                for kind, metrics in (
+                    ("counters", self._counters),
+                    ("gauges", self._gauges),
+                )
+            },
+            "histograms": {
+                name: {
+                    source: histogram.as_dict()
+                    for source, histogram in sorted(histograms.items())
+                }
+                for name, histograms in sorted(self._histograms.items())
+            },
+        }
+
+    def for_source(self, source: str) -> dict[str, Any]:
+        """Return every value of one source."""
+        return {
+            "counters": {
+                name: values[source]
+                for name, values in sorted(self._counters.items())
+                if source in values
+            },
+            "gauges": {
+                name: values[source]
+                for name, values in sorted(self._gauges.items())
+                if source in values
+            },
+            "histograms": {
+                name: histograms[source].as_dict()
+                for name, histograms in sorted(self._histograms.items())
+                if source in histograms
+            },
+        }
@@ -0,0 +1,289 @@
+"""Shared MQTT subscription hub for Tasmota IRHVAC entities."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import time
+
+from homeassistant.components import mqtt
+from homeassistant.core import HassJob, HomeAssistant, callback
+
+from .const import (
+    DATA_MQTT_HUB,
+    DATA_PROFILER,
+    DATA_TRAFFIC_RECORDER,
+    FLEET_WILDCARD_TOPICS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def fleet_wildcard_for(topic: str) -> str | None:
+    """Return the fleet wildcard covering a Tasmota topic, if any.
+
+    Tasmota publishes on `<prefix>/<device>/<suffix>`, so `tele/living/RESULT`
+    is covered by `tele/+/RESULT`.
+    """
+    parts = topic.split("/")
+    if len(parts) != 3 or not parts[1]:
+        return None
+    wildcard = f"{parts[0]}/+/{parts[2]}"
+    return wildcard if wildcard in FLEET_WILDCARD_TOPICS else None
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> IrhvacMqttHub:
+    """Return the domain-wide MQTT hub, creating it on first use."""
+    if (hub := hass.data.get(DATA_MQTT_HUB)) is None:
+        hub = hass.data[DATA_MQTT_HUB] = IrhvacMqttHub(hass)
+    return hub
+
+
+class IrhvacMqttHub:
+    """Own the broker subscriptions and route messages to entities.
+
+    Every exact topic is subscribed at most once no matter how many entities
+    listen on it. Entities in fleet mode are served by the three
+    FLEET_WILDCARD_TOPICS subscriptions instead, so the number of broker
+    subscriptions stays constant as the fleet grows.
+
+    Registration never blocks: entities register their routes from
+    `async_added_to_hass` and a single background task waits for the MQTT
+    client once and subscribes everything queued so far in one batch.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        # exact topic -> jobs of the entities listening on it
+        self._routes: dict[str, list[HassJob]] = {}
+        # exact topic or wildcard -> broker unsubscribe callable (None while pending)
+        self._subscriptions: dict[str, Callable[[], None] | None] = {}
+        # exact topics whose messages arrive through a fleet wildcard
+        self._fleet_routed: set[str] = set()
+        # topics waiting for the next subscribe batch
+        self._pending: dict[str, Callable] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._mqtt_ready = False
+        self._first_pending: float | None = None
+        # LWT topic -> last known availability
+        self._availability: dict[str, bool] = {}
+        # LWT topic -> availability listeners
+        self._availability_listeners: dict[str, list[Callable[[bool], None]]] = {}
+        # LWT topic -> unregister callable of the shared route
+        self._availability_routes: dict[str, Callable[[], None]] = {}
+
+    @property
+    def subscriptions(self) -> list[str]:
+        """Return the topics currently subscribed on the broker."""
+        return sorted(self._subscriptions)
+
+    @callback
+    def async_register(
+        self, topic: str, msg_callback: Callable, fleet: bool = False
+    ) -> Callable[[], None]:
+        """Route messages on `topic` to `msg_callback`.
+
+        Returns a callable that removes the route again.
+        """
+        job = HassJob(msg_callback, f"tasmota_irhvac {topic}")
+        routes = self._routes.setdefault(topic, [])
+        routes.append(job)
+
+        if topic not in self._subscriptions and topic not in self._fleet_routed:
+            wildcard = fleet_wildcard_for(topic) if fleet else None
+            if wildcard is not None:
+                self._fleet_routed.add(topic)
+                if wildcard not in self._subscriptions:
+                    self._async_queue_subscription(
+                        wildcard, self._async_fleet_message_received
+                    )
+            else:
+                self._async_queue_subscription(topic, self._async_message_received)
+
+        @callback
+        def async_unregister() -> None:
+            if job in routes:
+                routes.remove(job)
+                self._async_release(topic)
+
+        return async_unregister
+
+    @callback
+    def async_track_availability(
+        self,
+        topic: str,
+        availability_callback: Callable[[bool], None],
+        fleet: bool = False,
+    ) -> Callable[[], None]:
+        """Track the LWT availability of a blaster.
+
+        All entities sharing an LWT topic share one route. The callback is run
+        with the cached value straight away when one is known, and afterwards
+        only when the blaster goes Online or Offline.
+        """
+        listeners = self._availability_listeners.setdefault(topic, [])
+        listeners.append(availability_callback)
+
+        if topic not in self._availability_routes:
+
+            @callback
+            def lwt_message_received(msg: mqtt.ReceiveMessage) -> None:
+                self._async_availability_received(topic, msg.payload)
+
+            self._availability_routes[topic] = self.async_register(
+                topic, lwt_message_received, fleet
+            )
+
+        if (available := self._availability.get(topic)) is not None:
+            availability_callback(available)
+
+        @callback
+        def async_untrack() -> None:
+            if availability_callback in listeners:
+                listeners.remove(availability_callback)
+                self._async_release_availability(topic)
+
+        return async_untrack
+
+    @callback
+    def async_get_availability(self, topic: str) -> bool | None:
+        """Return the cached availability of an LWT topic, if known."""
+        return self._availability.get(topic)
+
+    @callback
+    def _async_availability_received(self, topic: str, payload: str) -> None:
+        """Update the cache and notify listeners on an LWT transition."""
+        _LOGGER.debug("%s: %s", topic, payload)
+        if payload not in ("Online", "Offline"):
+            return
+        available = payload == "Online"
+        if self._availability.get(topic) == available:
+            return
+        self._availability[topic] = available
+        for availability_callback in tuple(
+            self._availability_listeners.get(topic, ())
+        ):
+            try:
+                availability_callback(available)
+            except Exception as e:
+                _LOGGER.error("Error processing availability message: %s", str(e))
+
+    @callback
+    def _async_release_availability(self, topic: str) -> None:
+        """Drop the shared LWT route once its last listener is gone."""
+        if self._availability_listeners.get(topic):
+            return
+        self._availability_listeners.pop(topic, None)
+        self._availability.pop(topic, None)
+        if (unregister := self._availability_routes.pop(topic, None)) is not None:
+            unregister()
+
+    @callback
+    def _async_queue_subscription(self, topic: str, msg_callback: Callable) -> None:
+        """Queue a broker subscription for the next batch."""
+        # Reserve the slot first so later registrations share it
+        self._subscriptions[topic] = None
+        self._pending[topic] = msg_callback
+        if self._first_pending is None:
+            self._first_pending = time.monotonic()
+        if self._flush_task is None:
+            self._flush_task = self.hass.async_create_background_task(
+                self._async_flush_pending(), "tasmota_irhvac mqtt subscribe"
+            )
+
+    async def _async_flush_pending(self) -> None:
+        """Wait for the MQTT client once and subscribe queued topics in batches."""
+        try:
+            waited = 0.0
+            if not self._mqtt_ready:
+                wait_started = time.monotonic()
+                if not await mqtt.async_wait_for_mqtt_client(self.hass):
+                    _LOGGER.error(
+                        "MQTT integration is not available, cannot subscribe to topics"
+                    )
+                    return
+                self._mqtt_ready = True
+                waited = time.monotonic() - wait_started
+
+            while self._pending:
+                batch, self._pending = self._pending, {}
+                first_pending, self._first_pending = self._first_pending, None
+                subscribe_started = time.monotonic()
+                results = await asyncio.gather(
+                    *(
+                        mqtt.async_subscribe(self.hass, topic, msg_callback)
+                        for topic, msg_callback in batch.items()
+                    ),
+                    return_exceptions=True,
+                )
+                for topic, result in zip(batch, results):
+                    if isinstance(result, BaseException):
+                        _LOGGER.error(
+                            "Error subscribing to MQTT topic %s: %s", topic, str(result)
+                        )
+                        self._subscriptions.pop(topic, None)
+                    elif topic not in self._subscriptions:
+                        # Released while the subscription was in flight
+                        result()
+                    else:
+                        self._subscriptions[topic] = result
+
+                now = time.monotonic()
+                _LOGGER.debug(
+                    "Subscribed %s MQTT topics for %s routes: MQTT client wait "
+                    "%.3fs, subscribe %.3fs, %.3fs since first registration",
+                    len(batch),
+                    sum(len(routes) for routes in self._routes.values()),
+                    waited,
+                    now - subscribe_started,
+                    now - first_pending,
+                )
+                waited = 0.0
+        finally:
+            self._flush_task = None
+
+    @callback
+    def _async_release(self, topic: str) -> None:
+        """Drop broker subscriptions nobody listens to anymore."""
+        if self._routes.get(topic):
+            return
+        self._routes.pop(topic, None)
+
+        if topic in self._fleet_routed:
+            self._fleet_routed.discard(topic)
+            wildcard = fleet_wildcard_for(topic)
+            if any(fleet_wildcard_for(t) == wildcard for t in self._fleet_routed):
+                return
+            topic = wildcard
+
+        self._pending.pop(topic, None)
+        if (unsubscribe := self._subscriptions.pop(topic, None)) is not None:
+            _LOGGER.debug("Unsubscribing from %s", topic)
+            unsubscribe()
+
+    @callback
+    def _async_dispatch(self, msg: mqtt.ReceiveMessage) -> None:
+        """Hand a message to every entity routed on its topic."""
+        if (recorder := self.hass.data.get(DATA_TRAFFIC_RECORDER)) is not None:
+            recorder.async_record(msg)
+        jobs = tuple(self._routes.get(msg.topic, ()))
+        if (profiler := self.hass.data.get(DATA_PROFILER)) is None:
+            for job in jobs:
+                self.hass.async_run_hass_job(job, msg)
+            return
+        with profiler.measure("dispatch"):
+            for job in jobs:
+                self.hass.async_run_hass_job(job, msg)
+
+    @callback
+    def _async_message_received(self, msg: mqtt.ReceiveMessage) -> None:
+        """Handle a message from an exact topic subscription."""
+        self._async_dispatch(msg)
+
+    @callback
+    def _async_fleet_message_received(self, msg: mqtt.ReceiveMessage) -> None:
+        """Demultiplex a message from a fleet wildcard subscription."""
+        if msg.topic in self._fleet_routed:
+            self._async_dispatch(msg)
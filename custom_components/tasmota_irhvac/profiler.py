@@ -0,0 +1,148 @@
+"""On-demand profiling of the integration's hot paths.
+
+Imported lazily by the `tasmota_irhvac.profile` service. While no profile is
+running, the hot paths only look up DATA_PROFILER in hass.data and find
+nothing.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import ATTR_DURATION, ATTR_MESSAGES, DATA_PROFILER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stage counted against the message limit of a profile
+MESSAGE_STAGE = "ingest"
+
+
+class StageStats:
+    """Accumulated cost of one stage."""
+
+    __slots__ = ("calls", "wall", "cpu", "max_wall")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.max_wall = 0.0
+
+    def as_dict(self, stage: str) -> dict[str, Any]:
+        """Return the stats in milliseconds."""
+        return {
+            "stage": stage,
+            "calls": self.calls,
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "mean_wall_ms": round(self.wall * 1000 / self.calls, 4),
+            "max_wall_ms": round(self.max_wall * 1000, 3),
+        }
+
+
+class _Measurement:
+    """Time one call of a stage in a with block."""
+
+    __slots__ = ("_profiler", "_stage", "_started")
+
+    def __init__(self, profiler: IrhvacProfiler, stage: str) -> None:
+        self._profiler = profiler
+        self._stage = stage
+
+    def __enter__(self) -> None:
+        self._started = self._profiler.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._profiler.stop(self._stage, self._started)
+
+
+class IrhvacProfiler:
+    """Collect wall and CPU time per call of each stage.
+
+    Wall time of the async stages includes their awaits (mqtt_delay is not
+    part of any stage, the publish itself is). CPU time is the process time
+    spent meanwhile, which includes other work done by the event loop while
+    the stage was suspended.
+    """
+
+    def __init__(self, max_messages: int | None) -> None:
+        """Initialize the profiler."""
+        self.stats: dict[str, StageStats] = {}
+        self._max_messages = max_messages
+        self.finished = asyncio.Event()
+
+    @staticmethod
+    def start() -> tuple[float, float]:
+        """Return the wall and CPU clocks at the start of a call."""
+        return time.perf_counter(), time.process_time()
+
+    def stop(self, stage: str, started: tuple[float, float]) -> None:
+        """Add one call of a stage that began at start()."""
+        self.record(
+            stage,
+            time.perf_counter() - started[0],
+            time.process_time() - started[1],
+        )
+
+    def measure(self, stage: str) -> _Measurement:
+        """Return a context manager timing one call of a stage."""
+        return _Measurement(self, stage)
+
+    def record(self, stage: str, wall: float, cpu: float) -> None:
+        """Add one call of a stage."""
+        if (stats := self.stats.get(stage)) is None:
+            stats = self.stats[stage] = StageStats()
+        stats.calls += 1
+        stats.wall += wall
+        stats.cpu += cpu
+        if wall > stats.max_wall:
+            stats.max_wall = wall
+        if (
+            stage == MESSAGE_STAGE
+            and self._max_messages is not None
+            and stats.calls >= self._max_messages
+        ):
+            self.finished.set()
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Return the stages ranked by cumulative wall time."""
+        return [
+            stats.as_dict(stage)
+            for stage, stats in sorted(
+                self.stats.items(), key=lambda item: item[1].wall, reverse=True
+            )
+        ]
+
+
+async def async_profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Profile the hot paths for a while and return the ranked summary."""
+    if hass.data.get(DATA_PROFILER) is not None:
+        raise HomeAssistantError("A profile is already running")
+
+    duration = call.data[ATTR_DURATION]
+    max_messages = call.data.get(ATTR_MESSAGES)
+    profiler = hass.data[DATA_PROFILER] = IrhvacProfiler(max_messages)
+    started = time.monotonic()
+    _LOGGER.info(
+        "Profiling for %ss%s",
+        duration,
+        f" or {max_messages} messages" if max_messages else "",
+    )
+    try:
+        async with asyncio.timeout(duration):
+            await profiler.finished.wait()
+    except TimeoutError:
+        pass
+    finally:
+        hass.data.pop(DATA_PROFILER, None)
+
+    return {
+        "duration_s": round(time.monotonic() - started, 3),
+        "stages": profiler.summary(),
+    }
@@ -0,0 +1,123 @@
+"""Diagnostic sensors of Tasmota IRHVAC entities and their blasters."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .climate import entity_unique_id, entry_config
+from .const import CONF_COMMAND_TOPIC, DOMAIN
+from .metrics import IrhvacMetrics, async_get_metrics
+
+# Metrics are read on a timer rather than pushed from the hot paths
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class IrhvacSensorEntityDescription(SensorEntityDescription):
+    """Describe a sensor reading one metric."""
+
+    # Read the gauge instead of the counter of the metric
+    gauge: bool = False
+    # Read the metric of the blaster instead of the entity
+    blaster: bool = False
+
+
+def _counter(key: str, name: str) -> IrhvacSensorEntityDescription:
+    """Describe an entity counter."""
+    return IrhvacSensorEntityDescription(
+        key=key, name=name, state_class=SensorStateClass.TOTAL_INCREASING
+    )
+
+
+SENSOR_DESCRIPTIONS: tuple[IrhvacSensorEntityDescription, ...] = (
+    _counter("frames_received", "Frames received"),
+    _counter("frames_wrong_vendor", "Frames from another vendor"),
+    _counter("decode_errors", "Decode errors"),
+    _counter("state_writes", "State writes"),
+    _counter("writes_suppressed", "State writes suppressed"),
+    _counter("commands_sent", "Commands sent"),
+    _counter("commands_collapsed", "Commands collapsed"),
+    _counter("commands_retried", "Commands retried"),
+    IrhvacSensorEntityDescription(
+        key="last_ack_latency",
+        name="Last ack latency",
+        gauge=True,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    IrhvacSensorEntityDescription(
+        key="queue_depth",
+        name="Blaster queue depth",
+        gauge=True,
+        blaster=True,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    IrhvacSensorEntityDescription(
+        key="outbox_depth",
+        name="Blaster outbox depth",
+        gauge=True,
+        blaster=True,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the diagnostic sensors of a config entry."""
+    config = entry_config(config_entry)
+    unique_id = entity_unique_id(config)
+    metrics = async_get_metrics(hass)
+    async_add_entities(
+        IrhvacMetricSensor(
+            metrics,
+            description,
+            unique_id,
+            config[CONF_COMMAND_TOPIC] if description.blaster else unique_id,
+        )
+        for description in SENSOR_DESCRIPTIONS
+    )
+
+
+class IrhvacMetricSensor(SensorEntity):
+    """Expose one metric of an AC or its blaster."""
+
+    entity_description: IrhvacSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        metrics: IrhvacMetrics,
+        description: IrhvacSensorEntityDescription,
+        device_unique_id: str,
+        source: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._metrics = metrics
+        self._source = source
+        self._attr_unique_id = f"{device_unique_id}_{description.key}"
+        self._attr_device_info = {"identifiers": {(DOMAIN, device_unique_id)}}
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value of the metric."""
+        if self.entity_description.gauge:
+            return self._metrics.gauge(self.entity_description.key, self._source)
+        return self._metrics.counter(self.entity_description.key, self._source)
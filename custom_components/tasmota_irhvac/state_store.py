@@ -0,0 +1,62 @@
+"""Persistent AC state snapshots for Tasmota IRHVAC entities."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import STATE_STORE_KEY, STATE_STORE_SAVE_DELAY, STATE_STORE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrhvacStateStore:
+    """Hold one compact snapshot of the full AC state per entity.
+
+    The whole fleet is loaded with a single read at setup. Writes are
+    coalesced through `Store.async_delay_save`, so a burst of state changes
+    across many entities results in one write to disk.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STATE_STORE_VERSION, STATE_STORE_KEY
+        )
+        self._snapshots: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshots of all entities."""
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.error("Error loading stored AC states: %s", str(e))
+            data = None
+        self._snapshots = data or {}
+        _LOGGER.debug("Loaded stored state for %s ACs", len(self._snapshots))
+
+    @callback
+    def async_get(self, unique_id: str) -> dict[str, Any] | None:
+        """Return the stored snapshot of an entity."""
+        return self._snapshots.get(unique_id)
+
+    @callback
+    def async_set(self, unique_id: str, snapshot: dict[str, Any]) -> None:
+        """Update the snapshot of an entity and schedule a coalesced save."""
+        if self._snapshots.get(unique_id) == snapshot:
+            return
+        self._snapshots[unique_id] = snapshot
+        self._store.async_delay_save(self._data_to_save, STATE_STORE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, unique_id: str) -> None:
+        """Forget the snapshot of an entity."""
+        if self._snapshots.pop(unique_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STATE_STORE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to write to disk."""
+        return self._snapshots
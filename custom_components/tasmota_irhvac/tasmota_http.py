@@ -0,0 +1,178 @@
+"""HTTP probing of Tasmota IR blasters.
+
+Imported lazily by config_flow.py when a flow actually probes a device.
+"""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import re
+from typing import Any
+
+import aiohttp
+from aiohttp import BasicAuth
+import async_timeout
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DEFAULT_IR_PROTOCOLS, MAX_SCAN_HOSTS
+from .device_cache import async_get_device_cache, firmware_version
+
+_LOGGER = logging.getLogger(__name__)
+
+# Separate budgets: Status 0 is required, the vendor list has a fallback
+STATUS_TIMEOUT = 10
+VENDOR_TIMEOUT = 5
+
+
+def parse_vendor_list(ir_response: dict[str, Any]) -> list[str]:
+    """Extract the IR protocols from Tasmota's `Wrong Vendor (...)` error."""
+    error_msg = ir_response.get("IRHVAC")
+    if isinstance(error_msg, str) and "Wrong Vendor (" in error_msg:
+        return error_msg.split("(")[1].rstrip(")").split("|")
+    return []
+
+
+def expand_hosts(text: str, limit: int = MAX_SCAN_HOSTS) -> list[str]:
+    """Expand a CIDR range or a list of hosts into single hosts.
+
+    Entries may be separated by commas, spaces or new lines and mix CIDR
+    ranges (`192.168.1.0/24`), addresses and hostnames. Raises ValueError on
+    an invalid range or when more than `limit` hosts would be probed.
+    """
+    hosts: list[str] = []
+    for token in re.split(r"[\s,;]+", text.strip()):
+        if not token:
+            continue
+        if "/" in token:
+            network = ipaddress.ip_network(token, strict=False)
+            if network.num_addresses > limit + 2:
+                raise ValueError(f"{token} has more than {limit} hosts")
+            candidates = [str(ip) for ip in network.hosts()] or [str(network.network_address)]
+        else:
+            candidates = [token]
+        for host in candidates:
+            if host not in hosts:
+                hosts.append(host)
+        if len(hosts) > limit:
+            raise ValueError(f"More than {limit} hosts")
+    return hosts
+
+
+async def _async_command(
+    session: aiohttp.ClientSession,
+    host: str,
+    command: str,
+    auth: BasicAuth | None,
+    timeout: float,
+) -> dict[str, Any] | None:
+    """Run one command through the Tasmota web API."""
+    async with async_timeout.timeout(timeout):
+        async with session.get(
+            f"http://{host}/cm", params={"cmnd": command}, auth=auth
+        ) as response:
+            if response.status != 200:
+                _LOGGER.debug(
+                    "Tasmota command %s on %s failed: %s", command, host, response.status
+                )
+                return None
+            return await response.json(content_type=None)
+
+
+async def async_get_tasmota_info(
+    hass: HomeAssistant,
+    host: str,
+    auth: tuple | None = None,
+    refresh: bool = False,
+    quiet: bool = False,
+) -> dict[str, Any] | None:
+    """Get Tasmota device status and the IR protocols it supports.
+
+    Unless `refresh` is set, only the firmware version is read first (Status 2),
+    and a fresh cached vendor list for that version is returned. Otherwise both
+    requests go out at the same time over Home Assistant's shared client
+    session, so nothing is left open when a flow is abandoned.
+
+    `ir["Reported"]` tells whether the vendor list came from the device
+    rather than the default list. `quiet` logs unreachable hosts at debug
+    level, for network scans.
+    """
+    cache = await async_get_device_cache(hass)
+    session = async_get_clientsession(hass)
+    # Convert auth tuple to BasicAuth if provided
+    auth_obj = BasicAuth(auth[0], auth[1]) if auth else None
+
+    if refresh:
+        cache.async_invalidate(host)
+    else:
+        try:
+            firmware = await _async_command(
+                session, host, "Status 2", auth_obj, STATUS_TIMEOUT
+            )
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            _LOGGER.log(
+                logging.DEBUG if quiet else logging.ERROR,
+                "Error connecting to Tasmota device: %s",
+                str(e),
+            )
+            return None
+        if isinstance(firmware, dict) and (
+            cached := cache.async_get(host, firmware_version(firmware))
+        ) is not None and cached["protocols"]:
+            _LOGGER.debug(
+                "Using cached device info of %s (firmware %s)", host, cached["version"]
+            )
+            return {
+                "status": cached["status"],
+                "ir": {"Protocols": list(cached["protocols"]), "Reported": True},
+                "hostname": host,
+            }
+
+    status, ir_response = await asyncio.gather(
+        _async_command(session, host, "Status 0", auth_obj, STATUS_TIMEOUT),
+        # Get IR protocols by triggering the error message
+        _async_command(session, host, 'IRhvac {"Vendor":""}', auth_obj, VENDOR_TIMEOUT),
+        return_exceptions=True,
+    )
+
+    if isinstance(status, (asyncio.TimeoutError, aiohttp.ClientError)):
+        _LOGGER.log(
+            logging.DEBUG if quiet else logging.ERROR,
+            "Error connecting to Tasmota device: %s",
+            str(status),
+        )
+        return None
+    if isinstance(status, Exception):
+        _LOGGER.error("Unexpected error: %s", str(status))
+        return None
+    if status is None:
+        _LOGGER.log(
+            logging.DEBUG if quiet else logging.ERROR,
+            "Failed to get device status from %s",
+            host,
+        )
+        return None
+
+    ir_info = {"Protocols": [], "Reported": False}
+    if isinstance(ir_response, dict):
+        ir_info["Protocols"] = parse_vendor_list(ir_response)
+        _LOGGER.debug("Found IR protocols: %s", ir_info["Protocols"])
+        if ir_info["Protocols"]:
+            ir_info["Reported"] = True
+            # Only cache what the device actually reported
+            cache.async_set(host, status, ir_info["Protocols"])
+    elif isinstance(ir_response, Exception):
+        _LOGGER.debug("Error getting IR protocols from %s: %s", host, str(ir_response))
+
+    # If no protocols found, use defaults
+    if not ir_info["Protocols"]:
+        ir_info["Protocols"] = list(DEFAULT_IR_PROTOCOLS)
+        _LOGGER.debug("Using default IR protocols")
+
+    return {
+        "status": status,
+        "ir": ir_info,
+        "hostname": host,
+    }
@@ -0,0 +1,117 @@
+"""MQTT discovery of Tasmota IR blasters.
+
+Imported lazily by config_flow.py when Tasmota's discovery message starts a
+flow. Nothing here talks HTTP: the device details come from the retained
+`tasmota/discovery/<mac>/config` message, and IRHVAC support is confirmed
+with the vendor-list command over MQTT.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads
+
+from .const import CONF_AVAILABILITY_TOPIC, CONF_COMMAND_TOPIC, CONF_STATE_TOPIC
+from .tasmota_http import VENDOR_TIMEOUT, parse_vendor_list
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FULL_TOPIC = "%prefix%/%topic%/"
+DEFAULT_PREFIXES = ["cmnd", "stat", "tele"]
+
+
+def tasmota_topic(device: dict[str, Any], prefix_index: int, suffix: str) -> str:
+    """Expand the device's FullTopic for one prefix, like Tasmota does."""
+    prefixes = device.get("tp") or DEFAULT_PREFIXES
+    mac = str(device.get("mac", "")).replace(":", "").upper()
+    topic = (
+        str(device.get("ft") or DEFAULT_FULL_TOPIC)
+        .replace("%prefix%", prefixes[prefix_index])
+        .replace("%topic%", str(device["t"]))
+        .replace("%hostname%", str(device.get("hn", "")))
+        .replace("%id%", mac[-6:])
+    )
+    if not topic.endswith("/"):
+        topic += "/"
+    return f"{topic}{suffix}"
+
+
+def parse_discovery(payload: str | bytes) -> dict[str, Any] | None:
+    """Return what the config flow needs from a Tasmota discovery message."""
+    try:
+        device = json_loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(device, dict) or not device.get("t") or not device.get("ip"):
+        return None
+
+    friendly_names = [name for name in device.get("fn") or [] if name]
+    name = friendly_names[0] if friendly_names else device.get("dn") or device["t"]
+    return {
+        "host": device["ip"],
+        "name": name,
+        # Same shape as the Status 0 summary of a probed device
+        "status": {
+            "Status": {
+                "DeviceName": device.get("dn"),
+                "FriendlyName": [name],
+                "Topic": device["t"],
+            },
+            "StatusFWR": {"Version": str(device.get("sw", "unknown"))},
+            "StatusNET": {
+                "Hostname": device.get("hn"),
+                "IPAddress": device["ip"],
+                "Mac": device.get("mac"),
+            },
+        },
+        "topics": {
+            CONF_COMMAND_TOPIC: tasmota_topic(device, 0, "irhvac"),
+            CONF_STATE_TOPIC: tasmota_topic(device, 2, "RESULT"),
+            CONF_AVAILABILITY_TOPIC: tasmota_topic(device, 2, "LWT"),
+        },
+        "result_topic": tasmota_topic(device, 1, "RESULT"),
+    }
+
+
+async def async_probe_vendor_list(
+    hass: HomeAssistant,
+    command_topic: str,
+    result_topic: str,
+    timeout: float = VENDOR_TIMEOUT,
+) -> list[str] | None:
+    """Ask a blaster for its IR vendor list over MQTT.
+
+    Returns the vendor list, an empty list when the firmware has no IRHVAC
+    support, or None when the device did not answer.
+    """
+    answer: asyncio.Future[list[str]] = hass.loop.create_future()
+
+    @callback
+    def message_received(msg: mqtt.ReceiveMessage) -> None:
+        if answer.done():
+            return
+        try:
+            payload = json_loads(msg.payload)
+        except ValueError:
+            return
+        if not isinstance(payload, dict):
+            return
+        if "IRHVAC" in payload:
+            answer.set_result(parse_vendor_list(payload))
+        elif payload.get("Command") == "Unknown":
+            answer.set_result([])
+
+    unsubscribe = await mqtt.async_subscribe(hass, result_topic, message_received)
+    try:
+        await mqtt.async_publish(hass, command_topic, '{"Vendor":""}')
+        async with asyncio.timeout(timeout):
+            return await answer
+    except TimeoutError:
+        _LOGGER.debug("No answer to the vendor list probe on %s", command_topic)
+        return None
+    finally:
+        unsubscribe()
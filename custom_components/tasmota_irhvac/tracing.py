@@ -0,0 +1,107 @@
+"""Trace ids following a command from the service call to the state echo."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.util.ulid import ulid_now
+
+from .const import DATA_TRACES, TRACE_SAMPLES
+
+# Seconds a service call context is considered the origin of a command,
+# matching the time Home Assistant keeps it on the entity
+CONTEXT_MAX_AGE = 5.0
+
+
+@callback
+def async_get_traces(hass: HomeAssistant) -> IrhvacTraces:
+    """Return the domain-wide trace store, creating it on first use."""
+    if (traces := hass.data.get(DATA_TRACES)) is None:
+        traces = hass.data[DATA_TRACES] = IrhvacTraces()
+    return traces
+
+
+@dataclass(slots=True)
+class CommandTrace:
+    """Timestamps of the stages one command went through."""
+
+    trace_id: str
+    entity_id: str
+    # time.monotonic() of the service call, or of send_ir without one
+    started: float
+    # (stage, milliseconds since started), in the order they happened
+    stages: list[tuple[str, float]] = field(default_factory=list)
+
+    def mark(self, stage: str) -> None:
+        """Record that the command reached a stage."""
+        self.stages.append((stage, round((time.monotonic() - self.started) * 1000, 1)))
+
+    def reached(self, stage: str) -> bool:
+        """Return whether the command reached a stage."""
+        return any(name == stage for name, _ in self.stages)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace with the time spent before each stage."""
+        stages = []
+        previous = 0.0
+        for stage, at_ms in self.stages:
+            stages.append(
+                {"stage": stage, "at_ms": at_ms, "delta_ms": round(at_ms - previous, 1)}
+            )
+            previous = at_ms
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": previous,
+            "stages": stages,
+        }
+
+
+class IrhvacTraces:
+    """Keep the last TRACE_SAMPLES command traces of each entity."""
+
+    def __init__(self) -> None:
+        """Initialize the store."""
+        self._traces: dict[str, deque[CommandTrace]] = {}
+
+    @callback
+    def async_start(
+        self,
+        entity_id: str,
+        context: Context | None = None,
+        context_set: float | None = None,
+    ) -> CommandTrace:
+        """Start the trace of a command.
+
+        A command issued by a recent service call takes over the call's
+        context id and starts at the call. Other commands (automations acting
+        on sensors, restored state) get a fresh id and start now.
+        """
+        now = time.monotonic()
+        if (
+            context is not None
+            and context_set is not None
+            and now - context_set < CONTEXT_MAX_AGE
+        ):
+            trace = CommandTrace(context.id, entity_id, context_set, [("service", 0.0)])
+        else:
+            trace = CommandTrace(ulid_now(), entity_id, now)
+        self._traces.setdefault(
+            entity_id, deque(maxlen=TRACE_SAMPLES)
+        ).append(trace)
+        return trace
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Forget the traces of a removed entity."""
+        self._traces.pop(entity_id, None)
+
+    def as_dict(self, entity_ids: list[str] | None = None) -> dict[str, Any]:
+        """Return the traces of some or all entities, newest first."""
+        return {
+            entity_id: [trace.as_dict() for trace in reversed(traces)]
+            for entity_id, traces in sorted(self._traces.items())
+            if entity_ids is None or entity_id in entity_ids
+        }
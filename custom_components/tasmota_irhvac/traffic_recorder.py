@@ -0,0 +1,188 @@
+"""Record the MQTT traffic of the integration to a JSON-lines file.
+
+Imported lazily by the `tasmota_irhvac.record_traffic` service. The MQTT hub
+hands every message it dispatches (state frames, stat RESULT acks and LWT) to
+the recorder while one runs. The file starts with a header object, followed by
+one `[seconds, topic, payload]` array per message, with a trailing 1 for
+retained messages. Files are only written to TRAFFIC_DIRECTORY in the config
+directory. test_configs/replay_traffic.py replays them.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from homeassistant.components import mqtt
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, ServiceCall, ServiceResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_DURATION,
+    ATTR_FILENAME,
+    DATA_TRAFFIC_RECORDER,
+    TRAFFIC_DIRECTORY,
+    TRAFFIC_FLUSH_INTERVAL,
+    TRAFFIC_RECORDING_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrhvacTrafficRecorder:
+    """Buffer dispatched messages and append them to a file periodically."""
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.path = path
+        self.messages = 0
+        self._started = time.monotonic()
+        self._lines = [
+            json.dumps(
+                {
+                    "version": TRAFFIC_RECORDING_VERSION,
+                    "started": dt_util.utcnow().isoformat(),
+                },
+                separators=(",", ":"),
+            )
+        ]
+        self._unsubscribes: list = []
+        self._cancel_shutdown = None
+        # Keeps the executor writes in order
+        self._write_lock = asyncio.Lock()
+
+    @callback
+    def async_start(self, duration: float) -> None:
+        """Flush periodically and stop after `duration` seconds."""
+        self._unsubscribes = [
+            async_track_time_interval(
+                self.hass,
+                self._async_flush,
+                timedelta(seconds=TRAFFIC_FLUSH_INTERVAL),
+                cancel_on_shutdown=True,
+            ),
+            async_call_later(self.hass, duration, self._async_expired),
+        ]
+        self._cancel_shutdown = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_shutdown
+        )
+
+    @callback
+    def async_record(self, msg: mqtt.ReceiveMessage) -> None:
+        """Buffer one message."""
+        payload = msg.payload
+        if isinstance(payload, bytes):
+            payload = payload.decode(errors="replace")
+        line = [round(time.monotonic() - self._started, 3), msg.topic, payload]
+        if msg.retain:
+            line.append(1)
+        self._lines.append(json.dumps(line, separators=(",", ":")))
+        self.messages += 1
+
+    async def _async_flush(self, *_: Any) -> None:
+        """Append the buffered lines to the file."""
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        async with self._write_lock:
+            try:
+                await self.hass.async_add_executor_job(self._write, lines)
+            except OSError as e:
+                _LOGGER.error("Error writing MQTT traffic recording: %s", str(e))
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the file, in the executor."""
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    async def _async_shutdown(self, event: Event) -> None:
+        """Write what is left when Home Assistant stops."""
+        self._cancel_shutdown = None
+        await self._async_expired()
+
+    async def _async_expired(self, *_: Any) -> None:
+        """Stop at the end of the duration or at shutdown."""
+        if self.hass.data.get(DATA_TRAFFIC_RECORDER) is self:
+            del self.hass.data[DATA_TRAFFIC_RECORDER]
+            await self.async_stop()
+
+    async def async_stop(self) -> dict[str, Any]:
+        """Stop recording and write what is left."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes = []
+        if self._cancel_shutdown is not None:
+            self._cancel_shutdown()
+            self._cancel_shutdown = None
+        await self._async_flush()
+        summary = {
+            "path": self.path,
+            "messages": self.messages,
+            "duration_s": round(time.monotonic() - self._started, 1),
+        }
+        _LOGGER.info("Recorded %s MQTT messages to %s", self.messages, self.path)
+        return summary
+
+
+async def async_record_traffic(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Start recording the traffic of the integration to a file."""
+    if hass.data.get(DATA_TRAFFIC_RECORDER) is not None:
+        raise HomeAssistantError("A traffic recording is already running")
+
+    path = hass.config.path(TRAFFIC_DIRECTORY, call.data[ATTR_FILENAME])
+    # Start from an empty file, but only replace an earlier recording
+    if not await hass.async_add_executor_job(_create, path):
+        raise HomeAssistantError(
+            f"{path} exists and is not a traffic recording, choose another filename"
+        )
+    recorder = hass.data[DATA_TRAFFIC_RECORDER] = IrhvacTrafficRecorder(hass, path)
+    recorder.async_start(call.data[ATTR_DURATION])
+    _LOGGER.info(
+        "Recording MQTT traffic to %s for %ss", path, call.data[ATTR_DURATION]
+    )
+    return {"path": path}
+
+
+async def async_stop_recording(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Stop the running traffic recording and return what it recorded."""
+    if (recorder := hass.data.pop(DATA_TRAFFIC_RECORDER, None)) is None:
+        raise HomeAssistantError("No traffic recording is running")
+    return await recorder.async_stop()
+
+
+def _create(path: str) -> bool:
+    """Create an empty file, in the executor.
+
+    Returns False, leaving the file untouched, when it exists and is not a
+    recording.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        with open(path, "x", encoding="utf-8"):
+            return True
+    except FileExistsError:
+        pass
+    if not _is_recording(path):
+        return False
+    with open(path, "w", encoding="utf-8"):
+        return True
+
+
+def _is_recording(path: str) -> bool:
+    """Return whether a file is empty or starts with the header of a recording."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            if not (line := file.readline()):
+                return True
+            header = json.loads(line)
+    except (OSError, UnicodeDecodeError, ValueError):
+        return False
+    return isinstance(header, dict) and "version" in header and "started" in header
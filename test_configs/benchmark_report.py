@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Tasmota IRHVAC benchmark scripts.
+Benchmark results are stored in test_report.json under "benchmarks", next to
+the results written by run_all_tests.py. Benchmarks may also keep a summary
+section in tasmota_irhvac_test_report.md.
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+REPORT_PATH = os.path.join(os.path.dirname(__file__), "test_report.json")
+MARKDOWN_PATH = os.path.join(os.path.dirname(__file__), "tasmota_irhvac_test_report.md")
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def ensure_repo_on_path():
+    """Make custom_components importable when run from test_configs."""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+
+def load_report():
+    """Load test_report.json, or return an empty report."""
+    try:
+        with open(REPORT_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_benchmark(name, result):
+    """Store the result of one benchmark in test_report.json."""
+    report = load_report()
+    result = {"run_at": datetime.now().isoformat(), **result}
+    report.setdefault("benchmarks", {})[name] = result
+    with open(REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+    _LOGGER.info("Benchmark %s saved to %s", name, REPORT_PATH)
+    return result
+
+
+def save_markdown(name, markdown):
+    """Replace the section of one benchmark in tasmota_irhvac_test_report.md.
+
+    Sections are delimited by HTML comments so a run only rewrites its own
+    section. New sections go before the recommendations.
+    """
+    begin = f"<!-- benchmark:{name} -->"
+    end = f"<!-- /benchmark:{name} -->"
+    section = f"{begin}\n{markdown.strip()}\n{end}\n"
+    with open(MARKDOWN_PATH) as f:
+        report = f.read()
+    if begin in report and end in report:
+        before, rest = report.split(begin, 1)
+        after = rest.split(end, 1)[1].lstrip("\n")
+        report = f"{before}{section}\n{after}"
+    else:
+        anchor = "## Recommendations for Improvement"
+        if anchor in report:
+            before, after = report.split(anchor, 1)
+            report = f"{before}{section}\n{anchor}{after}"
+        else:
+            report = f"{report.rstrip()}\n\n{section}"
+    with open(MARKDOWN_PATH, "w") as f:
+        f.write(report)
+    _LOGGER.info("Benchmark %s summarized in %s", name, MARKDOWN_PATH)
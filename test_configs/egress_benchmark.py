@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Egress benchmark for the Tasmota IRHVAC integration.
+Times the outbound path of the real TasmotaIrhvac entity with a stubbed
+mqtt.async_publish: send_ir end to end, and separately the fan mapping
+(unprettify and quirks), swing resolution, payload build and JSON encoding.
+Each is measured for single commands and for scenes switching many ACs at
+once. Results go to test_report.json and tasmota_irhvac_test_report.md.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from benchmark_report import ensure_repo_on_path, save_benchmark, save_markdown
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_LOGGER = logging.getLogger(__name__)
+
+VENDORS = ["SAMSUNG_AC", "DAIKIN", "MITSUBISHI_AC", "GREE", "ELECTRA_AC", "MIDEA"]
+
+# Entity variants, cycled: the default fan list triggers both fan quirks, the
+# plain one none; the second swing list resolves both axes
+VARIANTS = [
+    {},
+    {
+        "supported_fan_speeds": ["auto", "low", "medium", "high"],
+        "supported_swing_list": ["off", "vertical", "horizontal", "both"],
+    },
+]
+
+# Commands of a scene, applied to every AC before send_ir
+SCENE_STATES = [
+    {"hvac_mode": "cool", "temp": 22, "fan": 0, "swing": "vertical"},
+    {"hvac_mode": "heat", "temp": 25, "fan": -1, "swing": "off"},
+]
+
+
+async def create_entities(hass, count):
+    """Create `count` real climate entities, each with its own blaster."""
+    from custom_components.tasmota_irhvac import climate
+    from custom_components.tasmota_irhvac.blaster import async_get_blaster
+
+    entities = []
+    for index in range(count):
+        vendor = VENDORS[index % len(VENDORS)]
+        config = climate.PLATFORM_SCHEMA(
+            {
+                "platform": "tasmota_irhvac",
+                "name": f"Bench {index}",
+                "vendor": vendor,
+                "command_topic": f"cmnd/ac{index}/irhvac",
+                "state_topic": f"tele/ac{index}/RESULT",
+                "mqtt_delay": 0,
+                **VARIANTS[index % len(VARIANTS)],
+            }
+        )
+        entity = climate.TasmotaIrhvac(hass, vendor, config)
+        entity.hass = hass
+        entity.entity_id = f"climate.bench_{index}"
+        entity._blaster = async_get_blaster(hass, entity.topic)
+        entities.append(entity)
+    return entities
+
+
+def apply_scene(entities, scene):
+    """Set the state a scene would set, without sending anything."""
+    for entity in entities:
+        entity._attr_hvac_mode = scene["hvac_mode"]
+        entity.power_mode = "on"
+        entity._attr_target_temperature = scene["temp"]
+        entity._attr_fan_mode = entity.fan_modes[scene["fan"]]
+        if scene["swing"] in (entity.swing_modes or []):
+            entity._attr_swing_mode = scene["swing"]
+
+
+def time_stages(entities, rounds):
+    """Time each stage of the payload build over all entities, `rounds` times.
+
+    Returns microseconds per call of each stage.
+    """
+    stages = {
+        "fan_mapping": lambda entity: entity._command_fan_speed(),
+        "swing_resolution": lambda entity: entity._resolve_swing(),
+        "payload_build": lambda entity: entity._command_payload(
+            entity._attr_fan_mode
+        ),
+    }
+    results = {}
+    for name, stage in stages.items():
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for entity in entities:
+                stage(entity)
+        results[name] = (time.perf_counter() - started) / (rounds * len(entities))
+
+    payloads = [
+        entity._command_payload(entity._command_fan_speed()) for entity in entities
+    ]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            json.dumps(payload)
+    results["json_encode"] = (time.perf_counter() - started) / (rounds * len(entities))
+    return {name: round(seconds * 1e6, 3) for name, seconds in results.items()}
+
+
+class PublishStub:
+    """Stand-in for mqtt.async_publish recording when each topic was published."""
+
+    def __init__(self):
+        self.published = {}
+        self.expected = 0
+        self.done = asyncio.Event()
+
+    async def __call__(self, hass, topic, payload, *args, **kwargs):
+        self.published[topic] = time.perf_counter()
+        if len(self.published) >= self.expected:
+            self.done.set()
+
+    def expect(self, count):
+        """Wait for the next `count` publishes."""
+        self.published = {}
+        self.expected = count
+        self.done.clear()
+
+
+async def time_send_ir_single(entities, stub):
+    """Time send_ir to publish for one command at a time."""
+    latencies = []
+    for entity in entities:
+        stub.expect(1)
+        started = time.perf_counter()
+        await entity.send_ir()
+        await asyncio.wait_for(stub.done.wait(), 30)
+        latencies.append(stub.published[entity.topic] - started)
+    latencies.sort()
+    return {
+        "commands": len(latencies),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+    }
+
+
+async def time_send_ir(entities, stub, scenes):
+    """Time send_ir to publish for each entity of each scene.
+
+    Every scene switches all entities at once. Between scenes the benchmark
+    waits out the blaster frame spacing, so no frame is held back by it.
+    """
+    from custom_components.tasmota_irhvac.const import BLASTER_FRAME_SPACING
+
+    latencies = []
+    scene_seconds = []
+    for scene in scenes:
+        apply_scene(entities, scene)
+        stub.expect(len(entities))
+        started = {}
+        scene_started = time.perf_counter()
+        for entity in entities:
+            started[entity.topic] = time.perf_counter()
+            await entity.send_ir()
+        await asyncio.wait_for(stub.done.wait(), 30)
+        scene_seconds.append(time.perf_counter() - scene_started)
+        latencies.extend(
+            stub.published[topic] - at for topic, at in started.items()
+        )
+        await asyncio.sleep(BLASTER_FRAME_SPACING)
+    latencies.sort()
+    return {
+        "commands": len(latencies),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+        "scene_ms": round(statistics.median(scene_seconds) * 1000, 2),
+        "commands_per_s": round(len(entities) / statistics.median(scene_seconds)),
+    }
+
+
+async def benchmark(scene_size, rounds, single_commands):
+    """Run the stage timings and send_ir for single commands and a scene."""
+    from homeassistant.core import HomeAssistant
+    from custom_components.tasmota_irhvac import blaster
+
+    stub = PublishStub()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # Normally set when Home Assistant starts its event loop
+        hass.loop_thread_id = threading.get_ident()
+        try:
+            with patch.object(blaster.mqtt, "async_publish", stub):
+                entities = await create_entities(hass, max(scene_size, single_commands))
+                apply_scene(entities, SCENE_STATES[0])
+
+                single = {
+                    "stages_us": time_stages(entities[:1], rounds),
+                    # One command at a time, each through a blaster not used before
+                    "send_ir": await time_send_ir_single(
+                        entities[:single_commands], stub
+                    ),
+                }
+                scene = entities[:scene_size]
+                scene_result = {
+                    "entities": scene_size,
+                    "stages_us": time_stages(scene, max(1, rounds // scene_size)),
+                    "send_ir": await time_send_ir(scene, stub, SCENE_STATES * 3),
+                }
+        finally:
+            await hass.async_stop(force=True)
+    return {"single": single, "scene": scene_result}
+
+
+def to_markdown(result):
+    """Summarize a run as a section of the test report."""
+    single = result["single"]
+    scene = result["scene"]
+    lines = [
+        "## Egress Benchmark",
+        "",
+        f"Run with Python {result['python']} on {result['run_at'][:10]} "
+        "(`test_configs/egress_benchmark.py`).",
+        "",
+        "| Stage | Single command (us) | "
+        f"{scene['entities']}-AC scene (us per AC) |",
+        "| --- | --- | --- |",
+    ]
+    for stage in single["stages_us"]:
+        lines.append(
+            f"| {stage} | {single['stages_us'][stage]} | {scene['stages_us'][stage]} |"
+        )
+    lines.extend(
+        [
+            f"| send_ir to publish, p50 | {single['send_ir']['p50_us']} | "
+            f"{scene['send_ir']['p50_us']} |",
+            f"| send_ir to publish, p99 | {single['send_ir']['p99_us']} | "
+            f"{scene['send_ir']['p99_us']} |",
+            "",
+            f"A {scene['entities']}-AC scene is published in "
+            f"{scene['send_ir']['scene_ms']} ms "
+            f"({scene['send_ir']['commands_per_s']} commands/s).",
+            "",
+            f"**Status: {result['status']}**",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scene-size", type=int, default=500, help="ACs switched by one scene")
+    parser.add_argument(
+        "--rounds", type=int, default=20000, help="calls per stage for a single command"
+    )
+    parser.add_argument(
+        "--single-commands", type=int, default=200, help="single send_ir calls timed"
+    )
+    parser.add_argument(
+        "--max-scene-ms",
+        type=float,
+        default=None,
+        help="fail when a scene takes longer to publish",
+    )
+    args = parser.parse_args()
+
+    ensure_repo_on_path()
+    # Entities are not added through a platform; keep Home Assistant quiet about it
+    logging.getLogger("homeassistant").setLevel(logging.ERROR)
+    logging.getLogger("custom_components.tasmota_irhvac").setLevel(logging.CRITICAL)
+
+    try:
+        results = asyncio.run(
+            benchmark(args.scene_size, args.rounds, args.single_commands)
+        )
+    except Exception as e:
+        _LOGGER.error("Error running egress benchmark: %s", str(e))
+        save_benchmark("egress", {"status": "ERROR", "reason": str(e)})
+        return 1
+
+    reasons = []
+    scene_ms = results["scene"]["send_ir"]["scene_ms"]
+    if args.max_scene_ms is not None and scene_ms > args.max_scene_ms:
+        reasons.append(f"scene took {scene_ms} ms (limit {args.max_scene_ms} ms)")
+    status = "FAILED" if reasons else "PASSED"
+    for reason in reasons:
+        _LOGGER.error(reason)
+    _LOGGER.info(
+        "send_ir p50 %.1f us; %d-AC scene in %.1f ms",
+        results["single"]["send_ir"]["p50_us"],
+        args.scene_size,
+        scene_ms,
+    )
+
+    result = save_benchmark(
+        "egress",
+        {
+            "status": status,
+            "python": sys.version.split()[0],
+            **results,
+            **({"reasons": reasons} if reasons else {}),
+        },
+    )
+    save_markdown("egress", to_markdown(result))
+    return 0 if status == "PASSED" else 1
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(__file__))
+    sys.exit(main())
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+In-process stand-ins for an MQTT broker and a fleet of Tasmota IR blasters.
+FakeMqttBus replaces the functions of Home Assistant's MQTT integration used
+by Tasmota IRHVAC, so the real entities, hub and blaster queues run without a
+broker. FakeTasmota emulates one blaster: it answers IRHVAC commands with a
+stat RESULT ack and an IrReceived echo on tele, publishes its LWT, and can
+inject frames from its remote control, with configurable latency and loss.
+Some firmware acks with the state it set instead of "Done"; see ack_state.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import time
+import zlib
+from unittest.mock import patch
+
+from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.core import HassJob, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# IrReceived fields Tasmota adds around the IRHVAC state of a decoded frame
+PROTOCOL_BITS = {
+    "SAMSUNG_AC": 112,
+    "DAIKIN": 280,
+    "MITSUBISHI_AC": 144,
+    "GREE": 64,
+    "LG2": 28,
+    "FUJITSU_AC": 128,
+    "PANASONIC_AC": 216,
+    "TOSHIBA_AC": 72,
+    "COOLIX": 24,
+    "ELECTRA_AC": 104,
+    "MIDEA": 48,
+    "HAIER_AC": 72,
+}
+
+# Command fields that are not part of the state a blaster reports back
+COMMAND_ONLY_FIELDS = ("StateMode", "Clock", "Weekday")
+
+# Numeric fields, and modes Tasmota names differently than Home Assistant
+NUMERIC_FIELDS = ("Model", "Sleep", "Temp")
+TASMOTA_MODES = {"fan_only": "Fan"}
+
+
+def tasmota_value(key, value):
+    """Return a command value as Tasmota reports it back, e.g. "cool" as "Cool"."""
+    if not isinstance(value, str):
+        return value
+    if key in NUMERIC_FIELDS:
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if key == "Mode" and value.lower() in TASMOTA_MODES:
+        return TASMOTA_MODES[value.lower()]
+    return value[:1].upper() + value[1:]
+
+
+def topic_matches(subscription, topic):
+    """Return whether an MQTT topic filter with + and # matches a topic."""
+    filter_parts = subscription.split("/")
+    topic_parts = topic.split("/")
+    for index, part in enumerate(filter_parts):
+        if part == "#":
+            return True
+        if index >= len(topic_parts):
+            return False
+        if part not in ("+", topic_parts[index]):
+            return False
+    return len(filter_parts) == len(topic_parts)
+
+
+class FakeMqttBus:
+    """Broker and MQTT client in one, delivering messages on the event loop."""
+
+    def __init__(self, hass):
+        self.hass = hass
+        self.connected = True
+        self._subscriptions = []
+        self._retained = {}
+        self._connection_listeners = []
+        # Every publish as (time.monotonic(), topic, payload), for assertions
+        self.log = []
+        self.keep_log = False
+        self.published = 0
+        self.delivered = 0
+
+    @contextlib.contextmanager
+    def install(self):
+        """Route Home Assistant's MQTT functions to this bus."""
+        from homeassistant.components import mqtt
+
+        with contextlib.ExitStack() as stack:
+            for name in (
+                "async_publish",
+                "async_subscribe",
+                "async_subscribe_connection_status",
+                "async_wait_for_mqtt_client",
+                "is_connected",
+            ):
+                stack.enter_context(patch.object(mqtt, name, getattr(self, name)))
+            yield self
+
+    async def async_publish(self, hass, topic, payload, qos=0, retain=False, encoding="utf-8"):
+        """Publish a message, as mqtt.async_publish."""
+        if not self.connected:
+            from homeassistant.exceptions import HomeAssistantError
+
+            # What the MQTT client raises for paho's MQTT_ERR_NO_CONN
+            raise HomeAssistantError(
+                "Error talking to MQTT: The client is not currently connected."
+            )
+        self.publish(topic, payload, retain)
+
+    def publish(self, topic, payload, retain=False):
+        """Publish a message from a device or the test itself."""
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        self.published += 1
+        if self.keep_log:
+            self.log.append((time.monotonic(), topic, payload))
+        if retain:
+            self._retained[topic] = payload
+        for subscription, msg_callback in tuple(self._subscriptions):
+            if topic_matches(subscription, topic):
+                self._deliver(subscription, msg_callback, topic, payload, retain)
+
+    async def async_subscribe(self, hass, topic, msg_callback, qos=0, encoding="utf-8"):
+        """Subscribe to a topic filter, as mqtt.async_subscribe."""
+        entry = (topic, msg_callback)
+        self._subscriptions.append(entry)
+        for retained_topic, payload in self._retained.items():
+            if topic_matches(topic, retained_topic):
+                self._deliver(topic, msg_callback, retained_topic, payload, True)
+
+        def unsubscribe():
+            if entry in self._subscriptions:
+                self._subscriptions.remove(entry)
+
+        return unsubscribe
+
+    def async_subscribe_connection_status(self, hass, connection_status_callback):
+        """Listen to connects and disconnects of the client."""
+        self._connection_listeners.append(connection_status_callback)
+
+        def unsubscribe():
+            if connection_status_callback in self._connection_listeners:
+                self._connection_listeners.remove(connection_status_callback)
+
+        return unsubscribe
+
+    async def async_wait_for_mqtt_client(self, hass):
+        """Report the client as ready."""
+        return True
+
+    def is_connected(self, hass):
+        """Return whether the client is connected, as mqtt.is_connected."""
+        return self.connected
+
+    def set_connected(self, connected):
+        """Simulate the client losing or regaining the broker."""
+        self.connected = connected
+        for listener in tuple(self._connection_listeners):
+            listener(connected)
+
+    @property
+    def subscriptions(self):
+        """Return the subscribed topic filters."""
+        return [subscription for subscription, _ in self._subscriptions]
+
+    def _deliver(self, subscription, msg_callback, topic, payload, retain):
+        """Hand a message to a subscriber on the next loop iteration."""
+        message = ReceiveMessage(topic, payload, 0, retain, subscription, time.monotonic())
+        self.delivered += 1
+        self.hass.loop.call_soon(
+            self.hass.async_run_hass_job, HassJob(msg_callback), message
+        )
+
+
+class FakeTasmota:
+    """One Tasmota IR blaster with an AC in front of it."""
+
+    def __init__(
+        self, bus, device, vendor, latency=(0.02, 0.08), loss=0.0, echo=True, ack_state=False, rng=None
+    ):
+        self.bus = bus
+        self.device = device
+        self.vendor = vendor
+        self.latency = latency
+        self.loss = loss
+        # Whether the blaster's own receiver sees the frames it sends
+        self.echo = echo
+        # Whether the stat RESULT ack echoes the IRHVAC state instead of "Done"
+        self.ack_state = ack_state
+        self.rng = rng or random.Random()
+        self.command_topic = f"cmnd/{device}/irhvac"
+        self.state_topic = f"tele/{device}/RESULT"
+        self.result_topic = f"stat/{device}/RESULT"
+        self.availability_topic = f"tele/{device}/LWT"
+        self.online = False
+        self.state = {
+            "Vendor": vendor,
+            "Model": -1,
+            "Command": "Control",
+            "Mode": "Off",
+            "Power": "Off",
+            "Celsius": "On",
+            "Temp": 24,
+            "FanSpeed": "Auto",
+            "SwingV": "Off",
+            "SwingH": "Off",
+            "Quiet": "Off",
+            "Turbo": "Off",
+            "Econo": "Off",
+            "Light": "Off",
+            "Filter": "Off",
+            "Clean": "Off",
+            "Beep": "Off",
+            "Sleep": -1,
+        }
+        self.commands = 0
+        self.lost = 0
+        self.errors = 0
+        self._unsubscribe = None
+        self._tasks = set()
+
+    async def async_start(self):
+        """Connect to the bus and announce the blaster Online."""
+        self._unsubscribe = await self.bus.async_subscribe(
+            self.bus.hass, self.command_topic, self._command_received
+        )
+        self.set_online(True)
+
+    async def async_stop(self):
+        """Drop off the bus; the broker publishes the Offline will."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        for task in tuple(self._tasks):
+            task.cancel()
+        self.set_online(False)
+
+    def set_online(self, online):
+        """Publish the retained LWT of the blaster."""
+        self.online = online
+        self.bus.publish(self.availability_topic, "Online" if online else "Offline", retain=True)
+
+    def press_remote(self, **changes):
+        """Send a frame from the AC's remote control, seen by the blaster."""
+        self._schedule(self._async_remote_frame(changes))
+
+    @callback
+    def _command_received(self, message):
+        """Handle an IRHVAC command from Home Assistant."""
+        if not self.online:
+            return
+        self.commands += 1
+        self._schedule(self._async_execute(message.payload))
+
+    def _schedule(self, coro):
+        """Run a delayed reply without blocking the bus."""
+        task = self.bus.hass.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_wait(self):
+        """Wait for the Wi-Fi and IR round trip; return False when lost."""
+        await asyncio.sleep(self.rng.uniform(*self.latency))
+        if self.loss and self.rng.random() < self.loss:
+            self.lost += 1
+            return False
+        return True
+
+    async def _async_execute(self, payload):
+        """Decode a command, send it to the AC and report the result."""
+        if not await self._async_wait():
+            return
+        try:
+            command = json.loads(payload)
+        except ValueError:
+            self.errors += 1
+            self.bus.publish(self.result_topic, {"IRHVAC": "Invalid JSON"})
+            return
+        if command.get("Vendor") != self.vendor:
+            self.errors += 1
+            self.bus.publish(self.result_topic, {"IRHVAC": "Wrong Vendor"})
+            return
+        self.state.update(
+            (key, tasmota_value(key, value))
+            for key, value in command.items()
+            if key not in COMMAND_ONLY_FIELDS
+        )
+        if self.ack_state:
+            self.bus.publish(self.result_topic, {"IRHVAC": dict(self.state)})
+        else:
+            self.bus.publish(self.result_topic, {"IRHVAC": "Done"})
+        if self.echo:
+            self._publish_frame()
+
+    async def _async_remote_frame(self, changes):
+        """Apply a remote button press and report the decoded frame."""
+        if not await self._async_wait():
+            return
+        self.state.update(changes)
+        self._publish_frame()
+
+    def _publish_frame(self):
+        """Publish the current state as Tasmota reports a received IR frame."""
+        self.bus.publish(
+            self.state_topic,
+            {
+                "IrReceived": {
+                    "Protocol": self.vendor,
+                    "Bits": PROTOCOL_BITS.get(self.vendor, 0),
+                    "Data": "0x" + format(zlib.crc32(json.dumps(self.state).encode()), "08X"),
+                    "Repeat": 0,
+                    "IRHVAC": dict(self.state),
+                }
+            },
+        )
+
+
+class FakeFleet:
+    """Many FakeTasmota blasters, named ac0, ac1, ..., cycling through vendors.
+
+    `state_acks` is the fraction of blasters acking with their state.
+    """
+
+    def __init__(
+        self, bus, count, vendors=None, latency=(0.02, 0.08), loss=0.0, echo=True, state_acks=0.0, seed=None
+    ):
+        self.bus = bus
+        self.rng = random.Random(seed)
+        vendors = vendors or list(PROTOCOL_BITS)
+        self.devices = [
+            FakeTasmota(
+                bus,
+                f"ac{index}",
+                vendors[index % len(vendors)],
+                latency=latency,
+                loss=loss,
+                echo=echo,
+                ack_state=self.rng.random() < state_acks,
+                rng=self.rng,
+            )
+            for index in range(count)
+        ]
+
+    def __iter__(self):
+        return iter(self.devices)
+
+    def __len__(self):
+        return len(self.devices)
+
+    async def async_start(self):
+        """Bring every blaster Online."""
+        for device in self.devices:
+            await device.async_start()
+
+    async def async_stop(self):
+        """Take every blaster off the bus."""
+        for device in self.devices:
+            await device.async_stop()
+
+    def press_remotes(self, presses, changes):
+        """Press remote buttons on randomly chosen ACs.
+
+        `changes` is a list of field updates; each press picks one.
+        """
+        for _ in range(presses):
+            device = self.rng.choice(self.devices)
+            device.press_remote(**self.rng.choice(changes))
+
+    def entity_config(self, device):
+        """Return the YAML config of a climate entity for a blaster."""
+        return {
+            "platform": "tasmota_irhvac",
+            "name": f"Fleet {device.device}",
+            "vendor": device.vendor,
+            "command_topic": device.command_topic,
+            "state_topic": device.state_topic,
+            "state_topic_2": device.result_topic,
+            "availability_topic": device.availability_topic,
+            "mqtt_delay": 0,
+        }
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Fleet benchmark for the Tasmota IRHVAC integration.
+Runs real climate entities against a fake fleet of Tasmota blasters on an
+in-process MQTT bus (fake_fleet.py) and checks, at scale, that:
+- a scene switching every AC is published, acked and echoed back,
+- bursts of remote-control frames leave every entity in the AC's state,
+- commands sent while a blaster is Offline reach it once it is back Online.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark_report import ensure_repo_on_path, save_benchmark
+from fake_fleet import FakeFleet, FakeMqttBus
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_LOGGER = logging.getLogger(__name__)
+
+# Remote button presses injected during the burst
+REMOTE_CHANGES = [
+    {"Power": "On", "Mode": "Cool", "Temp": 21},
+    {"Power": "On", "Mode": "Heat", "Temp": 25},
+    {"Power": "On", "Mode": "Dry", "Temp": 23},
+    {"Power": "On", "Mode": "Cool", "Temp": 19},
+]
+
+
+async def wait_for(condition, timeout):
+    """Poll a condition until it holds; return the seconds it took, or None."""
+    started = time.monotonic()
+    while not condition():
+        if time.monotonic() - started > timeout:
+            return None
+        await asyncio.sleep(0.01)
+    return time.monotonic() - started
+
+
+def percentiles(values):
+    """Return the p50, p99 and max of a list of milliseconds."""
+    if not values:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    values = sorted(values)
+    return {
+        "p50_ms": round(values[len(values) // 2], 1),
+        "p99_ms": round(values[int(len(values) * 0.99)], 1),
+        "max_ms": round(values[-1], 1),
+    }
+
+
+def matches(entity, device):
+    """Return whether an entity shows the state of its AC."""
+    return (
+        entity.power_mode == device.state["Power"].lower()
+        and entity.target_temperature == device.state["Temp"]
+        and (
+            device.state["Power"] == "Off"
+            or entity.hvac_mode == device.state["Mode"].lower()
+        )
+    )
+
+
+async def add_entities(hass, fleet):
+    """Add one real climate entity per blaster, as the platform would."""
+    from custom_components.tasmota_irhvac import climate
+
+    entities = []
+    for device in fleet:
+        config = climate.PLATFORM_SCHEMA(fleet.entity_config(device))
+        entity = climate.TasmotaIrhvac(hass, device.vendor, config)
+        entity.hass = hass
+        entity.entity_id = f"climate.fleet_{device.device}"
+        await entity.async_added_to_hass()
+        entity.async_write_ha_state()
+        entities.append(entity)
+    return entities
+
+
+async def run_scene(entities, temperature, timeout):
+    """Set every AC to cool at `temperature` and wait for acks and echoes."""
+    started = time.monotonic()
+    for entity in entities:
+        await entity.async_set_temperature(temperature=temperature, hvac_mode="cool")
+    elapsed = await wait_for(
+        lambda: all(
+            entity.extra_state_attributes.get("last_ack") is not None
+            and entity._trace.reached("state")
+            for entity in entities
+        ),
+        timeout,
+    )
+    published = []
+    echoed = []
+    for entity in entities:
+        stages = dict(entity._trace.stages)
+        if "published" in stages:
+            published.append(stages["published"])
+        if "state" in stages:
+            echoed.append(stages["state"])
+    acks = [entity.extra_state_attributes.get("last_ack") for entity in entities]
+    return {
+        "commands": len(entities),
+        "completed": elapsed is not None,
+        "scene_ms": round((time.monotonic() - started) * 1000, 1),
+        "acks_done": acks.count("done"),
+        "acks_failed": acks.count("failed"),
+        "acks_timed_out": acks.count("timeout"),
+        "call_to_publish": percentiles(published),
+        "call_to_state_echo": percentiles(echoed),
+    }
+
+
+async def run_remote_burst(fleet, entities, presses, timeout):
+    """Press remotes at random and check every entity follows its AC."""
+    by_device = dict(zip(fleet, entities))
+    delivered = fleet.bus.delivered
+    started = time.monotonic()
+    fleet.press_remotes(presses, REMOTE_CHANGES)
+    # Every press is delivered once the slowest reply has had time to arrive
+    await asyncio.sleep(fleet.devices[0].latency[1] + 0.05)
+    elapsed = await wait_for(
+        lambda: all(matches(entity, device) for device, entity in by_device.items()),
+        timeout,
+    )
+    seconds = time.monotonic() - started
+    mismatched = [
+        entity.entity_id
+        for device, entity in by_device.items()
+        if not matches(entity, device)
+    ]
+    return {
+        "presses": presses,
+        "messages_delivered": fleet.bus.delivered - delivered,
+        "settled": elapsed is not None,
+        "burst_ms": round(seconds * 1000, 1),
+        "mismatched": mismatched[:10],
+    }
+
+
+async def run_offline_hold(fleet, entities, fraction, temperature, timeout):
+    """Send commands to Offline blasters and check they arrive once Online."""
+    count = max(1, int(len(entities) * fraction))
+    pairs = list(zip(fleet, entities))[:count]
+    for device, _ in pairs:
+        device.set_online(False)
+    await asyncio.sleep(0.05)
+    for _, entity in pairs:
+        await entity.async_set_temperature(temperature=temperature)
+    await asyncio.sleep(0.3)
+    sent_while_offline = sum(device.commands for device, _ in pairs)
+    held = sum(1 for device, _ in pairs if device.state["Temp"] != temperature)
+
+    started = time.monotonic()
+    for device, _ in pairs:
+        device.set_online(True)
+    elapsed = await wait_for(
+        lambda: all(device.state["Temp"] == temperature for device, _ in pairs),
+        timeout,
+    )
+    return {
+        "blasters": count,
+        "held_while_offline": held,
+        "delivered": sum(1 for device, _ in pairs if device.state["Temp"] == temperature),
+        "flush_ms": round((time.monotonic() - started) * 1000, 1)
+        if elapsed is not None
+        else None,
+        "commands_seen": sum(device.commands for device, _ in pairs) - sent_while_offline,
+    }
+
+
+async def benchmark(count, latency, loss, presses, state_acks, seed):
+    """Run all scenarios against a fleet of `count` blasters."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import restore_state
+    from custom_components.tasmota_irhvac.const import ACK_TIMEOUT
+
+    # A lost command is retransmitted once after the ack timeout
+    timeout = 2 * ACK_TIMEOUT + 5
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # Normally set when Home Assistant starts its event loop
+        hass.loop_thread_id = threading.get_ident()
+        await restore_state.async_load(hass)
+        bus = FakeMqttBus(hass)
+        fleet = FakeFleet(
+            bus, count, latency=latency, loss=loss, state_acks=state_acks, seed=seed
+        )
+        try:
+            with bus.install():
+                await fleet.async_start()
+                setup_started = time.monotonic()
+                entities = await add_entities(hass, fleet)
+                # The hub subscribes in batches; wait until every AC is routed
+                subscribed = await wait_for(
+                    lambda: {
+                        topic
+                        for device in fleet
+                        for topic in (device.state_topic, device.availability_topic)
+                    }
+                    <= set(bus.subscriptions)
+                    and all(entity.available for entity in entities),
+                    timeout,
+                )
+                setup = {
+                    "entities": len(entities),
+                    "setup_ms": round((time.monotonic() - setup_started) * 1000, 1),
+                    "all_available": subscribed is not None,
+                    "subscriptions": len(bus.subscriptions),
+                }
+                results = {
+                    "setup": setup,
+                    "scene": await run_scene(entities, 22, timeout),
+                    "remote_burst": await run_remote_burst(
+                        fleet, entities, presses or 4 * count, timeout
+                    ),
+                    "offline_hold": await run_offline_hold(
+                        fleet, entities, 0.1, 26, timeout
+                    ),
+                    "devices": {
+                        "commands": sum(device.commands for device in fleet),
+                        "state_acks": sum(1 for device in fleet if device.ack_state),
+                        "lost": sum(device.lost for device in fleet),
+                        "errors": sum(device.errors for device in fleet),
+                    },
+                    "messages_published": bus.published,
+                }
+                for entity in entities:
+                    await entity.async_will_remove_from_hass()
+                await fleet.async_stop()
+        finally:
+            await hass.async_stop(force=True)
+    return results
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blasters", type=int, default=200, help="fake blasters and ACs")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        nargs=2,
+        default=[0.02, 0.08],
+        metavar=("MIN", "MAX"),
+        help="seconds a blaster takes to answer",
+    )
+    parser.add_argument(
+        "--loss", type=float, default=0.0, help="fraction of commands and frames lost"
+    )
+    parser.add_argument(
+        "--presses", type=int, default=0, help="remote presses in the burst (default 4 per AC)"
+    )
+    parser.add_argument(
+        "--state-acks",
+        type=float,
+        default=0.5,
+        help="fraction of blasters acking with their IRHVAC state instead of Done",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="seed of the fake fleet")
+    args = parser.parse_args()
+
+    ensure_repo_on_path()
+    # Entities are not added through a platform; keep Home Assistant quiet about it
+    logging.getLogger("homeassistant").setLevel(logging.ERROR)
+    logging.getLogger("custom_components.tasmota_irhvac").setLevel(logging.CRITICAL)
+
+    try:
+        results = asyncio.run(
+            benchmark(
+                args.blasters,
+                tuple(args.latency),
+                args.loss,
+                args.presses,
+                args.state_acks,
+                args.seed,
+            )
+        )
+    except Exception as e:
+        _LOGGER.error("Error running fleet benchmark: %s", str(e))
+        save_benchmark("fleet", {"status": "ERROR", "reason": str(e)})
+        return 1
+
+    reasons = []
+    if not results["setup"]["all_available"]:
+        reasons.append("not every entity became available")
+    if not results["scene"]["completed"]:
+        reasons.append("scene was not acked and echoed by every blaster")
+    elif not args.loss and results["scene"]["acks_done"] != results["scene"]["commands"]:
+        reasons.append("scene commands were not acked as done without loss")
+    if not results["remote_burst"]["settled"]:
+        reasons.append(
+            "entities do not match their AC after the remote burst: "
+            + ", ".join(results["remote_burst"]["mismatched"])
+        )
+    hold = results["offline_hold"]
+    if hold["delivered"] != hold["blasters"] or hold["held_while_offline"] != hold["blasters"]:
+        reasons.append("commands to Offline blasters were not held and delivered")
+    status = "FAILED" if reasons else "PASSED"
+    for reason in reasons:
+        _LOGGER.error(reason)
+    _LOGGER.info(
+        "%d blasters: scene in %.0f ms (echo p99 %s ms), burst settled in %.0f ms",
+        args.blasters,
+        results["scene"]["scene_ms"],
+        results["scene"]["call_to_state_echo"]["p99_ms"],
+        results["remote_burst"]["burst_ms"],
+    )
+
+    save_benchmark(
+        "fleet",
+        {
+            "status": status,
+            "python": sys.version.split()[0],
+            "blasters": args.blasters,
+            "latency_s": args.latency,
+            "loss": args.loss,
+            "state_acks": args.state_acks,
+            **results,
+            **({"reasons": reasons} if reasons else {}),
+        },
+    )
+    return 0 if status == "PASSED" else 1
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(__file__))
+    sys.exit(main())
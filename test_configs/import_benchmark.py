@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the Tasmota IRHVAC integration.
+Records the cold-import cost of custom_components.tasmota_irhvac and its
+modules with `python -X importtime`, and checks that the config flow does not
+pull in the HTTP probing code and form schemas until a flow starts.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmark_report import REPO_ROOT, save_benchmark
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_LOGGER = logging.getLogger(__name__)
+
+PACKAGE = "custom_components.tasmota_irhvac"
+
+# Modules Home Assistant has already imported by the time it loads the integration
+PRELOADED = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+]
+
+# Entry points timed separately, each in a fresh interpreter
+TARGETS = {
+    "package": PACKAGE,
+    "config_flow": f"{PACKAGE}.config_flow",
+    "climate": f"{PACKAGE}.climate",
+}
+
+# Modules that must only be imported once a flow actually starts
+LAZY_MODULES = [
+    f"{PACKAGE}.flow_schemas",
+    f"{PACKAGE}.tasmota_http",
+]
+
+
+def run_import(module):
+    """Import a module in a fresh interpreter and return the importtime lines."""
+    code = (
+        "import sys\n"
+        + "".join(f"import {name}\n" for name in PRELOADED)
+        + "sys.stderr.write('--- start ---\\n')\n"
+        + f"import {module}\n"
+        + f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    lines = proc.stderr.split("--- start ---\n", 1)[1].splitlines()
+    lazy_loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return lines, lazy_loaded
+
+
+def parse_importtime(lines):
+    """Return total, integration-only and per-module cost in microseconds."""
+    total = 0
+    own = 0
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        # Top-level imports carry the cost of everything they import
+        if depth == 1:
+            total += int(cumulative_us)
+        if name.startswith(PACKAGE):
+            own += int(self_us)
+            modules[name] = int(cumulative_us)
+    return total, own, modules
+
+
+def benchmark(runs):
+    """Run each target `runs` times and summarize the results."""
+    results = {}
+    for target, module in TARGETS.items():
+        totals = []
+        owns = []
+        modules = {}
+        lazy_loaded = []
+        for _ in range(runs):
+            lines, lazy_loaded = run_import(module)
+            total, own, modules = parse_importtime(lines)
+            totals.append(total / 1000)
+            owns.append(own / 1000)
+        results[target] = {
+            "module": module,
+            "median_ms": round(statistics.median(totals), 2),
+            "min_ms": round(min(totals), 2),
+            "integration_self_ms": round(statistics.median(owns), 2),
+            "lazy_modules_loaded": lazy_loaded,
+            "modules_ms": {name: round(us / 1000, 2) for name, us in sorted(modules.items())},
+        }
+        _LOGGER.info(
+            "%s: median %.1f ms (integration code %.1f ms)",
+            module,
+            results[target]["median_ms"],
+            results[target]["integration_self_ms"],
+        )
+    return results
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="fail when the median cold import of the package exceeds this",
+    )
+    args = parser.parse_args()
+
+    try:
+        results = benchmark(args.runs)
+    except Exception as e:
+        _LOGGER.error("Error running import benchmark: %s", str(e))
+        save_benchmark("import_time", {"status": "ERROR", "reason": str(e)})
+        return 1
+
+    status = "PASSED"
+    reasons = []
+    for target in ("package", "config_flow"):
+        if results[target]["lazy_modules_loaded"]:
+            reasons.append(
+                f"{target} imported {', '.join(results[target]['lazy_modules_loaded'])}"
+            )
+    if args.max_ms is not None and results["package"]["median_ms"] > args.max_ms:
+        reasons.append(
+            f"package import took {results['package']['median_ms']} ms (limit {args.max_ms} ms)"
+        )
+    if reasons:
+        status = "FAILED"
+        for reason in reasons:
+            _LOGGER.error(reason)
+
+    save_benchmark(
+        "import_time",
+        {
+            "status": status,
+            "python": sys.version.split()[0],
+            "runs": args.runs,
+            "preloaded": PRELOADED,
+            "targets": results,
+            **({"reasons": reasons} if reasons else {}),
+        },
+    )
+    return 0 if status == "PASSED" else 1
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(__file__))
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Traffic replayer for the Tasmota IRHVAC integration.
+Replays a JSON-lines recording made with the tasmota_irhvac.record_traffic
+service against real climate entities on the in-process MQTT bus of
+fake_fleet.py, at the recorded pace (--speed 1), faster (--speed 10) or as
+fast as possible (--speed 0). An entity is created for every Tasmota device in
+the recording, so bursts and ordering from the field (tele and stat copies of
+one frame, remote button mashing, LWT flaps) run through the same code.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark_report import ensure_repo_on_path, save_benchmark
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RECORDING = os.path.join(os.path.dirname(__file__), "sample_traffic.jsonl")
+
+# Topics of Tasmota's default FullTopic, %prefix%/%topic%/
+DEVICE_TOPIC = re.compile(r"^(tele|stat)/([^/]+)/(RESULT|LWT)$")
+
+# Vendor of devices whose recording holds no state frame
+FALLBACK_VENDOR = "SAMSUNG_AC"
+
+
+def load_recording(path):
+    """Return the header and the (seconds, topic, payload, retain) messages."""
+    messages = []
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            messages.append((entry[0], entry[1], entry[2], len(entry) > 3 and bool(entry[3])))
+    return header, messages
+
+
+def frame_vendor(payload):
+    """Return the vendor of an IRHVAC state frame, if the payload is one."""
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    frame = data.get("IrReceived", data).get("IRHVAC")
+    return frame.get("Vendor") if isinstance(frame, dict) else None
+
+
+def discover_devices(messages):
+    """Return the device name -> vendor and LWT presence seen in a recording."""
+    devices = {}
+    for _, topic, payload, _ in messages:
+        if (match := DEVICE_TOPIC.match(topic)) is None:
+            continue
+        device = devices.setdefault(match.group(2), {"vendor": None, "lwt": False})
+        if match.group(3) == "LWT":
+            device["lwt"] = True
+        elif device["vendor"] is None:
+            device["vendor"] = frame_vendor(payload)
+    return devices
+
+
+async def add_entities(hass, devices):
+    """Add a real climate entity for every device of the recording."""
+    from custom_components.tasmota_irhvac import climate
+
+    entities = []
+    for name, device in sorted(devices.items()):
+        vendor = device["vendor"] or FALLBACK_VENDOR
+        config = {
+            "platform": "tasmota_irhvac",
+            "name": f"Replay {name}",
+            "vendor": vendor,
+            "command_topic": f"cmnd/{name}/irhvac",
+            "state_topic": f"tele/{name}/RESULT",
+            "state_topic_2": f"stat/{name}/RESULT",
+            "mqtt_delay": 0,
+        }
+        if device["lwt"]:
+            config["availability_topic"] = f"tele/{name}/LWT"
+        entity = climate.TasmotaIrhvac(hass, vendor, climate.PLATFORM_SCHEMA(config))
+        entity.hass = hass
+        entity.entity_id = f"climate.replay_{name.lower().replace('-', '_')}"
+        await entity.async_added_to_hass()
+        entity.async_write_ha_state()
+        entities.append(entity)
+    return entities
+
+
+async def replay(bus, messages, speed, loops):
+    """Publish the recorded messages, keeping their spacing divided by `speed`.
+
+    Returns how late each message was published, in milliseconds.
+    """
+    lags = []
+    duration = messages[-1][0] if messages else 0.0
+    started = time.monotonic()
+    for loop in range(loops):
+        offset = loop * duration
+        for seconds, topic, payload, retain in messages:
+            if speed:
+                due = started + (offset + seconds) / speed
+                if (wait := due - time.monotonic()) > 0:
+                    await asyncio.sleep(wait)
+                lags.append((time.monotonic() - due) * 1000)
+            bus.publish(topic, payload, retain)
+            if not speed:
+                # Let the handlers run, as a broker's socket reads would
+                await asyncio.sleep(0)
+    return lags
+
+
+async def benchmark(path, speed, loops):
+    """Replay a recording against the integration and summarize the run."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import restore_state
+    from custom_components.tasmota_irhvac.metrics import async_get_metrics
+    from fake_fleet import FakeMqttBus
+
+    header, messages = load_recording(path)
+    devices = discover_devices(messages)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # Normally set when Home Assistant starts its event loop
+        hass.loop_thread_id = threading.get_ident()
+        await restore_state.async_load(hass)
+        bus = FakeMqttBus(hass)
+        try:
+            with bus.install():
+                entities = await add_entities(hass, devices)
+                # Let the hub subscribe before the first message
+                while len(bus.subscriptions) < len(entities) * 2:
+                    await asyncio.sleep(0.01)
+
+                started = time.monotonic()
+                cpu_started = time.process_time()
+                lags = await replay(bus, messages, speed, loops)
+                # Let the last deliveries run
+                await asyncio.sleep(0.05)
+                wall = time.monotonic() - started - 0.05
+                cpu = time.process_time() - cpu_started
+
+                metrics = async_get_metrics(hass)
+                lags.sort()
+                result = {
+                    "recording": os.path.basename(path),
+                    "recorded_at": header.get("started"),
+                    "devices": len(entities),
+                    "messages": len(messages) * loops,
+                    "recorded_s": round(messages[-1][0], 3) if messages else 0,
+                    "replay_s": round(wall, 3),
+                    "msgs_per_s": round(len(messages) * loops / wall) if wall > 0 else None,
+                    "cpu_us_per_msg": round(cpu / max(1, len(messages) * loops) * 1e6, 1),
+                    "lag_p99_ms": round(lags[int(len(lags) * 0.99)], 2) if lags else None,
+                    "lag_max_ms": round(lags[-1], 2) if lags else None,
+                    "frames_received": metrics.counter("frames_received"),
+                    "state_writes": metrics.counter("state_writes"),
+                    "writes_suppressed": metrics.counter("writes_suppressed"),
+                    "frames_wrong_vendor": metrics.counter("frames_wrong_vendor"),
+                    "decode_errors": metrics.counter("decode_errors"),
+                    "final_states": {
+                        entity.entity_id: {
+                            "available": entity.available,
+                            "hvac_mode": entity.hvac_mode,
+                            "temperature": entity.target_temperature,
+                        }
+                        for entity in entities[:20]
+                    },
+                }
+                for entity in entities:
+                    await entity.async_will_remove_from_hass()
+        finally:
+            await hass.async_stop(force=True)
+    return result
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "recording", nargs="?", default=DEFAULT_RECORDING, help="JSON-lines recording"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed: 1 as recorded, 10 ten times faster, 0 as fast as possible",
+    )
+    parser.add_argument(
+        "--loops", type=int, default=1, help="replay the recording this many times in a row"
+    )
+    parser.add_argument(
+        "--max-lag-ms",
+        type=float,
+        default=None,
+        help="fail when a message is published later than this",
+    )
+    args = parser.parse_args()
+
+    ensure_repo_on_path()
+    # Entities are not added through a platform; keep Home Assistant quiet about it
+    logging.getLogger("homeassistant").setLevel(logging.ERROR)
+    logging.getLogger("custom_components.tasmota_irhvac").setLevel(logging.CRITICAL)
+
+    try:
+        result = asyncio.run(benchmark(args.recording, args.speed, args.loops))
+    except Exception as e:
+        _LOGGER.error("Error replaying traffic: %s", str(e))
+        save_benchmark("replay", {"status": "ERROR", "reason": str(e)})
+        return 1
+
+    reasons = []
+    if (
+        args.max_lag_ms is not None
+        and result["lag_max_ms"] is not None
+        and result["lag_max_ms"] > args.max_lag_ms
+    ):
+        reasons.append(f"lagged {result['lag_max_ms']} ms (limit {args.max_lag_ms} ms)")
+    status = "FAILED" if reasons else "PASSED"
+    for reason in reasons:
+        _LOGGER.error(reason)
+    _LOGGER.info(
+        "Replayed %d messages of %d devices at speed %s in %.2fs (%s msgs/s)",
+        result["messages"],
+        result["devices"],
+        args.speed or "max",
+        result["replay_s"],
+        result["msgs_per_s"],
+    )
+
+    save_benchmark(
+        "replay",
+        {
+            "status": status,
+            "python": sys.version.split()[0],
+            "speed": args.speed,
+            "loops": args.loops,
+            **result,
+            **({"reasons": reasons} if reasons else {}),
+        },
+    )
+    return 0 if status == "PASSED" else 1
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(__file__))
+    sys.exit(main())
@@ -10,6 +10,8 @@ import json
 import os
 import sys
 import subprocess
+import tempfile
+import threading
 import time
 from datetime import datetime
 
@@ -27,7 +29,8 @@ class TestRunner:
             "ui_config": None,
             "error_handling": None,
             "edge_cases": None,
-            "samsung_turbo": None
+            "samsung_turbo": None,
+            "integration_setup": None
         }
         self.start_time = None
         self.end_time = None
@@ -318,6 +321,61 @@ class TestRunner:
                 "reason": str(e)
             }
     
+    async def run_integration_setup_test(self):
+        """Run async_setup of the integration and check its services."""
+        _LOGGER.info("Running integration setup test")
+        
+        try:
+            from benchmark_report import ensure_repo_on_path
+
+            ensure_repo_on_path()
+            from homeassistant.core import HomeAssistant
+            from custom_components import tasmota_irhvac
+            from custom_components.tasmota_irhvac import const
+
+            # Services of the integration; entity services come with the platform
+            services = [
+                const.SERVICE_BULK_IMPORT,
+                const.SERVICE_GET_TRACES,
+                const.SERVICE_GET_LATENCIES,
+                const.SERVICE_PROFILE,
+                const.SERVICE_RECORD_TRAFFIC,
+                const.SERVICE_STOP_RECORDING,
+            ]
+            with tempfile.TemporaryDirectory() as config_dir:
+                hass = HomeAssistant(config_dir)
+                # Normally set when Home Assistant starts its event loop
+                hass.loop_thread_id = threading.get_ident()
+                try:
+                    loaded = await tasmota_irhvac.async_setup(hass, {})
+                    missing = [
+                        service
+                        for service in services
+                        if not hass.services.has_service(const.DOMAIN, service)
+                    ]
+                finally:
+                    await hass.async_stop(force=True)
+            
+            if not loaded or missing:
+                _LOGGER.error("Integration setup failed, missing services: %s", missing)
+                self.results["integration_setup"] = {
+                    "status": "FAILED",
+                    "reason": "async_setup failed or did not register: " + ", ".join(missing)
+                }
+                return
+            
+            _LOGGER.info("Integration set up with %d services", len(services))
+            self.results["integration_setup"] = {
+                "status": "PASSED",
+                "services": sorted(services)
+            }
+        except Exception as e:
+            _LOGGER.error("Error running integration setup test: %s", str(e))
+            self.results["integration_setup"] = {
+                "status": "ERROR",
+                "reason": str(e)
+            }
+    
     async def run_all_tests(self):
         """Run all tests."""
         self.start_time = datetime.now()
@@ -330,6 +388,7 @@ class TestRunner:
         await self.run_error_handling_test()
         await self.run_edge_cases_test()
         await self.run_samsung_turbo_test()
+        await self.run_integration_setup_test()
         
         self.end_time = datetime.now()
         _LOGGER.info("All tests completed at %s", self.end_time)
@@ -357,9 +416,18 @@ class TestRunner:
             "duration": str(self.end_time - self.start_time) if self.start_time and self.end_time else None,
             "results": self.results
         }
-        
-        # Save the report to a file
+
+        # Keep the results of the benchmark scripts
         report_path = os.path.join(os.path.dirname(__file__), "test_report.json")
+        try:
+            with open(report_path) as f:
+                benchmarks = json.load(f).get("benchmarks")
+            if benchmarks:
+                report["benchmarks"] = benchmarks
+        except (OSError, ValueError):
+            pass
+
+        # Save the report to a file
         with open(report_path, "w") as f:
             json.dump(report, f, indent=2)
         